@@ -1,6 +1,7 @@
 from django.contrib import admin
 
 from auth_app.models import Account
+from kanban_app.deletion import delete_account
 
 
 class AccountAdmin(admin.ModelAdmin):
@@ -16,6 +17,18 @@ class AccountAdmin(admin.ModelAdmin):
 
     user_email.short_description = "Email"
 
+    def get_deleted_objects(self, objs, request):
+        """List only the accounts; collecting their boards is what we avoid."""
+        return [str(obj) for obj in objs], {}, set(), []
+
+    def delete_model(self, request, obj):
+        """Deactivate the account and purge its data in the background."""
+        delete_account(obj)
+
+    def delete_queryset(self, request, queryset):
+        for account in queryset.select_related("user"):
+            delete_account(account)
+
 
 # Register your models here.
 admin.site.register(Account, AccountAdmin)
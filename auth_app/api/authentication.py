@@ -0,0 +1,173 @@
+"""Token authentication backed by Django's cache framework.
+
+DRF's `TokenAuthentication` joins `Token` and `User` on every request,
+and most views then follow `request.user.account` with another query.
+`CachedTokenAuthentication` keeps the resolved `(user, account)` pair in
+the cache for `KANMIND_TOKEN_CACHE_TTL` seconds. Entries are evicted by
+the handlers in `auth_app.signals` when a token is deleted or rotated,
+or when its user or account changes, once that change is committed.
+
+Every lookup is timed in the `kanmind_token_lookup_duration_seconds`
+histogram, labelled with its outcome: a cache `hit`, a `miss` that went
+to the database, or an `invalid` token.
+"""
+
+# Standard library imports
+import hashlib
+import time
+
+# Third party imports
+from rest_framework.authentication import (
+    TokenAuthentication,
+    get_authorization_header,
+)
+from rest_framework.authtoken.models import Token
+from rest_framework.exceptions import AuthenticationFailed
+
+# Django imports
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ObjectDoesNotExist
+from django.db import transaction
+from django.utils.translation import gettext_lazy as _
+
+# Local imports
+from core.metrics import LATENCY_BUCKETS, define, observe
+
+TOKEN_CACHE_TTL = getattr(settings, "KANMIND_TOKEN_CACHE_TTL", 300)
+
+define(
+    "kanmind_token_lookup_duration_seconds",
+    "histogram",
+    "Token authentication lookups by outcome (hit, miss or invalid).",
+    LATENCY_BUCKETS,
+)
+
+
+def token_cache_key(key):
+    """Return the cache key for a token without storing the raw token."""
+    digest = hashlib.sha256(key.encode()).hexdigest()
+    return f"kanmind:token:{digest}"
+
+
+def observe_lookup(outcome, start):
+    observe(
+        "kanmind_token_lookup_duration_seconds",
+        time.perf_counter() - start,
+        (("outcome", outcome),),
+    )
+
+
+def evict_tokens(keys):
+    """Remove cached entries for token `keys` once the transaction commits.
+
+    Evicting earlier would let a concurrent request cache the rows as
+    they were before the commit again.
+    """
+    cache_keys = [token_cache_key(key) for key in keys]
+    if cache_keys:
+        transaction.on_commit(lambda: cache.delete_many(cache_keys))
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """Token authentication that caches the token → (user, account) lookup.
+
+    Clients authenticate exactly as with DRF's `TokenAuthentication`
+    (`Authorization: Token <key>`). On a cache hit no query is made and
+    `request.user.account` is already populated.
+    """
+
+    def authenticate_credentials(self, key):
+        """Resolve `key` to `(user, token)`, consulting the cache first."""
+        start = time.perf_counter()
+        outcome = "hit"
+        cache_key = token_cache_key(key)
+        cached = cache.get(cache_key)
+
+        try:
+            if cached is None:
+                outcome = "miss"
+                cached = self.load_credentials(key)
+                cache.set(cache_key, cached, TOKEN_CACHE_TTL)
+        except AuthenticationFailed:
+            outcome = "invalid"
+            raise
+        finally:
+            observe_lookup(outcome, start)
+
+        return self.build_credentials(key, *cached)
+
+    async def aauthenticate(self, request):
+        """Async counterpart of `authenticate()` for native async views."""
+        auth = get_authorization_header(request).split()
+        if not auth or auth[0].lower() != self.keyword.lower().encode():
+            return None
+
+        if len(auth) == 1:
+            msg = _("Invalid token header. No credentials provided.")
+            raise AuthenticationFailed(msg)
+        elif len(auth) > 2:
+            msg = _("Invalid token header. Token string should not contain spaces.")
+            raise AuthenticationFailed(msg)
+
+        try:
+            key = auth[1].decode()
+        except UnicodeError:
+            msg = _(
+                "Invalid token header. Token string should not contain invalid characters."
+            )
+            raise AuthenticationFailed(msg)
+
+        start = time.perf_counter()
+        outcome = "hit"
+        cache_key = token_cache_key(key)
+        cached = await cache.aget(cache_key)
+
+        try:
+            if cached is None:
+                outcome = "miss"
+                cached = await self.aload_credentials(key)
+                await cache.aset(cache_key, cached, TOKEN_CACHE_TTL)
+        except AuthenticationFailed:
+            outcome = "invalid"
+            raise
+        finally:
+            observe_lookup(outcome, start)
+
+        return self.build_credentials(key, *cached)
+
+    def build_credentials(self, key, user, account):
+        """Reject inactive users and attach the preloaded account."""
+        if not user.is_active:
+            raise AuthenticationFailed(_("User inactive or deleted."))
+        if account is not None:
+            user.account = account
+
+        # Unsaved stand-in so `request.auth` keeps exposing the token key.
+        return (user, Token(key=key, user=user))
+
+    def load_credentials(self, key):
+        """Fetch the user and account for `key` in a single query."""
+        try:
+            token = Token.objects.select_related("user__account").get(key=key)
+        except Token.DoesNotExist:
+            raise AuthenticationFailed(_("Invalid token."))
+        return self.split_token(token)
+
+    async def aload_credentials(self, key):
+        """Async counterpart of `load_credentials()`."""
+        try:
+            token = await Token.objects.select_related("user__account").aget(key=key)
+        except Token.DoesNotExist:
+            raise AuthenticationFailed(_("Invalid token."))
+        return self.split_token(token)
+
+    @staticmethod
+    def split_token(token):
+        """Return `(user, account)`; `account` is None for users without one."""
+        user = token.user
+        try:
+            account = user.account
+        except ObjectDoesNotExist:
+            account = None
+        return user, account
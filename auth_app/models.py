@@ -5,9 +5,22 @@ from django.db import models
 from django.contrib.auth.models import User
 
 
+class AccountManager(models.Manager):
+    """Default account manager, leaving out accounts awaiting deletion."""
+
+    def get_queryset(self):
+        return super().get_queryset().filter(deleted_at__isnull=True)
+
+
 class Account(models.Model):
+    """Profile of a user; `deleted_at` is set while its data is purged."""
+
     user = models.OneToOneField(User, on_delete=models.CASCADE)
     fullname = models.CharField(max_length=50)
+    deleted_at = models.DateTimeField(null=True, blank=True, editable=False)
+
+    objects = AccountManager()
+    all_objects = models.Manager()
 
     def __str__(self):
         return self.fullname
@@ -0,0 +1,38 @@
+"""Signal handlers evicting cached token authentication entries."""
+
+# Third party imports
+from rest_framework.authtoken.models import Token
+
+# Django imports
+from django.contrib.auth.models import User
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+# Local imports
+from auth_app.api.authentication import evict_tokens
+from auth_app.models import Account
+
+
+def evict_user_tokens(user_id):
+    """Evict cached entries for every token belonging to `user_id`."""
+    evict_tokens(Token.objects.filter(user_id=user_id).values_list("key", flat=True))
+
+
+@receiver(post_save, sender=Token)
+@receiver(post_delete, sender=Token)
+def token_changed(sender, instance, **kwargs):
+    """Logout and token rotation delete or replace the token row."""
+    evict_tokens([instance.key])
+
+
+@receiver(post_save, sender=User)
+def user_saved(sender, instance, **kwargs):
+    """Deactivation and profile edits must not be served from the cache."""
+    evict_user_tokens(instance.pk)
+
+
+@receiver(post_save, sender=Account)
+@receiver(post_delete, sender=Account)
+def account_changed(sender, instance, **kwargs):
+    """The cached account is attached to `request.user`, so keep it fresh."""
+    evict_user_tokens(instance.user_id)
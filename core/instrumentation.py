@@ -0,0 +1,271 @@
+"""Per-request performance instrumentation.
+
+`InstrumentationMiddleware` records for every request:
+
+- the number of SQL queries and the time spent executing them,
+- the time spent building serializer `.data`,
+- the response size and the total time in the view stack.
+
+The figures are sent back as a `Server-Timing` header (visible in the
+browser's network panel) and logged as one line per request on the
+`kanmind.instrumentation` logger, with the raw numbers in the record's
+`instrumentation` attribute for structured log handlers.
+
+Queries are grouped by shape, i.e. their SQL with `IN (...)` lists
+collapsed. A shape executed `KANMIND_INSTRUMENTATION_REPEAT_THRESHOLD`
+times or more in one request is an N+1 candidate and is logged as a
+warning naming the view, the serializer field being rendered when the
+repeats started and the innermost project source line.
+
+Set `KANMIND_INSTRUMENTATION = False` to switch it off: the middleware
+then raises `MiddlewareNotUsed`, so Django drops it from the chain and
+neither the query wrapper nor the serializer timer is installed.
+
+The query wrapper is added once to every database connection (through
+`connection.execute_wrapper`'s list of wrappers) rather than around
+each request, because under ASGI the ORM runs queries on connections
+owned by worker threads. The current request's profile travels in a
+context variable, which `sync_to_async` carries into those threads.
+"""
+
+# Standard library imports
+import logging
+import re
+import sys
+import time
+from collections import Counter
+from contextvars import ContextVar
+
+# Third party imports
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from rest_framework.serializers import BaseSerializer, Serializer
+
+# Django imports
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.db.backends.signals import connection_created
+
+logger = logging.getLogger("kanmind.instrumentation")
+
+ENABLED = getattr(settings, "KANMIND_INSTRUMENTATION", False)
+REPEAT_THRESHOLD = getattr(settings, "KANMIND_INSTRUMENTATION_REPEAT_THRESHOLD", 5)
+
+IN_LIST_RE = re.compile(r"\((?:%s|\?)(?:,\s*(?:%s|\?))*\)")
+PROJECT_DIR = str(settings.BASE_DIR)
+SERIALIZER_FIELDS_CODE = Serializer.to_representation.__code__
+
+current_profile = ContextVar("kanmind_request_profile", default=None)
+
+
+class RequestProfile:
+    """Counters collected while one request is handled."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.queries = 0
+        self.db_time = 0.0
+        self.serializer_time = 0.0
+        self.serializing = False
+        self.shapes = Counter()
+        self.sources = {}
+
+    def record_query(self, sql, duration):
+        self.queries += 1
+        self.db_time += duration
+        shape = IN_LIST_RE.sub("(...)", sql)
+        self.shapes[shape] += 1
+        # Locate the caller on the first repeat only; walking the stack
+        # for every query would dominate the cost of the wrapper.
+        if self.shapes[shape] == 2:
+            self.sources[shape] = query_source()
+
+    def repeated_queries(self):
+        """Yield `(shape, count, (field, location))` for N+1 candidates."""
+        for shape, count in self.shapes.items():
+            if count >= REPEAT_THRESHOLD:
+                yield shape, count, self.sources[shape]
+
+
+def query_source():
+    """Return the serializer field and project line running the current query.
+
+    The field is taken from the innermost `Serializer.to_representation`
+    frame, which holds the field being rendered in its `field` local.
+    """
+    field = location = None
+    frame = sys._getframe(2)
+    while frame is not None and field is None:
+        code = frame.f_code
+        if code is SERIALIZER_FIELDS_CODE:
+            current = frame.f_locals.get("field")
+            if current is not None:
+                owner = type(frame.f_locals["self"]).__name__
+                field = f"{owner}.{current.field_name}"
+        elif (
+            location is None
+            and code.co_filename.startswith(PROJECT_DIR)
+            and "site-packages" not in code.co_filename
+            and code.co_filename != __file__
+        ):
+            filename = code.co_filename[len(PROJECT_DIR) + 1 :]
+            location = f"{filename}:{frame.f_lineno} in {code.co_name}"
+        frame = frame.f_back
+    return field, location
+
+
+def record_query(execute, sql, params, many, context):
+    """Connection execute wrapper timing queries of an instrumented request."""
+    profile = current_profile.get()
+    if profile is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        profile.record_query(sql, time.perf_counter() - start)
+
+
+def install_execute_wrapper(wrapper):
+    """Add `wrapper` to every open and future database connection, once."""
+
+    def add(connection, **kwargs):
+        if wrapper not in connection.execute_wrappers:
+            connection.execute_wrappers.append(wrapper)
+
+    dispatch_uid = f"{wrapper.__module__}.{wrapper.__qualname__}"
+    connection_created.connect(add, weak=False, dispatch_uid=dispatch_uid)
+    for connection in connections.all(initialized_only=True):
+        add(connection)
+
+
+def timed_serializer_data(original):
+    """Wrap `BaseSerializer.data` to time the outermost serialization."""
+
+    def data(self):
+        profile = current_profile.get()
+        if profile is None or profile.serializing:
+            return original.fget(self)
+        profile.serializing = True
+        start = time.perf_counter()
+        try:
+            return original.fget(self)
+        finally:
+            profile.serializer_time += time.perf_counter() - start
+            profile.serializing = False
+
+    data.instrumented = True
+    return property(data)
+
+
+def install():
+    """Hook the query wrapper and serializer timer in; safe to call again."""
+    install_execute_wrapper(record_query)
+    if not getattr(BaseSerializer.data.fget, "instrumented", False):
+        BaseSerializer.data = timed_serializer_data(BaseSerializer.data)
+
+
+def view_label(request):
+    match = getattr(request, "resolver_match", None)
+    if match is None:
+        return None
+    view = getattr(match.func, "cls", match.func)
+    return f"{view.__module__}.{view.__qualname__}"
+
+
+class InstrumentationMiddleware:
+    """Measure queries, serializer time and response size per request."""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not ENABLED:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+        install()
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        profile = RequestProfile()
+        token = current_profile.set(profile)
+        try:
+            response = self.get_response(request)
+        finally:
+            current_profile.reset(token)
+        self.report(request, response, profile)
+        return response
+
+    async def __acall__(self, request):
+        profile = RequestProfile()
+        token = current_profile.set(profile)
+        try:
+            response = await self.get_response(request)
+        finally:
+            current_profile.reset(token)
+        self.report(request, response, profile)
+        return response
+
+    def report(self, request, response, profile):
+        total_ms = (time.perf_counter() - profile.started) * 1000
+        db_ms = profile.db_time * 1000
+        serializer_ms = profile.serializer_time * 1000
+        size = None if response.streaming else len(response.content)
+
+        timings = [
+            f'db;dur={db_ms:.2f};desc="{profile.queries} queries"',
+            f"serialize;dur={serializer_ms:.2f}",
+            f"total;dur={total_ms:.2f}",
+        ]
+        if size is not None:
+            timings.append(f'size;desc="{size} bytes"')
+        response["Server-Timing"] = ", ".join(timings)
+
+        view = view_label(request)
+        data = {
+            "method": request.method,
+            "path": request.path,
+            "status": response.status_code,
+            "view": view,
+            "queries": profile.queries,
+            "db_ms": round(db_ms, 2),
+            "serializer_ms": round(serializer_ms, 2),
+            "total_ms": round(total_ms, 2),
+            "response_bytes": size,
+        }
+        logger.info(
+            "%s %s %s queries=%d db_ms=%.2f serializer_ms=%.2f total_ms=%.2f "
+            "bytes=%s",
+            request.method,
+            request.path,
+            response.status_code,
+            profile.queries,
+            db_ms,
+            serializer_ms,
+            total_ms,
+            "-" if size is None else size,
+            extra={"instrumentation": data},
+        )
+
+        for shape, count, (field, location) in profile.repeated_queries():
+            logger.warning(
+                "Possible N+1 in %s: %d similar queries from field %s at %s: %s",
+                view,
+                count,
+                field or "-",
+                location or "-",
+                shape[:300],
+                extra={
+                    "instrumentation": {
+                        **data,
+                        "repeated_query": shape,
+                        "repeat_count": count,
+                        "serializer_field": field,
+                        "source": location,
+                    }
+                },
+            )
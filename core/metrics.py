@@ -0,0 +1,414 @@
+"""Prometheus-compatible metrics collected in process and served at `/metrics`.
+
+`MetricsMiddleware` records per-route request latency, status codes,
+in-flight requests and the number of SQL queries per request; a
+connection execute wrapper records every query's duration, and other
+modules add their own figures through `inc()`, `observe()` and
+`collector()` (token authentication timings in `auth_app`, board
+payload cache counters in `kanban_app`).
+
+Samples are aggregated per thread: every thread writes only to its own
+`Shard`, so recording takes no lock. A scrape merges all shards;
+copying a shard's dicts is atomic under the GIL, which is all the
+consistency a monotonic counter needs.
+
+A Gunicorn or Uvicorn deployment runs several worker processes, each
+with its own shards. Set `KANMIND_METRICS_DIR` to a directory shared by
+the workers of one host: each worker then writes its merged samples to
+`kanmind-<pid>.json` there at most every `KANMIND_METRICS_FLUSH_SECONDS`
+(from the end of a request), and whichever worker serves `/metrics`
+adds up the files of all workers. Counters and histograms of workers
+that have exited are kept, their gauges are dropped. Clear the
+directory when the server is restarted.
+
+`/metrics` is public unless `KANMIND_METRICS_TOKEN` is set, in which
+case scrapers must send `Authorization: Bearer <token>`. With
+`KANMIND_METRICS = False` nothing is recorded and `/metrics` is 404.
+"""
+
+# Standard library imports
+import hmac
+import json
+import os
+import tempfile
+import threading
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+
+# Third party imports
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+
+# Django imports
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.http import Http404, HttpResponse
+
+# Local imports
+from core.instrumentation import install_execute_wrapper
+
+ENABLED = getattr(settings, "KANMIND_METRICS", True)
+METRICS_DIR = getattr(settings, "KANMIND_METRICS_DIR", None)
+FLUSH_SECONDS = getattr(settings, "KANMIND_METRICS_FLUSH_SECONDS", 5)
+METRICS_TOKEN = getattr(settings, "KANMIND_METRICS_TOKEN", None)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+QUERY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1)
+COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200, 500)
+
+
+class Metric:
+    def __init__(self, name, kind, help, buckets=None):
+        self.name = name
+        self.kind = kind
+        self.help = help
+        self.buckets = buckets
+
+
+registry = {}
+
+
+def define(name, kind, help, buckets=None):
+    """Declare a `counter`, `gauge` or `histogram` before recording it."""
+    registry[name] = Metric(name, kind, help, buckets)
+
+
+define(
+    "kanmind_http_requests_total",
+    "counter",
+    "HTTP requests by method, route and status code.",
+)
+define(
+    "kanmind_http_request_duration_seconds",
+    "histogram",
+    "Time until the response is returned, by method and route.",
+    LATENCY_BUCKETS,
+)
+define(
+    "kanmind_http_requests_in_flight",
+    "gauge",
+    "Requests currently being handled.",
+)
+define(
+    "kanmind_db_queries_per_request",
+    "histogram",
+    "SQL queries executed per request, by route.",
+    COUNT_BUCKETS,
+)
+define(
+    "kanmind_db_query_duration_seconds",
+    "histogram",
+    "SQL query execution time, by database alias.",
+    QUERY_BUCKETS,
+)
+
+
+class Shard:
+    """Samples recorded by one thread."""
+
+    def __init__(self):
+        self.counters = {}
+        self.gauges = {}
+        self.histograms = {}
+
+
+local = threading.local()
+shards = []
+shards_lock = threading.Lock()
+collectors = []
+
+
+def shard():
+    """Return the calling thread's shard, creating it on first use."""
+    try:
+        return local.shard
+    except AttributeError:
+        local.shard = Shard()
+        with shards_lock:
+            shards.append(local.shard)
+        return local.shard
+
+
+def inc(name, labels=(), amount=1):
+    """Add `amount` to a counter or gauge; `labels` are `(name, value)` pairs."""
+    values = shard().gauges if registry[name].kind == "gauge" else shard().counters
+    key = (name, labels)
+    values[key] = values.get(key, 0) + amount
+
+
+def observe(name, value, labels=()):
+    """Record `value` in a histogram."""
+    histograms = shard().histograms
+    key = (name, labels)
+    sample = histograms.get(key)
+    if sample is None:
+        # One count per bucket plus +Inf, then the sum.
+        sample = histograms[key] = [0] * (len(registry[name].buckets) + 2)
+    sample[bisect_left(registry[name].buckets, value)] += 1
+    sample[-1] += value
+
+
+def collector(function):
+    """Register `function` to yield `(name, labels, value)` samples on scrape.
+
+    The values are absolute, e.g. totals another module already keeps.
+    """
+    collectors.append(function)
+    return function
+
+
+def snapshot():
+    """Merge all shards and collectors into one process-wide sample set."""
+    counters, gauges, histograms = {}, {}, {}
+    with shards_lock:
+        current = list(shards)
+    for item in current:
+        add_values(counters, item.counters.copy())
+        add_values(gauges, item.gauges.copy())
+        add_histograms(histograms, item.histograms.copy())
+    for function in collectors:
+        for name, labels, value in function():
+            values = gauges if registry[name].kind == "gauge" else counters
+            add_values(values, {(name, labels): value})
+    return {"counters": counters, "gauges": gauges, "histograms": histograms}
+
+
+def add_values(total, values):
+    for key, value in values.items():
+        total[key] = total.get(key, 0) + value
+
+
+def add_histograms(total, histograms):
+    for key, sample in histograms.items():
+        merged = total.get(key)
+        if merged is None:
+            total[key] = list(sample)
+        elif len(merged) == len(sample):  # Buckets may differ across releases.
+            for index, value in enumerate(sample):
+                merged[index] += value
+
+
+# Shared-directory mode
+
+
+flush_lock = threading.Lock()
+last_flush = 0.0
+
+
+def process_file(pid):
+    return os.path.join(METRICS_DIR, f"kanmind-{pid}.json")
+
+
+def flush(force=False):
+    """Write this process' samples to the shared directory if they are due.
+
+    Skipped while another thread of the process is already flushing.
+    """
+    global last_flush
+    if not METRICS_DIR or not (force or time.monotonic() - last_flush >= FLUSH_SECONDS):
+        return
+    if not flush_lock.acquire(blocking=False):
+        return
+    try:
+        last_flush = time.monotonic()
+        data = {
+            kind: [[name, labels, value] for (name, labels), value in values.items()]
+            for kind, values in snapshot().items()
+        }
+        descriptor, path = tempfile.mkstemp(dir=METRICS_DIR, suffix=".tmp")
+        with os.fdopen(descriptor, "w") as handle:
+            json.dump(data, handle)
+        os.replace(path, process_file(os.getpid()))
+    finally:
+        flush_lock.release()
+
+
+def read_process_files():
+    """Yield `(pid, samples)` for every other worker that wrote a file."""
+    for entry in os.scandir(METRICS_DIR):
+        if not (entry.name.startswith("kanmind-") and entry.name.endswith(".json")):
+            continue
+        pid = int(entry.name[len("kanmind-") : -len(".json")])
+        if pid == os.getpid():
+            continue
+        try:
+            with open(entry.path) as handle:
+                data = json.load(handle)
+        except (OSError, ValueError):
+            continue
+        yield pid, {
+            kind: {
+                (name, tuple(map(tuple, labels))): value
+                for name, labels, value in samples
+            }
+            for kind, samples in data.items()
+        }
+
+
+def process_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+def collect():
+    """Return the samples to expose: this process, plus peers in dir mode."""
+    samples = snapshot()
+    if METRICS_DIR:
+        flush(force=True)
+        for pid, other in read_process_files():
+            add_values(samples["counters"], other["counters"])
+            add_histograms(samples["histograms"], other["histograms"])
+            if process_alive(pid):
+                add_values(samples["gauges"], other["gauges"])
+    return samples
+
+
+# Exposition
+
+
+def render(samples):
+    """Format samples in the Prometheus text exposition format."""
+    by_metric = {}
+    for kind in ("counters", "gauges", "histograms"):
+        for (name, labels), value in samples[kind].items():
+            by_metric.setdefault(name, []).append((labels, value))
+
+    lines = []
+    for name in sorted(by_metric):
+        metric = registry[name]
+        lines.append(f"# HELP {name} {metric.help}")
+        lines.append(f"# TYPE {name} {metric.kind}")
+        for labels, value in sorted(by_metric[name]):
+            if metric.kind != "histogram":
+                lines.append(f"{name}{format_labels(labels)} {format_value(value)}")
+                continue
+            cumulative = 0
+            for bound, count in zip((*metric.buckets, "+Inf"), value[:-1]):
+                cumulative += count
+                le = format_value(bound) if bound != "+Inf" else bound
+                bucket_labels = format_labels((*labels, ("le", le)))
+                lines.append(f"{name}_bucket{bucket_labels} {cumulative}")
+            lines.append(f"{name}_sum{format_labels(labels)} {format_value(value[-1])}")
+            lines.append(f"{name}_count{format_labels(labels)} {cumulative}")
+    return "\n".join(lines) + "\n"
+
+
+def format_labels(labels):
+    if not labels:
+        return ""
+    pairs = ",".join(f'{key}="{escape_label(value)}"' for key, value in labels)
+    return "{" + pairs + "}"
+
+
+def escape_label(value):
+    return str(value).replace("\\", r"\\").replace('"', r"\"").replace("\n", r"\n")
+
+
+def format_value(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def metrics_view(request):
+    """Serve the collected metrics to a Prometheus scraper."""
+    if not ENABLED:
+        raise Http404
+    if METRICS_TOKEN:
+        expected = f"Bearer {METRICS_TOKEN}"
+        given = request.headers.get("Authorization", "")
+        if not hmac.compare_digest(given.encode(), expected.encode()):
+            return HttpResponse(status=401, headers={"WWW-Authenticate": "Bearer"})
+    return HttpResponse(render(collect()), content_type=CONTENT_TYPE)
+
+
+# Request and query recording
+
+
+request_queries = ContextVar("kanmind_request_queries", default=None)
+
+
+def record_query(execute, sql, params, many, context):
+    """Connection execute wrapper observing every query's duration."""
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        alias = (("alias", context["connection"].alias),)
+        observe("kanmind_db_query_duration_seconds", time.perf_counter() - start, alias)
+        counter = request_queries.get()
+        if counter is not None:
+            counter[0] += 1
+
+
+def route_label(request):
+    """Return the URL pattern name of the request, not its concrete path."""
+    match = getattr(request, "resolver_match", None)
+    if match is None:
+        return "unmatched"
+    return match.view_name or match.route
+
+
+class MetricsMiddleware:
+    """Record latency, status, in-flight and query count of every request.
+
+    Latency is measured until the response is returned, so for
+    streaming responses it does not include sending the body.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not ENABLED:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+        install_execute_wrapper(record_query)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        queries, token, start = self.begin()
+        try:
+            response = self.get_response(request)
+        finally:
+            request_queries.reset(token)
+            inc("kanmind_http_requests_in_flight", amount=-1)
+        self.finish(request, response, queries, start)
+        return response
+
+    async def __acall__(self, request):
+        queries, token, start = self.begin()
+        try:
+            response = await self.get_response(request)
+        finally:
+            request_queries.reset(token)
+            inc("kanmind_http_requests_in_flight", amount=-1)
+        self.finish(request, response, queries, start)
+        return response
+
+    def begin(self):
+        inc("kanmind_http_requests_in_flight")
+        queries = [0]
+        return queries, request_queries.set(queries), time.perf_counter()
+
+    def finish(self, request, response, queries, start):
+        route = (("route", route_label(request)),)
+        observe(
+            "kanmind_http_request_duration_seconds",
+            time.perf_counter() - start,
+            (("method", request.method), *route),
+        )
+        inc(
+            "kanmind_http_requests_total",
+            (("method", request.method), *route, ("status", str(response.status_code))),
+        )
+        observe("kanmind_db_queries_per_request", queries[0], route)
+        flush()
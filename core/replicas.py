@@ -0,0 +1,159 @@
+"""Read replica routing with read-your-writes stickiness.
+
+`ReplicaRouter` sends reads to one of the aliases listed in
+`KANMIND_READ_REPLICAS`, but only while `ReplicaMiddleware` has marked
+the current request as replica-safe. Everything else (writes, requests
+with unsafe methods, management commands, background work) uses the
+`default` primary.
+
+A request is replica-safe when it uses a safe method (GET, HEAD,
+OPTIONS) and its client has not written recently. After a request that
+wrote anything, the client (identified by its `Authorization` header)
+is pinned to the primary for `KANMIND_REPLICA_PIN_SECONDS`, long enough
+for the replicas to catch up, so it always reads its own writes. The
+pins live in the default cache, which must be shared by all workers
+for this to hold across processes. Within a request, reads also move
+to the primary after its first write and inside `transaction.atomic()`
+blocks on the primary. Writes are recognised by the SQL the primary
+executes, since Django also consults `db_for_write()` when merely
+assigning related objects.
+
+Tokens are always read from the primary: a client that just registered
+or logged in must be able to authenticate with its new token right
+away. Replicas are never migrated; they are expected to be physical or
+logical copies of the primary. In tests, give each replica
+`"TEST": {"MIRROR": "default"}`.
+"""
+
+# Standard library imports
+import hashlib
+import random
+from contextvars import ContextVar
+
+# Third party imports
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+
+# Django imports
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import DEFAULT_DB_ALIAS, connections
+
+# Local imports
+from core.instrumentation import install_execute_wrapper
+
+REPLICAS = list(getattr(settings, "KANMIND_READ_REPLICAS", []))
+PIN_SECONDS = getattr(settings, "KANMIND_REPLICA_PIN_SECONDS", 5)
+PRIMARY_ONLY_APPS = {"authtoken"}
+SAFE_METHODS = {"GET", "HEAD", "OPTIONS"}
+WRITE_STATEMENTS = ("INSERT", "UPDATE", "DELETE", "REPLACE")
+
+current_request = ContextVar("kanmind_replica_request", default=None)
+
+
+class RequestRouting:
+    """Routing decisions for one request."""
+
+    def __init__(self, replica):
+        self.replica = replica
+        self.wrote = False
+
+
+class ReplicaRouter:
+    """Route reads of replica-safe requests to a read replica."""
+
+    def db_for_read(self, model, **hints):
+        routing = current_request.get()
+        if (
+            routing is None
+            or routing.replica is None
+            or model._meta.app_label in PRIMARY_ONLY_APPS
+            or connections[DEFAULT_DB_ALIAS].in_atomic_block
+        ):
+            return DEFAULT_DB_ALIAS
+        return routing.replica
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {DEFAULT_DB_ALIAS, *REPLICAS}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if db in REPLICAS:
+            return False
+        return None
+
+
+def record_write(execute, sql, params, many, context):
+    """Connection execute wrapper noting writes made by the current request."""
+    routing = current_request.get()
+    if (
+        routing is not None
+        and not routing.wrote
+        and context["connection"].alias == DEFAULT_DB_ALIAS
+        and sql.lstrip()[:7].upper().startswith(WRITE_STATEMENTS)
+    ):
+        routing.wrote = True
+        routing.replica = None
+    return execute(sql, params, many, context)
+
+
+def pin_key(request):
+    """Return the cache key pinning this request's client, if it has one."""
+    authorization = request.headers.get("Authorization")
+    if not authorization:
+        return None
+    digest = hashlib.sha256(authorization.encode()).hexdigest()
+    return f"kanmind:replica-pin:{digest}"
+
+
+class ReplicaMiddleware:
+    """Mark replica-safe requests and pin clients to the primary after writes."""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not REPLICAS:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+        install_execute_wrapper(record_write)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        key = pin_key(request)
+        pinned = key is not None and cache.get(key) is not None
+        routing = self.routing(request, pinned)
+        token = current_request.set(routing)
+        try:
+            return self.get_response(request)
+        finally:
+            current_request.reset(token)
+            if routing.wrote and key is not None:
+                cache.set(key, True, PIN_SECONDS)
+
+    async def __acall__(self, request):
+        key = pin_key(request)
+        pinned = key is not None and await cache.aget(key) is not None
+        routing = self.routing(request, pinned)
+        token = current_request.set(routing)
+        try:
+            return await self.get_response(request)
+        finally:
+            current_request.reset(token)
+            if routing.wrote and key is not None:
+                await cache.aset(key, True, PIN_SECONDS)
+
+    @staticmethod
+    def routing(request, pinned):
+        if request.method in SAFE_METHODS and not pinned:
+            return RequestRouting(random.choice(REPLICAS))
+        return RequestRouting(None)
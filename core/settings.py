@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import os
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -42,10 +43,14 @@ INSTALLED_APPS = [
     "rest_framework.authtoken",
     "auth_app",
     "kanban_app",
+    "jobs_app",
 ]
 
 
 MIDDLEWARE = [
+    "core.metrics.MetricsMiddleware",
+    "core.instrumentation.InstrumentationMiddleware",
+    "core.replicas.ReplicaMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
@@ -89,13 +94,133 @@ WSGI_APPLICATION = "core.wsgi.application"
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
+# SQLite tuned for concurrent use. WAL lets readers run next to the
+# single writer; synchronous=NORMAL is safe in WAL mode (a power loss may
+# drop the last commits but cannot corrupt the file). "timeout" is the
+# busy timeout in seconds: connections wait that long for the write lock
+# instead of failing with "database is locked". IMMEDIATE transactions
+# take the write lock at BEGIN, so a transaction that read first cannot
+# fail later when upgrading its lock. Compare against Django's defaults
+# with `python manage.py stress_kanban_sqlite`.
+KANMIND_SQLITE_OPTIONS = {
+    "init_command": (
+        "PRAGMA journal_mode=WAL;"
+        "PRAGMA synchronous=NORMAL;"
+        "PRAGMA mmap_size=134217728;"
+        "PRAGMA cache_size=-20000;"
+        "PRAGMA temp_store=MEMORY;"
+    ),
+    "transaction_mode": "IMMEDIATE",
+    "timeout": 20,
+}
+
 DATABASES = {
     "default": {
         "ENGINE": "django.db.backends.sqlite3",
         "NAME": BASE_DIR / "db.sqlite3",
+        "OPTIONS": KANMIND_SQLITE_OPTIONS,
     }
 }
 
+# Read replicas (see core/replicas.py). Add each replica to DATABASES
+# and list its alias here, e.g.
+#
+#     DATABASES["replica"] = {
+#         "ENGINE": "django.db.backends.postgresql",
+#         "NAME": "kanmind",
+#         "HOST": "replica.internal",
+#         "TEST": {"MIRROR": "default"},
+#     }
+#     KANMIND_READ_REPLICAS = ["replica"]
+#
+# Safe requests then read from a replica, except for clients that wrote
+# within the last KANMIND_REPLICA_PIN_SECONDS, which stay on the primary.
+DATABASE_ROUTERS = ["core.replicas.ReplicaRouter"]
+KANMIND_READ_REPLICAS = []
+KANMIND_REPLICA_PIN_SECONDS = 5
+
+
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+# The local-memory backend is per process; use a shared backend such as
+# Redis or Memcached when running several workers so invalidations reach
+# all of them.
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    }
+}
+
+# Seconds an account's accessible board ids stay cached between
+# membership changes (see kanban_app/membership.py).
+KANMIND_MEMBERSHIP_CACHE_TTL = 60
+
+# Seconds a token -> (user, account) lookup stays cached
+# (see auth_app/api/authentication.py).
+KANMIND_TOKEN_CACHE_TTL = 300
+
+# Rendered board detail payloads (see kanban_app/api/response_cache.py):
+# a per-process LRU tier bounded by entries and bytes in front of the
+# shared cache alias, whose entries expire after the TTL in seconds.
+KANMIND_BOARD_CACHE_ALIAS = "default"
+KANMIND_BOARD_CACHE_TTL = 300
+KANMIND_BOARD_CACHE_LOCAL_ENTRIES = 128
+KANMIND_BOARD_CACHE_LOCAL_BYTES = 64 * 1024 * 1024
+
+# Realtime board events (see kanban_app/realtime.py). LocalBroker only
+# reaches clients connected to the same process.
+KANMIND_REALTIME_BROKER = "kanban_app.realtime.LocalBroker"
+KANMIND_REALTIME_HEARTBEAT = 15
+
+# Days board changes stay in the delta sync log before
+# `manage.py compact_board_changes` drops them (see kanban_app/changes.py).
+KANMIND_CHANGE_RETENTION_DAYS = 30
+
+# Background jobs (see jobs_app/jobs.py). "thread" runs them in the web
+# process; "database" stores them in the job table for
+# `manage.py run_kanban_worker`, so they survive restarts. Failed jobs
+# are retried with exponential backoff starting at
+# KANMIND_JOBS_RETRY_DELAY seconds.
+KANMIND_JOBS_BACKEND = "thread"
+KANMIND_JOBS_THREADS = 1
+KANMIND_JOBS_MAX_ATTEMPTS = 5
+KANMIND_JOBS_RETRY_DELAY = 10
+KANMIND_JOBS_STALE_AFTER = 3600
+
+# Rows per transaction when purging deleted boards and accounts in the
+# background or with `manage.py purge_deleted` (see kanban_app/deletion.py).
+KANMIND_PURGE_BATCH_SIZE = 1000
+
+# Per-request query, serializer and size figures in a Server-Timing
+# header and the "kanmind.instrumentation" log, plus N+1 warnings for
+# query shapes repeated this many times (see core/instrumentation.py).
+# Off unless a profiling session opts in with KANMIND_INSTRUMENTATION=1 in
+# the environment; when off the middleware removes itself and costs nothing.
+KANMIND_INSTRUMENTATION = os.environ.get("KANMIND_INSTRUMENTATION") == "1"
+KANMIND_INSTRUMENTATION_REPEAT_THRESHOLD = 5
+
+# Prometheus metrics at /metrics (see core/metrics.py). Point
+# KANMIND_METRICS_DIR at a directory shared by all worker processes of a
+# host to aggregate them; set KANMIND_METRICS_TOKEN to require
+# "Authorization: Bearer <token>" from scrapers.
+KANMIND_METRICS = True
+KANMIND_METRICS_DIR = None
+KANMIND_METRICS_FLUSH_SECONDS = 5
+KANMIND_METRICS_TOKEN = None
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "handlers": {
+        "console": {"class": "logging.StreamHandler"},
+    },
+    "loggers": {
+        "kanmind.instrumentation": {"handlers": ["console"], "level": "INFO"},
+        "kanmind.jobs": {"handlers": ["console"], "level": "WARNING"},
+    },
+}
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -140,9 +265,15 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": [
-        "rest_framework.authentication.TokenAuthentication",
+        "auth_app.api.authentication.CachedTokenAuthentication",
     ],
     "DEFAULT_PERMISSION_CLASSES": [
         "rest_framework.permissions.IsAuthenticated",
     ],
+    "DEFAULT_RENDERER_CLASSES": [
+        "kanban_app.api.renderers.FastJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
+    "DEFAULT_PAGINATION_CLASS": "kanban_app.api.pagination.KeysetPagination",
+    "PAGE_SIZE": 50,
 }
@@ -6,7 +6,11 @@ Includes admin site and API routes for kanban_app and auth_app."""
 from django.contrib import admin
 from django.urls import path, include
 
+# Local imports
+from core.metrics import metrics_view
+
 urlpatterns = [
     path("admin/", admin.site.urls),
     path("api/", include("api.urls")),  # Kanban app API endpoints
+    path("metrics", metrics_view, name="metrics"),
 ]
@@ -0,0 +1,12 @@
+from django.contrib import admin
+
+from jobs_app.models import Job
+
+
+class JobAdmin(admin.ModelAdmin):
+    list_display = ["name", "status", "attempts", "run_at", "last_error"]
+    list_filter = ["status", "name"]
+
+
+# Register your models here.
+admin.site.register(Job, JobAdmin)
@@ -0,0 +1,167 @@
+"""Background jobs: run work after the response, outside the request path.
+
+A job is a module-level function registered with `@job`. `enqueue()`
+schedules a call of it with JSON-serializable arguments. The call runs
+after the current transaction commits, so it sees the data that
+triggered it and a rollback cancels it. `KANMIND_JOBS_BACKEND` selects
+where jobs run:
+
+- `"thread"` (default): a pool of `KANMIND_JOBS_THREADS` threads in
+  the web process. Nothing else has to run, but queued jobs are lost
+  when the process exits.
+- `"database"`: `enqueue()` inserts a `Job` row in the current
+  transaction, and `manage.py run_kanban_worker` claims due rows and
+  runs them on its own thread pool (see `jobs_app.worker`). Jobs
+  survive restarts; a job whose worker died is queued again after
+  `KANMIND_JOBS_STALE_AFTER` seconds.
+
+A job that raises is retried up to `max_attempts` times in all. Retries
+wait `KANMIND_JOBS_RETRY_DELAY` seconds, doubled per attempt and capped
+at an hour. Jobs must therefore be safe to run more than once. Failures
+are logged on the `kanmind.jobs` logger; with the database backend the
+last error stays on the failed row.
+
+Every attempt is timed in `kanmind_job_duration_seconds`, the time a
+job waited past its due time in `kanmind_job_wait_seconds`, and
+outcomes are counted in `kanmind_jobs_total` (`succeeded`, `retried`
+or `failed`), all labelled with the job name.
+"""
+
+# Standard library imports
+import datetime
+import json
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Django imports
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.utils import timezone
+
+# Local imports
+from core.metrics import LATENCY_BUCKETS, define, flush, inc, observe
+from jobs_app.models import Job
+
+BACKEND = getattr(settings, "KANMIND_JOBS_BACKEND", "thread")
+THREADS = getattr(settings, "KANMIND_JOBS_THREADS", 1)
+MAX_ATTEMPTS = getattr(settings, "KANMIND_JOBS_MAX_ATTEMPTS", 5)
+RETRY_DELAY = getattr(settings, "KANMIND_JOBS_RETRY_DELAY", 10)
+MAX_RETRY_DELAY = 3600
+
+JOB_BUCKETS = (*LATENCY_BUCKETS, 30, 60, 300, 900, 3600)
+
+logger = logging.getLogger("kanmind.jobs")
+
+define(
+    "kanmind_jobs_total",
+    "counter",
+    "Job attempts by job and outcome (succeeded, retried or failed).",
+)
+define(
+    "kanmind_job_duration_seconds",
+    "histogram",
+    "Duration of job attempts by job.",
+    JOB_BUCKETS,
+)
+define(
+    "kanmind_job_wait_seconds",
+    "histogram",
+    "Time from a job being due to its attempt starting, by job.",
+    JOB_BUCKETS,
+)
+
+registry = {}
+
+
+def job(function=None, *, max_attempts=None):
+    """Register `function` as a job, as `@job` or `@job(max_attempts=...)`."""
+
+    def register(function):
+        function.job_name = f"{function.__module__}.{function.__qualname__}"
+        function.max_attempts = max_attempts or MAX_ATTEMPTS
+        registry[function.job_name] = function
+        return function
+
+    return register if function is None else register(function)
+
+
+def enqueue(function, *args, delay=0):
+    """Run the job `function(*args)` once the current transaction commits.
+
+    `delay` postpones it by that many seconds.
+    """
+    if registry.get(getattr(function, "job_name", None)) is not function:
+        raise ValueError(f"{function.__qualname__} is not registered with @job")
+    # Both backends accept only what the database backend can store.
+    json.dumps(args)
+
+    due = timezone.now() + datetime.timedelta(seconds=delay)
+    if BACKEND == "database":
+        Job.objects.create(name=function.job_name, args=list(args), run_at=due)
+    else:
+        transaction.on_commit(lambda: submit(function, args, 1, due))
+
+
+def retry_delay(attempt):
+    """Return the seconds to wait before retrying after failed `attempt`."""
+    return min(RETRY_DELAY * 2 ** (attempt - 1), MAX_RETRY_DELAY)
+
+
+def call(function, args, attempt, due):
+    """Run one attempt of a job and record its timing; return its error."""
+    labels = (("job", function.job_name),)
+    waited = (timezone.now() - due).total_seconds()
+    observe("kanmind_job_wait_seconds", max(waited, 0), labels)
+    start = time.perf_counter()
+    error = None
+    try:
+        function(*args)
+    except Exception as exc:
+        error = exc
+        logger.exception(
+            "Job %s%r failed (attempt %s of %s)",
+            function.job_name,
+            tuple(args),
+            attempt,
+            function.max_attempts,
+        )
+    observe("kanmind_job_duration_seconds", time.perf_counter() - start, labels)
+    if error is None:
+        outcome = "succeeded"
+    elif attempt < function.max_attempts:
+        outcome = "retried"
+    else:
+        outcome = "failed"
+    inc("kanmind_jobs_total", (*labels, ("outcome", outcome)))
+    # Worker processes serve no requests, which is when metrics are flushed.
+    flush()
+    return error
+
+
+# Thread backend
+
+executor = ThreadPoolExecutor(max_workers=THREADS, thread_name_prefix="kanmind-jobs")
+
+
+def submit(function, args, attempt, due):
+    """Hand an attempt to the thread pool once it is due."""
+    delay = (due - timezone.now()).total_seconds()
+    if delay > 0:
+        timer = threading.Timer(delay, submit, (function, args, attempt, due))
+        timer.daemon = True
+        timer.start()
+    else:
+        executor.submit(run_in_thread, function, args, attempt, due)
+
+
+def run_in_thread(function, args, attempt, due):
+    close_old_connections()
+    try:
+        error = call(function, args, attempt, due)
+    finally:
+        close_old_connections()
+    if error is not None and attempt < function.max_attempts:
+        retry_at = timezone.now() + datetime.timedelta(seconds=retry_delay(attempt))
+        submit(function, args, attempt + 1, retry_at)
@@ -0,0 +1,51 @@
+"""Run queued background jobs from the database."""
+
+# Standard library imports
+import signal
+
+# Django imports
+from django.core.management.base import BaseCommand
+
+# Local imports
+from jobs_app.jobs import THREADS
+from jobs_app.worker import Worker
+
+
+class Command(BaseCommand):
+    help = (
+        "Claim due jobs from the job table and run them on a thread pool, "
+        "retrying failures with backoff. Needs KANMIND_JOBS_BACKEND = "
+        '"database"; several workers may run at once. SIGINT or SIGTERM '
+        "stops the worker after its running jobs finish."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--threads",
+            type=int,
+            default=THREADS,
+            help="Number of jobs run at the same time.",
+        )
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=1.0,
+            help="Seconds to wait before looking for new jobs when idle.",
+        )
+        parser.add_argument(
+            "--burst",
+            action="store_true",
+            help="Exit once no job is due instead of waiting for more.",
+        )
+
+    def handle(self, *args, **options):
+        if options["threads"] <= 0:
+            raise SystemExit("--threads must be positive")
+        if options["poll_interval"] <= 0:
+            raise SystemExit("--poll-interval must be positive")
+
+        worker = Worker(options["threads"], options["poll_interval"], options["burst"])
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            signal.signal(signum, lambda *_: worker.stop())
+        attempts = worker.run()
+        self.stdout.write(f"jobs: ran {attempts} attempt(s)")
@@ -0,0 +1,40 @@
+"""Models for the jobs application: the durable job queue."""
+
+# Django imports
+from django.db import models
+from django.utils import timezone
+
+
+class Job(models.Model):
+    """A call of a registered job waiting for, or done with, a worker.
+
+    Rows exist only with the `database` backend (see `jobs_app.jobs`).
+    Succeeded jobs are deleted; failed ones stay with their last error.
+    """
+
+    class Status(models.TextChoices):
+        QUEUED = "queued", "Queued"
+        RUNNING = "running", "Running"
+        FAILED = "failed", "Failed"
+
+    name = models.CharField(max_length=200)
+    args = models.JSONField(default=list)
+    status = models.CharField(
+        max_length=10, choices=Status.choices, default=Status.QUEUED
+    )
+    attempts = models.PositiveIntegerField(default=0)
+    run_at = models.DateTimeField(default=timezone.now)
+    created_at = models.DateTimeField(default=timezone.now, editable=False)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True)
+
+    class Meta:
+        indexes = [
+            # Workers claim queued jobs that are due, oldest first.
+            models.Index(fields=["status", "run_at"], name="job_status_run_at_idx"),
+        ]
+
+    def __str__(self):
+        """Return the job name and status for readable representation."""
+        return f"{self.name} ({self.status})"
@@ -0,0 +1,198 @@
+"""Tests for background jobs on the thread and database backends."""
+
+# Standard library imports
+import datetime
+from unittest import mock
+
+# Django imports
+from django.db import transaction
+from django.test import TransactionTestCase
+from django.utils import timezone
+
+# Local imports
+from jobs_app import jobs
+from jobs_app.models import Job
+from jobs_app.worker import STALE_AFTER, Worker, claim, requeue_stale
+
+calls = []
+
+
+@jobs.job
+def record(value):
+    calls.append(value)
+
+
+@jobs.job(max_attempts=3)
+def flaky(value, failures):
+    """Fail the first `failures` attempts for `value`."""
+    calls.append(value)
+    if calls.count(value) <= failures:
+        raise RuntimeError(f"attempt {calls.count(value)} failed")
+
+
+def drain():
+    """Wait until the thread backend has run everything queued so far.
+
+    A retry is queued by the attempt before it, so wait twice.
+    """
+    for _ in range(2):
+        jobs.executor.submit(lambda: None).result()
+
+
+class JobTestCase(TransactionTestCase):
+    """Transaction test cases let `on_commit` hand jobs to the backend."""
+
+    def setUp(self):
+        calls.clear()
+        patcher = mock.patch.object(jobs, "RETRY_DELAY", 0)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+
+class EnqueueTests(JobTestCase):
+    def test_rejects_unregistered_functions_and_arguments(self):
+        with self.assertRaises(ValueError):
+            jobs.enqueue(len, [])
+        with self.assertRaises(TypeError):
+            jobs.enqueue(record, object())
+
+    def test_retry_delay_doubles_up_to_an_hour(self):
+        with mock.patch.object(jobs, "RETRY_DELAY", 10):
+            self.assertEqual(
+                [jobs.retry_delay(attempt) for attempt in (1, 2, 3, 4)],
+                [10, 20, 40, 80],
+            )
+            self.assertEqual(jobs.retry_delay(20), jobs.MAX_RETRY_DELAY)
+
+
+class ThreadBackendTests(JobTestCase):
+    def test_runs_after_commit(self):
+        with transaction.atomic():
+            jobs.enqueue(record, 1)
+            self.assertEqual(calls, [])
+        drain()
+        self.assertEqual(calls, [1])
+
+    def test_rollback_cancels_the_job(self):
+        with self.assertRaises(KeyError):
+            with transaction.atomic():
+                jobs.enqueue(record, 1)
+                raise KeyError
+        drain()
+        self.assertEqual(calls, [])
+
+    def test_retries_until_success(self):
+        with self.assertLogs("kanmind.jobs", "ERROR") as logs:
+            jobs.enqueue(flaky, 1, 2)
+            drain()
+            drain()
+        self.assertEqual(calls, [1, 1, 1])
+        self.assertEqual(len(logs.records), 2)
+
+    def test_gives_up_after_max_attempts(self):
+        with self.assertLogs("kanmind.jobs", "ERROR"):
+            jobs.enqueue(flaky, 1, 10)
+            drain()
+            drain()
+        self.assertEqual(calls, [1] * flaky.max_attempts)
+
+
+@mock.patch.object(jobs, "BACKEND", "database")
+class DatabaseBackendTests(JobTestCase):
+    def run_worker(self):
+        return Worker(threads=2, poll_interval=0.01, burst=True).run()
+
+    def make_due(self):
+        Job.objects.update(run_at=timezone.now())
+
+    def test_rollback_cancels_the_job(self):
+        with self.assertRaises(KeyError):
+            with transaction.atomic():
+                jobs.enqueue(record, 1)
+                raise KeyError
+        self.assertFalse(Job.objects.exists())
+
+    def test_runs_due_jobs_and_deletes_them(self):
+        jobs.enqueue(record, 1)
+        jobs.enqueue(record, 2, delay=3600)
+        self.assertEqual(self.run_worker(), 1)
+        self.assertEqual(calls, [1])
+        self.assertEqual(list(Job.objects.values_list("args", flat=True)), [[2]])
+
+    def test_claims_each_job_once(self):
+        for value in range(3):
+            jobs.enqueue(record, value)
+        first, second = claim(2), claim(5)
+        self.assertEqual([len(first), len(second)], [2, 1])
+        self.assertEqual(claim(5), [])
+        self.assertEqual(
+            {job.pk for job in first + second},
+            set(Job.objects.values_list("pk", flat=True)),
+        )
+        self.assertEqual(
+            set(Job.objects.values_list("status", "attempts")),
+            {(Job.Status.RUNNING, 1)},
+        )
+
+    def test_retries_with_backoff_then_fails(self):
+        jobs.enqueue(flaky, 1, 10)
+        with mock.patch.object(jobs, "RETRY_DELAY", 60), self.assertLogs(
+            "kanmind.jobs", "ERROR"
+        ):
+            for attempt in (1, 2):
+                self.make_due()
+                self.run_worker()
+                job = Job.objects.get()
+                self.assertEqual(
+                    (job.status, job.attempts), (Job.Status.QUEUED, attempt)
+                )
+                self.assertIn(f"attempt {attempt} failed", job.last_error)
+                delay = (job.run_at - job.started_at).total_seconds()
+                self.assertGreaterEqual(delay, jobs.retry_delay(attempt))
+                self.assertLess(delay, jobs.retry_delay(attempt) + 5)
+                # Not due yet.
+                self.assertEqual(self.run_worker(), 0)
+
+            self.make_due()
+            self.run_worker()
+        job = Job.objects.get()
+        self.assertEqual((job.status, job.attempts), (Job.Status.FAILED, 3))
+        self.assertIsNotNone(job.finished_at)
+        self.assertEqual(calls, [1, 1, 1])
+        self.assertEqual(self.run_worker(), 0)
+
+    def test_unknown_jobs_fail_without_retry(self):
+        Job.objects.create(name="jobs_app.tests.missing", args=[])
+        Job.objects.create(name="no_such_module.job", args=[])
+        with self.assertLogs("kanmind.jobs", "ERROR"):
+            self.assertEqual(self.run_worker(), 2)
+        for job in Job.objects.all():
+            self.assertEqual((job.status, job.attempts), (Job.Status.FAILED, 1))
+            self.assertEqual(job.last_error, f"Unknown job {job.name!r}")
+
+    def test_requeues_jobs_of_vanished_workers(self):
+        jobs.enqueue(record, 1)
+        jobs.enqueue(flaky, 2, 0)
+        Job.objects.create(name="no_such_module.job", args=[])
+        claim(3)
+        stale = timezone.now() - datetime.timedelta(seconds=STALE_AFTER + 1)
+        Job.objects.update(started_at=stale)
+        Job.objects.filter(name=flaky.job_name).update(attempts=flaky.max_attempts)
+
+        with self.assertLogs("kanmind.jobs", "ERROR"):
+            requeue_stale()
+        statuses = dict(Job.objects.values_list("name", "status"))
+        self.assertEqual(
+            statuses,
+            {
+                record.job_name: Job.Status.QUEUED,
+                flaky.job_name: Job.Status.FAILED,
+                "no_such_module.job": Job.Status.FAILED,
+            },
+        )
+        self.assertEqual(
+            set(Job.objects.values_list("last_error", flat=True)),
+            {"Worker stopped while running"},
+        )
+        self.run_worker()
+        self.assertEqual(calls, [1])
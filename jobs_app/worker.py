@@ -0,0 +1,145 @@
+"""The worker behind `manage.py run_kanban_worker` (database backend).
+
+The worker polls the `Job` table for queued jobs that are due and runs
+them on a thread pool, one claimed job per free thread. A job is
+claimed with a conditional UPDATE from `queued` to `running`. Only one
+worker's UPDATE can match, so several workers, even in different
+processes, can share the table without row locks. That works the same
+on SQLite and PostgreSQL.
+
+A succeeded job's row is deleted. A failed one is queued again with
+backoff, or marked `failed` after its last attempt. Jobs left
+`running` for longer than `KANMIND_JOBS_STALE_AFTER` seconds are
+assumed to have lost their worker and are handled like a failed
+attempt.
+"""
+
+# Standard library imports
+import datetime
+import logging
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+# Django imports
+from django.conf import settings
+from django.db import close_old_connections
+from django.db.models import F
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+# Local imports
+from jobs_app.jobs import call, registry, retry_delay
+from jobs_app.models import Job
+
+STALE_AFTER = getattr(settings, "KANMIND_JOBS_STALE_AFTER", 3600)
+
+logger = logging.getLogger("kanmind.jobs")
+
+
+class Worker:
+    """Claim and run due jobs until stopped.
+
+    `burst` makes `run()` return once no job is due and none is running,
+    instead of polling forever.
+    """
+
+    def __init__(self, threads=1, poll_interval=1.0, burst=False):
+        self.threads = threads
+        self.poll_interval = poll_interval
+        self.burst = burst
+        self.stopped = False
+
+    def run(self):
+        """Process jobs; return the number of attempts made."""
+        running = set()
+        attempts = 0
+        with ThreadPoolExecutor(
+            max_workers=self.threads, thread_name_prefix="kanmind-worker"
+        ) as executor:
+            while not self.stopped:
+                requeue_stale()
+                claimed = claim(self.threads - len(running))
+                for job in claimed:
+                    running.add(executor.submit(run_job, job))
+                attempts += len(claimed)
+                if self.burst and not running:
+                    break
+                if running:
+                    _, running = wait(
+                        running, timeout=self.poll_interval, return_when=FIRST_COMPLETED
+                    )
+                elif not claimed:
+                    time.sleep(self.poll_interval)
+        return attempts
+
+    def stop(self):
+        """Let running jobs finish, then return from `run()`."""
+        self.stopped = True
+
+
+def claim(limit):
+    """Mark up to `limit` due jobs as running and return them."""
+    if limit <= 0:
+        return []
+    now = timezone.now()
+    due = Job.objects.filter(status=Job.Status.QUEUED, run_at__lte=now)
+    claimed = []
+    for pk in due.order_by("run_at", "pk").values_list("pk", flat=True)[:limit]:
+        updated = Job.objects.filter(pk=pk, status=Job.Status.QUEUED).update(
+            status=Job.Status.RUNNING, started_at=now, attempts=F("attempts") + 1
+        )
+        if updated:
+            claimed.append(pk)
+    return list(Job.objects.filter(pk__in=claimed).order_by("run_at", "pk"))
+
+
+def run_job(job):
+    """Run one claimed job in a worker thread and record its result."""
+    close_old_connections()
+    try:
+        function = resolve(job.name)
+        if function is None:
+            finish(job, f"Unknown job {job.name!r}", retry=False)
+            return
+        error = call(function, job.args, job.attempts, job.run_at)
+        if error is None:
+            Job.objects.filter(pk=job.pk).delete()
+        else:
+            finish(job, repr(error), retry=job.attempts < function.max_attempts)
+    finally:
+        close_old_connections()
+
+
+def resolve(name):
+    """Return the registered job function called `name`, or None."""
+    if name not in registry:
+        # Importing the module registers the jobs it defines.
+        try:
+            import_string(name)
+        except ImportError:
+            return None
+    return registry.get(name)
+
+
+def finish(job, error, retry):
+    """Queue a failed job for another attempt, or mark it failed."""
+    now = timezone.now()
+    if retry:
+        run_at = now + datetime.timedelta(seconds=retry_delay(job.attempts))
+        changes = {"status": Job.Status.QUEUED, "run_at": run_at}
+    else:
+        changes = {"status": Job.Status.FAILED, "finished_at": now}
+        logger.error(
+            "Job %s %s gave up after %s attempt(s)", job.pk, job.name, job.attempts
+        )
+    Job.objects.filter(pk=job.pk).update(last_error=error, **changes)
+
+
+def requeue_stale():
+    """Handle jobs whose worker vanished mid-run as failed attempts."""
+    cutoff = timezone.now() - datetime.timedelta(seconds=STALE_AFTER)
+    stale = Job.objects.filter(status=Job.Status.RUNNING, started_at__lt=cutoff)
+    for job in stale:
+        function = resolve(job.name)
+        max_attempts = function.max_attempts if function is not None else 0
+        finish(job, "Worker stopped while running", retry=job.attempts < max_attempts)
@@ -0,0 +1,246 @@
+"""Native async read endpoints for the Kanban API.
+
+Async counterparts of the board list/detail, assigned/reviewing task
+and comment list endpoints, served under `/api/async/`. They return
+the same payloads as the DRF views but never block a worker thread on
+the database: authentication, membership checks and queries use
+Django's async ORM and cache APIs. Every queryset is annotated or
+prefetched up front, so serializers only run Python code and never
+trigger lazy queries.
+
+These views only pay off under an ASGI server (`core.asgi`); under
+WSGI Django runs them in a one-off event loop per request.
+"""
+
+# Third party imports
+from rest_framework.exceptions import (
+    APIException,
+    AuthenticationFailed,
+    ValidationError,
+)
+from rest_framework.request import Request
+
+# Django imports
+from django.db.models import aprefetch_related_objects
+from django.http import HttpResponse
+from django.views.decorators.http import require_GET
+
+# Local imports
+from auth_app.api.authentication import CachedTokenAuthentication
+from kanban_app.api.conditional import board_validators, not_modified, set_validators
+from kanban_app.api.filters import CommentSince, TaskFilters
+from kanban_app.api.pagination import (
+    BoardPagination,
+    CommentPagination,
+    TaskPagination,
+)
+from kanban_app.api.renderers import FastJSONRenderer
+from kanban_app.api.response_cache import board_payload_cache, payload_variant
+from kanban_app.api.rows import (
+    board_list_data,
+    board_list_values,
+    task_list_data,
+    task_list_values,
+)
+from kanban_app.api.serializers import BoardDetailSerializer, CommentSerializer
+from kanban_app.membership import acan_access_board, aget_task_board_id
+from kanban_app.models import Board, Comment, Task
+
+NOT_AUTHENTICATED = "Authentication credentials were not provided."
+PERMISSION_DENIED = "You do not have permission to perform this action."
+BOARD_NOT_FOUND = "No Board matches the given query."
+
+
+def render_json(data, status=200):
+    """Render `data` exactly like the DRF views' JSON renderer would."""
+    body = FastJSONRenderer().render(data)
+    return HttpResponse(body, status=status, content_type="application/json")
+
+
+def error_response(detail, status):
+    response = render_json({"detail": detail}, status=status)
+    if status == 401:
+        response["WWW-Authenticate"] = CachedTokenAuthentication.keyword
+    return response
+
+
+def validation_error_response(exc):
+    """Render a `ValidationError` the way DRF's exception handler does."""
+    detail = exc.detail
+    if not isinstance(detail, (dict, list)):
+        detail = {"detail": detail}
+    return render_json(detail, status=exc.status_code)
+
+
+async def authenticate_request(request):
+    """Authenticate via token header; return an error response or None.
+
+    On success `request.user` is set with its account preloaded.
+    """
+    try:
+        credentials = await CachedTokenAuthentication().aauthenticate(request)
+    except AuthenticationFailed as exc:
+        return error_response(exc.detail, exc.status_code)
+    if credentials is None:
+        return error_response(NOT_AUTHENTICATED, 401)
+    request.user = credentials[0]
+    return None
+
+
+async def authorize_board(request, board_id):
+    """Apply the `IsBoardOwnerOrMember` rule; return an error response or None."""
+    if await acan_access_board(request, board_id):
+        return None
+    if not await Board.objects.filter(pk=board_id).aexists():
+        return error_response(BOARD_NOT_FOUND, 404)
+    return error_response(PERMISSION_DENIED, 403)
+
+
+async def paginated_response(paginator, queryset, request, build_data):
+    """Render one page of `queryset` with the paginator's envelope.
+
+    `build_data` turns the page's rows into the payload list.
+    """
+    drf_request = Request(request)
+    try:
+        page = await paginator.apaginate_queryset(queryset, drf_request)
+    except APIException as exc:
+        return error_response(exc.detail, exc.status_code)
+    return render_json(paginator.get_paginated_response(build_data(page)).data)
+
+
+async def filtered_task_list(request, queryset):
+    """Render a task list page honouring the `TaskFilters` parameters."""
+    try:
+        filters = TaskFilters(request.GET)
+    except ValidationError as exc:
+        return validation_error_response(exc)
+
+    paginator = TaskPagination()
+    paginator.ordering = filters.ordering
+    queryset = task_list_values(filters.filter(queryset))
+    return await paginated_response(paginator, queryset, request, task_list_data)
+
+
+@require_GET
+async def board_list(request):
+    """Async `GET /api/boards/`."""
+    error = await authenticate_request(request)
+    if error is not None:
+        return error
+
+    queryset = board_list_values(Board.objects.accessible_to(request.user.account))
+    return await paginated_response(
+        BoardPagination(), queryset, request, board_list_data
+    )
+
+
+@require_GET
+async def board_detail(request, board_id):
+    """Async `GET /api/boards/<id>/`, sharing ETags and payload cache."""
+    error = await authenticate_request(request)
+    if error is None:
+        error = await authorize_board(request, board_id)
+    if error is not None:
+        return error
+
+    try:
+        filters = TaskFilters(request.GET)
+    except ValidationError as exc:
+        return validation_error_response(exc)
+
+    # The access check may be answered from cache after the board was
+    # soft-deleted, so the board can still be gone here.
+    board = await Board.objects.filter(pk=board_id).afirst()
+    if board is None:
+        return error_response(BOARD_NOT_FOUND, 404)
+    etag, last_modified = board_validators(
+        request, "board", board.pk, board.revision, board.updated_at
+    )
+    response = not_modified(request, etag, last_modified)
+    if response is not None:
+        return response
+
+    variant = payload_variant(filters)
+    body = await board_payload_cache.aget(board.pk, board.revision, variant)
+    cache_status = "HIT"
+    if body is None:
+        cache_status = "MISS"
+        tasks = filters.filter_and_sort(Task.objects.all())
+        await aprefetch_related_objects(
+            [board], *Board.objects.detail_prefetches(tasks=tasks)
+        )
+        body = FastJSONRenderer().render(BoardDetailSerializer(board).data)
+        await board_payload_cache.aset(board.pk, board.revision, body, variant)
+
+    response = HttpResponse(body, content_type="application/json")
+    response["X-Cache"] = cache_status
+    return set_validators(response, etag, last_modified)
+
+
+@require_GET
+async def tasks_assigned(request):
+    """Async `GET /api/tasks/assigned-to-me/`."""
+    error = await authenticate_request(request)
+    if error is not None:
+        return error
+
+    return await filtered_task_list(
+        request, Task.objects.assigned_to(request.user.account)
+    )
+
+
+@require_GET
+async def tasks_reviewing(request):
+    """Async `GET /api/tasks/reviewing/`."""
+    error = await authenticate_request(request)
+    if error is not None:
+        return error
+
+    return await filtered_task_list(
+        request, Task.objects.reviewed_by(request.user.account)
+    )
+
+
+@require_GET
+async def task_comments(request, task_id):
+    """Async `GET /api/tasks/<task_id>/comments/`."""
+    error = await authenticate_request(request)
+    if error is not None:
+        return error
+
+    board_id = await aget_task_board_id(request, task_id)
+    if board_id is None:
+        return error_response("Task does not exist", 404)
+    if not await acan_access_board(request, board_id):
+        return error_response(PERMISSION_DENIED, 403)
+
+    validators = (
+        await Board.objects.filter(pk=board_id)
+        .values_list("revision", "updated_at")
+        .afirst()
+    )
+    if validators is None:
+        return error_response(BOARD_NOT_FOUND, 404)
+    revision, updated_at = validators
+    etag, last_modified = board_validators(
+        request, "comments", task_id, revision, updated_at
+    )
+    response = not_modified(request, etag, last_modified)
+    if response is not None:
+        return response
+
+    queryset = Comment.objects.filter(task_id=task_id).select_related("author")
+    try:
+        queryset = await CommentSince(request.GET).afilter(queryset)
+    except ValidationError as exc:
+        return validation_error_response(exc)
+    response = await paginated_response(
+        CommentPagination(),
+        queryset,
+        request,
+        lambda page: CommentSerializer(page, many=True).data,
+    )
+    if response.status_code == 200:
+        set_validators(response, etag, last_modified)
+    return response
@@ -0,0 +1,44 @@
+"""Conditional GET support (ETag / Last-Modified) for Kanban endpoints.
+
+Board payloads, tasks and comment lists are versioned by the owning
+board's `revision`, which signal handlers bump on every relevant write.
+Views compute validators from that single row, answer matching
+`If-None-Match` / `If-Modified-Since` requests with 304 before loading
+the payload, and attach the validators to full responses.
+"""
+
+# Django imports
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
+
+
+def board_validators(request, kind, object_id, revision, updated_at):
+    """Return `(etag, last_modified)` for an object versioned by its board.
+
+    The accepted renderer format is part of the ETag so JSON and the
+    browsable API never share a cached representation.
+    """
+    renderer = getattr(request, "accepted_renderer", None)
+    fmt = getattr(renderer, "format", "json")
+    etag = f'"{kind}-{object_id}-r{revision}-{fmt}"'
+    return etag, int(updated_at.timestamp())
+
+
+def not_modified(request, etag, last_modified):
+    """Return a 304 response if the client's copy is current, else None."""
+    http_request = getattr(request, "_request", request)
+    response = get_conditional_response(
+        http_request, etag=etag, last_modified=last_modified
+    )
+    if response is not None:
+        set_validators(response, etag, last_modified)
+    return response
+
+
+def set_validators(response, etag, last_modified):
+    """Attach validators so clients can revalidate on their next poll."""
+    response["ETag"] = etag
+    response["Last-Modified"] = http_date(last_modified)
+    # Payloads are per-user and change often: always revalidate.
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
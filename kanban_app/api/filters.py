@@ -0,0 +1,208 @@
+"""Query parameter filtering and ordering for task and comment lists.
+
+The assigned/reviewing task lists and the tasks of the board detail
+payload accept:
+
+- `status`, `priority`: one or more choice values, repeated or
+  comma-separated (`?status=to-do,review`).
+- `assignee`: an account id, or `none` for unassigned tasks.
+- `due_after`, `due_before`: ISO dates, both inclusive.
+- `ordering`: one of `TaskFilters.orderings`. Without it, lists are
+  ordered by due date and board detail tasks by column position.
+
+Filters become plain `WHERE` conditions, which the task indexes on
+`(board, status)`, `(board, priority)` and `(assignee|reviewer,
+due_date, id)` serve. Orderings are restricted to a whitelist whose
+entries all end in `id`, so they stay usable for keyset pagination.
+
+Comment lists accept `since`, see `CommentSince`.
+"""
+
+# Standard library imports
+import datetime
+
+# Third party imports
+from rest_framework.exceptions import ValidationError
+
+# Django imports
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+# Local imports
+from kanban_app.models import Task
+
+
+class TaskFilters:
+    """Validated task filter and ordering parameters of one request."""
+
+    orderings = {
+        "due_date": ("due_date", "id"),
+        "-due_date": ("-due_date", "-id"),
+        "id": ("id",),
+        "-id": ("-id",),
+    }
+    default_ordering = "due_date"
+    column_ordering = ("status", "position", "id")
+
+    def __init__(self, query_params):
+        errors = {}
+        self.conditions = {}
+        self.params = {}
+
+        for name, choices in (
+            ("status", Task.Status.values),
+            ("priority", Task.Priority.values),
+        ):
+            values = self._split(query_params.getlist(name))
+            invalid = [value for value in values if value not in choices]
+            if invalid:
+                errors[name] = [f"Invalid choice: {', '.join(invalid)}."]
+            elif values:
+                self._add(name, f"{name}__in", sorted(set(values)))
+
+        assignee = query_params.get("assignee")
+        if assignee == "none":
+            self._add("assignee", "assignee__isnull", True, label="none")
+        elif assignee:
+            try:
+                self._add("assignee", "assignee_id", int(assignee))
+            except ValueError:
+                errors["assignee"] = ["Expected an account id or 'none'."]
+
+        for name, lookup in (("due_after", "gte"), ("due_before", "lte")):
+            value = query_params.get(name)
+            if not value:
+                continue
+            try:
+                day = datetime.date.fromisoformat(value)
+            except ValueError:
+                errors[name] = ["Expected a date in YYYY-MM-DD format."]
+            else:
+                self._add(name, f"due_date__{lookup}", day)
+
+        ordering = query_params.get("ordering")
+        if ordering and ordering not in self.orderings:
+            errors["ordering"] = [
+                f"Expected one of: {', '.join(sorted(self.orderings))}."
+            ]
+        elif ordering:
+            self.params["ordering"] = ordering
+        self.ordering_name = ordering or self.default_ordering
+
+        if errors:
+            raise ValidationError(errors)
+
+    @property
+    def ordering(self):
+        """Return the ordering as model field names, for keyset pagination."""
+        return self.orderings[self.ordering_name]
+
+    def filter(self, queryset):
+        """Apply the filter conditions to a task queryset."""
+        if not self.conditions:
+            return queryset
+        return queryset.filter(**self.conditions)
+
+    def filter_and_sort(self, queryset):
+        """Apply the filters and the requested ordering, else column order.
+
+        Column order, `(status, position, id)`, is what the board detail
+        payload uses by default; the `(board, status, position)` index
+        returns the rows already sorted.
+        """
+        queryset = self.filter(queryset)
+        if "ordering" in self.params:
+            return queryset.order_by(*self.ordering)
+        return queryset.order_by(*self.column_ordering)
+
+    def cache_variant(self):
+        """Return a canonical string identifying these parameters.
+
+        Empty when no parameter was given, so unfiltered payloads keep
+        sharing one cache entry.
+        """
+        return "&".join(
+            f"{name}={self._format(value)}"
+            for name, value in sorted(self.params.items())
+        )
+
+    def _add(self, name, lookup, value, label=None):
+        self.conditions[lookup] = value
+        self.params[name] = value if label is None else label
+
+    @staticmethod
+    def _split(values):
+        return [part for value in values for part in value.split(",") if part]
+
+    @staticmethod
+    def _format(value):
+        if isinstance(value, list):
+            return ",".join(value)
+        if isinstance(value, datetime.date):
+            return value.isoformat()
+        return str(value)
+
+
+class CommentSince:
+    """The `since` parameter of a comment list.
+
+    `since=<comment id>` keeps the comments after that comment in the
+    list's `(created_at, id)` order; `since=<ISO datetime>` keeps those
+    created after that moment. Either way the condition is a range on
+    the `(task, created_at, id)` index. An id that is not a comment of
+    the task is rejected, so clients holding a deleted comment reload
+    the whole list instead of silently missing comments.
+    """
+
+    def __init__(self, query_params):
+        self.comment_id = self.created_at = None
+        value = query_params.get("since")
+        if not value:
+            return
+        if value.isdigit():
+            self.comment_id = int(value)
+            return
+        try:
+            created_at = parse_datetime(value)
+        except ValueError:
+            created_at = None
+        if created_at is None:
+            raise ValidationError(
+                {"since": ["Expected a comment id or an ISO 8601 datetime."]}
+            )
+        if timezone.is_naive(created_at):
+            created_at = timezone.make_aware(created_at)
+        self.created_at = created_at
+
+    def filter(self, queryset):
+        """Restrict a task's comment queryset to comments after `since`."""
+        if self.comment_id is None:
+            return self._after(queryset, self.created_at)
+        anchor = self._anchor(queryset).first()
+        return self._after(queryset, self._require(anchor))
+
+    async def afilter(self, queryset):
+        """Async counterpart of `filter()`."""
+        if self.comment_id is None:
+            return self._after(queryset, self.created_at)
+        anchor = await self._anchor(queryset).afirst()
+        return self._after(queryset, self._require(anchor))
+
+    def _anchor(self, queryset):
+        return queryset.filter(pk=self.comment_id).values_list("created_at", flat=True)
+
+    def _require(self, anchor):
+        if anchor is None:
+            raise ValidationError({"since": ["Unknown comment for this task."]})
+        return anchor
+
+    def _after(self, queryset, created_at):
+        if created_at is None:
+            return queryset
+        if self.comment_id is None:
+            return queryset.filter(created_at__gt=created_at)
+        return queryset.filter(
+            Q(created_at__gt=created_at)
+            | Q(created_at=created_at, id__gt=self.comment_id)
+        )
@@ -0,0 +1,277 @@
+"""Pagination classes for the Kanban application API endpoints.
+
+List endpoints default to keyset (cursor) pagination: each page is
+fetched with a `WHERE` clause that starts right after the last row of
+the previous page, so deep pages cost the same as the first one. The
+existing frontend can opt in to classic page numbers by sending a
+`page` query parameter.
+"""
+
+# Standard library imports
+import base64
+import datetime
+import json
+import operator
+from collections import OrderedDict
+from functools import reduce
+
+# Third party imports
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
+
+# Django imports
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.core.paginator import InvalidPage, Page
+from django.db.models import F, Q
+
+
+class KanbanPageNumberPagination(PageNumberPagination):
+    """Opt-in page-number mode used when a request sends `page`."""
+
+    page_size = api_settings.PAGE_SIZE
+    page_size_query_param = "page_size"
+    max_page_size = 200
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """Async counterpart of `paginate_queryset()` for native async views."""
+        page_size = self.get_page_size(request)
+        paginator = self.django_paginator_class(queryset, page_size)
+        paginator.count = await queryset.acount()
+        page_number = self.get_page_number(request, paginator)
+        try:
+            number = paginator.validate_number(page_number)
+        except InvalidPage as exc:
+            msg = self.invalid_page_message.format(
+                page_number=page_number, message=str(exc)
+            )
+            raise NotFound(msg)
+
+        bottom = (number - 1) * page_size
+        rows = [row async for row in queryset[bottom : bottom + page_size]]
+        self.page = Page(rows, number, paginator)
+        self.request = request
+        return rows
+
+
+class SearchPagination(KanbanPageNumberPagination):
+    """Page-number pagination for ranked search results.
+
+    Ranks have no stable keyset, so results are always paged by number.
+    """
+
+    page_size = 20
+
+
+class KeysetPagination(BasePagination):
+    """Cursor pagination over a stable ordering ending in a unique field.
+
+    `ordering` lists model field names, optionally prefixed with `-`
+    for descending order; the last one must be unique (usually `id`).
+    Nullable fields sort their NULLs last in either direction. Views
+    may override the ordering per request through a
+    `get_keyset_ordering()` method.
+
+    Responses look like `{"next": <url or null>, "results": [...]}`.
+    When the request carries a `page` parameter the paginator falls
+    back to `KanbanPageNumberPagination` over the same ordering.
+    """
+
+    ordering = ("id",)
+    page_size = api_settings.PAGE_SIZE
+    page_size_query_param = "page_size"
+    max_page_size = 200
+    cursor_query_param = "cursor"
+    page_query_param = "page"
+    invalid_cursor_message = "Invalid cursor"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        """Return one page of `queryset` in keyset or page-number mode."""
+        queryset = self.prepare(queryset, request, view)
+        if self.page_paginator is not None:
+            return self.page_paginator.paginate_queryset(queryset, request, view)
+        return self.set_page(list(queryset))
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """Async counterpart of `paginate_queryset()` for native async views."""
+        queryset = self.prepare(queryset, request, view)
+        if self.page_paginator is not None:
+            return await self.page_paginator.apaginate_queryset(queryset, request, view)
+        return self.set_page([row async for row in queryset])
+
+    def prepare(self, queryset, request, view):
+        """Order `queryset` and, in keyset mode, limit it to the next page."""
+        self.request = request
+        self.ordering = self.get_ordering(view)
+        queryset = self.order_queryset(queryset)
+
+        if self.page_query_param in request.query_params:
+            self.page_paginator = KanbanPageNumberPagination()
+            return queryset
+        self.page_paginator = None
+
+        position = self.decode_cursor(request, queryset.model)
+        self.current_page_size = self.get_page_size(request)
+        return self.filter_after(queryset, position)[: self.current_page_size + 1]
+
+    def set_page(self, rows):
+        """Keep one page of `rows`; the extra fetched row signals a next page."""
+        self.has_next = len(rows) > self.current_page_size
+        self.page = rows[: self.current_page_size]
+        return self.page
+
+    def get_paginated_response(self, data):
+        """Wrap a serialized page with the link to the next page."""
+        if self.page_paginator is not None:
+            return self.page_paginator.get_paginated_response(data)
+        return Response(
+            OrderedDict([("next", self.get_next_link()), ("results", data)])
+        )
+
+    def get_paginated_response_schema(self, schema):
+        """Describe the keyset response envelope for schema generation."""
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
+
+    def get_ordering(self, view):
+        """Return the ordering for this request, allowing view overrides."""
+        if view is not None and hasattr(view, "get_keyset_ordering"):
+            return tuple(view.get_keyset_ordering())
+        return tuple(self.ordering)
+
+    def get_page_size(self, request):
+        """Return the requested page size, capped at `max_page_size`."""
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        if size <= 0:
+            return self.page_size
+        return min(size, self.max_page_size)
+
+    def order_queryset(self, queryset):
+        """Apply the keyset ordering, sorting NULLs last.
+
+        NULL placement is only spelled out for nullable fields so that
+        plain columns keep matching the composite indexes.
+        """
+        expressions = []
+        for name, descending in self._ordering_fields():
+            nulls_last = self._is_nullable(queryset.model, name) or None
+            expression = F(name)
+            expressions.append(
+                expression.desc(nulls_last=nulls_last)
+                if descending
+                else expression.asc(nulls_last=nulls_last)
+            )
+        return queryset.order_by(*expressions)
+
+    def filter_after(self, queryset, position):
+        """Restrict `queryset` to rows strictly after `position`.
+
+        Expands the tuple comparison `(f1, f2, ...) > (v1, v2, ...)`
+        into `OR`ed prefix-equality terms so each term can be served by
+        a composite index on the ordering fields.
+        """
+        if position is None:
+            return queryset
+
+        terms = []
+        equal_prefix = Q()
+        for (name, descending), value in zip(self._ordering_fields(), position):
+            if value is None:
+                # NULLs sort last, so nothing on this field comes after them.
+                equal_prefix &= Q(**{f"{name}__isnull": True})
+                continue
+
+            after = Q(**{f"{name}__{'lt' if descending else 'gt'}": value})
+            if self._is_nullable(queryset.model, name):
+                after |= Q(**{f"{name}__isnull": True})
+            terms.append(equal_prefix & after)
+            equal_prefix &= Q(**{name: value})
+        if not terms:
+            return queryset.none()
+        return queryset.filter(reduce(operator.or_, terms))
+
+    def get_next_link(self):
+        """Return the URL of the next page, or None on the last page."""
+        if not self.has_next or not self.page:
+            return None
+        last = self.page[-1]
+        position = [self._row_value(last, name) for name, _ in self._ordering_fields()]
+        url = self.request.build_absolute_uri()
+        return replace_query_param(
+            url, self.cursor_query_param, self.encode_cursor(position)
+        )
+
+    def encode_cursor(self, position):
+        """Encode ordering values as an opaque URL-safe token."""
+        values = [
+            (
+                value.isoformat()
+                if isinstance(value, (datetime.date, datetime.datetime))
+                else value
+            )
+            for value in position
+        ]
+        payload = json.dumps(values, separators=(",", ":")).encode()
+        return base64.urlsafe_b64encode(payload).decode().rstrip("=")
+
+    def decode_cursor(self, request, model):
+        """Decode the request cursor into typed ordering values."""
+        token = request.query_params.get(self.cursor_query_param)
+        if not token:
+            return None
+
+        fields = self._ordering_fields()
+        try:
+            padded = token + "=" * (-len(token) % 4)
+            values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+            if not isinstance(values, list) or len(values) != len(fields):
+                raise ValueError
+            return [
+                None if value is None else model._meta.get_field(name).to_python(value)
+                for (name, _), value in zip(fields, values)
+            ]
+        except (TypeError, ValueError, DjangoValidationError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def _ordering_fields(self):
+        """Return `(field_name, descending)` pairs for the ordering."""
+        return [(name.lstrip("-"), name.startswith("-")) for name in self.ordering]
+
+    @staticmethod
+    def _is_nullable(model, name):
+        return model._meta.get_field(name).null
+
+    @staticmethod
+    def _row_value(row, name):
+        if isinstance(row, dict):
+            return row[name]
+        return getattr(row, name)
+
+
+class BoardPagination(KeysetPagination):
+    """Keyset pagination for boards ordered by id."""
+
+    ordering = ("id",)
+
+
+class TaskPagination(KeysetPagination):
+    """Keyset pagination for task lists ordered by `(due_date, id)`."""
+
+    ordering = ("due_date", "id")
+
+
+class CommentPagination(KeysetPagination):
+    """Keyset pagination for comments ordered by `(created_at, id)`."""
+
+    ordering = ("created_at", "id")
@@ -3,25 +3,29 @@
 from rest_framework.permissions import BasePermission
 from rest_framework.exceptions import NotFound
 
-from kanban_app.models import Board, Task
-
-from django.db.models import Q
+from kanban_app.membership import can_access_board, get_task_board_id
+from kanban_app.models import Board
 
 
 class IsBoardOwnerOrMemberHelper:
-    """Shared helper that checks if an account belongs to a board.
+    """Shared helper that checks if the requester belongs to a board.
 
-    Provides a single static method to determine whether an `account`
-    is either the owner of the given `board` or listed among its
-    members.
+    Provides a single static method to determine whether the requesting
+    account is either the owner of the given board or listed among its
+    members. Membership is resolved once per request through
+    `kanban_app.membership`, so repeated checks cost no extra queries.
     """
 
     @staticmethod
-    def has_board_permission(board, account):
-        """Return True if account is board owner or member; else False."""
-        return (
-            board.owner_id == account.id or board.members.filter(id=account.id).exists()
-        )
+    def has_board_permission(request, board_id):
+        """Return True if the requester is board owner or member; else False."""
+        return can_access_board(request, board_id)
+
+    @staticmethod
+    def check_board_exists(board_id):
+        """Raise `NotFound` unless a board with `board_id` exists."""
+        if not Board.objects.filter(id=board_id).exists():
+            raise NotFound("Board does not exist")
 
 
 class IsBoardOwnerOrMember(BasePermission):
@@ -47,20 +51,16 @@ class IsBoardOwnerOrMember(BasePermission):
             if not board_id:
                 return False
 
-            try:
-                board = Board.objects.get(id=board_id)
-            except Board.DoesNotExist:
-                raise NotFound("Board does not exist")
-
-            account = request.user.account
-            return IsBoardOwnerOrMemberHelper.has_board_permission(board, account)
+            if IsBoardOwnerOrMemberHelper.has_board_permission(request, board_id):
+                return True
+            IsBoardOwnerOrMemberHelper.check_board_exists(board_id)
+            return False
 
         return True
 
     def has_object_permission(self, request, view, board):
         """Object-level check: requester must be board owner or member."""
-        account = request.user.account
-        return IsBoardOwnerOrMemberHelper.has_board_permission(board, account)
+        return IsBoardOwnerOrMemberHelper.has_board_permission(request, board.id)
 
 
 class CanCreateTask(BasePermission):
@@ -73,13 +73,11 @@ class CanCreateTask(BasePermission):
             if not board_id:
                 raise NotFound("Board id is required")
 
-            if not Board.objects.filter(id=board_id).exists():
-                raise NotFound("Board does not exist")
-            account = request.user.account
-            return Board.objects.filter(
-                Q(owner=account) | Q(members=account),
-                id=board_id,
-            ).exists()
+            if IsBoardOwnerOrMemberHelper.has_board_permission(request, board_id):
+                return True
+            # Only hit the database to tell a missing board from a forbidden one.
+            IsBoardOwnerOrMemberHelper.check_board_exists(board_id)
+            return False
 
         # Non-create actions:
         # Let object-level permission decide
@@ -91,8 +89,7 @@ class CanAccessTask(BasePermission):
 
     def has_object_permission(self, request, view, task):
         """Object-level check: requester must be owner/member of task.board."""
-        account = request.user.account
-        return IsBoardOwnerOrMemberHelper.has_board_permission(task.board, account)
+        return IsBoardOwnerOrMemberHelper.has_board_permission(request, task.board_id)
 
 
 class CanAccessTaskComments(BasePermission):
@@ -110,19 +107,17 @@ class CanAccessTaskComments(BasePermission):
         if not task_id:
             return False
 
-        try:
-            task = Task.objects.select_related("board").get(id=task_id)
-        except Task.DoesNotExist:
+        board_id = get_task_board_id(request, task_id)
+        if board_id is None:
             raise NotFound("Task does not exist")
 
-        account = request.user.account
-        return IsBoardOwnerOrMemberHelper.has_board_permission(task.board, account)
+        return IsBoardOwnerOrMemberHelper.has_board_permission(request, board_id)
 
     def has_object_permission(self, request, view, comment):
         """Object-level check: permission is derived from the comment's task."""
         # Comment object → check permission on its task's board
-        task = comment.task
-        return CanAccessTask().has_object_permission(request, view, task)
+        board_id = get_task_board_id(request, comment.task_id)
+        return IsBoardOwnerOrMemberHelper.has_board_permission(request, board_id)
 
 
 class IsBoardOwner(BasePermission):
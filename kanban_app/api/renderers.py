@@ -0,0 +1,52 @@
+"""JSON renderer backed by orjson when it is installed.
+
+`FastJSONRenderer` produces the same bytes as DRF's `JSONRenderer`
+(compact separators, UTF-8 output, escaped U+2028/U+2029) but encodes
+with orjson, which is several times faster on large list payloads.
+orjson is optional: without it, and for anything orjson cannot encode
+natively, rendering falls back to the stdlib encoder.
+"""
+
+# Third party imports
+from rest_framework.renderers import JSONRenderer
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+
+class FastJSONRenderer(JSONRenderer):
+    """Drop-in `JSONRenderer` replacement using orjson for compact output.
+
+    Dates and times are passed through to DRF's encoder so they keep
+    DRF's formatting. Indented output (e.g. for the browsable API) and
+    non-default `UNICODE_JSON`/`COMPACT_JSON` settings always use the
+    stdlib encoder.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if not self._can_use_orjson(data, accepted_media_type, renderer_context):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            body = orjson.dumps(
+                data,
+                default=self.encoder_class().default,
+                option=orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME,
+            )
+        except TypeError:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        # Keep the output a strict JavaScript subset, as `JSONRenderer` does.
+        return body.replace(b"\xe2\x80\xa8", b"\\u2028").replace(
+            b"\xe2\x80\xa9", b"\\u2029"
+        )
+
+    def _can_use_orjson(self, data, accepted_media_type, renderer_context):
+        if orjson is None or data is None:
+            return False
+        if self.ensure_ascii or not self.compact:
+            return False
+        indent = self.get_indent(accepted_media_type, renderer_context or {})
+        return indent is None
@@ -0,0 +1,183 @@
+"""Cache of rendered board detail payloads.
+
+`BoardDetailSerializer` output is the most expensive response we
+serve and is read far more often than written. Rendered bytes are
+cached per `(board id, revision, variant)`, where the variant covers
+the format and any task filter parameters:
+
+- a bounded, process-local LRU tier answers repeated reads without any
+  I/O;
+- the shared Django cache (`KANMIND_BOARD_CACHE_ALIAS`) lets other
+  workers reuse a payload one of them rendered.
+
+Every write that changes a board payload bumps `Board.revision` (see
+`kanban_app.signals`), so entries of older revisions are never read
+again. Signal handlers additionally evict the board's local entries to
+free memory early; shared entries expire after `KANMIND_BOARD_CACHE_TTL`
+seconds. The cache is only consulted after the view's permission
+check, so access rules are enforced on every read.
+
+The counters are exported at `/metrics` as `kanmind_board_cache_*`.
+"""
+
+# Standard library imports
+import threading
+from collections import OrderedDict
+
+# Django imports
+from django.conf import settings
+from django.core.cache import caches
+
+# Local imports
+from core.metrics import collector, define
+
+
+class BoardPayloadCache:
+    """Two-tier (local LRU + shared backend) cache of rendered payloads."""
+
+    def __init__(self, max_entries, max_bytes, ttl, alias):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.alias = alias
+        self._local = OrderedDict()
+        self._local_bytes = 0
+        self._lock = threading.Lock()
+        self._counters = dict.fromkeys(
+            ["local_hits", "shared_hits", "misses", "stores", "evictions"], 0
+        )
+
+    @staticmethod
+    def _key(board_id, revision, variant):
+        return f"kanmind:board-payload:{board_id}:{revision}:{variant}"
+
+    def get(self, board_id, revision, variant="json"):
+        """Return cached bytes for this board version, or None."""
+        key = self._key(board_id, revision, variant)
+        body = self._get_local(key)
+        if body is None:
+            body = self._remember(key, caches[self.alias].get(key))
+        return body
+
+    async def aget(self, board_id, revision, variant="json"):
+        """Async counterpart of `get()` using the backend's async API."""
+        key = self._key(board_id, revision, variant)
+        body = self._get_local(key)
+        if body is None:
+            body = self._remember(key, await caches[self.alias].aget(key))
+        return body
+
+    def set(self, board_id, revision, body, variant="json"):
+        """Store rendered bytes in both tiers."""
+        key = self._key(board_id, revision, variant)
+        caches[self.alias].set(key, body, self.ttl)
+        self._stored(key, body)
+
+    async def aset(self, board_id, revision, body, variant="json"):
+        """Async counterpart of `set()`."""
+        key = self._key(board_id, revision, variant)
+        await caches[self.alias].aset(key, body, self.ttl)
+        self._stored(key, body)
+
+    def evict(self, board_id):
+        """Drop every local entry of `board_id`, whatever its revision."""
+        prefix = f"kanmind:board-payload:{board_id}:"
+        with self._lock:
+            for key in [key for key in self._local if key.startswith(prefix)]:
+                self._local_bytes -= len(self._local.pop(key))
+                self._counters["evictions"] += 1
+
+    def clear(self):
+        """Empty the local tier and reset counters (used by tests)."""
+        with self._lock:
+            self._local.clear()
+            self._local_bytes = 0
+            for name in self._counters:
+                self._counters[name] = 0
+
+    def stats(self):
+        """Return a snapshot of hit/miss counters and local tier usage."""
+        with self._lock:
+            return {
+                **self._counters,
+                "local_entries": len(self._local),
+                "local_bytes": self._local_bytes,
+            }
+
+    def _get_local(self, key):
+        with self._lock:
+            body = self._local.get(key)
+            if body is not None:
+                self._local.move_to_end(key)
+                self._counters["local_hits"] += 1
+            return body
+
+    def _remember(self, key, body):
+        """Count a shared-tier lookup and promote hits to the local tier."""
+        with self._lock:
+            if body is None:
+                self._counters["misses"] += 1
+            else:
+                self._counters["shared_hits"] += 1
+                self._store_local(key, body)
+        return body
+
+    def _stored(self, key, body):
+        with self._lock:
+            self._counters["stores"] += 1
+            self._store_local(key, body)
+
+    def _store_local(self, key, body):
+        """Insert into the LRU tier; caller must hold the lock."""
+        if len(body) > self.max_bytes:
+            return
+        previous = self._local.pop(key, None)
+        if previous is not None:
+            self._local_bytes -= len(previous)
+        self._local[key] = body
+        self._local_bytes += len(body)
+        while len(self._local) > self.max_entries or self._local_bytes > self.max_bytes:
+            _, dropped = self._local.popitem(last=False)
+            self._local_bytes -= len(dropped)
+            self._counters["evictions"] += 1
+
+
+def payload_variant(filters):
+    """Return the cache variant of a JSON board payload under `filters`."""
+    params = filters.cache_variant()
+    return f"json;{params}" if params else "json"
+
+
+board_payload_cache = BoardPayloadCache(
+    max_entries=getattr(settings, "KANMIND_BOARD_CACHE_LOCAL_ENTRIES", 128),
+    max_bytes=getattr(settings, "KANMIND_BOARD_CACHE_LOCAL_BYTES", 64 * 1024 * 1024),
+    ttl=getattr(settings, "KANMIND_BOARD_CACHE_TTL", 300),
+    alias=getattr(settings, "KANMIND_BOARD_CACHE_ALIAS", "default"),
+)
+
+define(
+    "kanmind_board_cache_lookups_total",
+    "counter",
+    "Board payload cache lookups by result (local_hit, shared_hit, miss).",
+)
+define("kanmind_board_cache_stores_total", "counter", "Board payloads cached.")
+define(
+    "kanmind_board_cache_evictions_total",
+    "counter",
+    "Board payloads dropped from the local tier.",
+)
+define("kanmind_board_cache_local_bytes", "gauge", "Bytes held in the local tier.")
+
+
+@collector
+def board_cache_samples():
+    stats = board_payload_cache.stats()
+    for result, count in (
+        ("local_hit", stats["local_hits"]),
+        ("shared_hit", stats["shared_hits"]),
+        ("miss", stats["misses"]),
+    ):
+        yield "kanmind_board_cache_lookups_total", (("result", result),), count
+    yield "kanmind_board_cache_stores_total", (), stats["stores"]
+    yield "kanmind_board_cache_evictions_total", (), stats["evictions"]
+    yield "kanmind_board_cache_local_bytes", (), stats["local_bytes"]
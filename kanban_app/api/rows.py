@@ -0,0 +1,94 @@
+"""Read-only fast path for the board and task list endpoints.
+
+List endpoints spend most of their CPU time instantiating
+`ModelSerializer` fields and converting every value field by field.
+For pure reads the payload is a fixed projection of a few columns, so
+these helpers fetch exactly those columns with `.values()` (people are
+JOINed in, not fetched per row) and assemble the same dictionaries the
+serializers would produce.
+
+Each `*_values()` function narrows a queryset to the needed columns;
+the matching `*_data()` function turns one page of rows into the
+payload of `BoardListSerializer` or `TaskSerializer`. Keep them in
+step with those serializers when fields change.
+"""
+
+
+def account_lookups(relation):
+    """Return the `.values()` lookups `account_data()` reads for `relation`."""
+    return (f"{relation}__id", f"{relation}__user__email", f"{relation}__fullname")
+
+
+def account_data(row, relation):
+    """Build the `AccountSerializer` payload of `relation`, or None."""
+    account_id = row[f"{relation}__id"]
+    if account_id is None:
+        return None
+    return {
+        "id": account_id,
+        "email": row[f"{relation}__user__email"],
+        "fullname": row[f"{relation}__fullname"],
+    }
+
+
+def iso_date(value):
+    return None if value is None else value.isoformat()
+
+
+BOARD_LIST_LOOKUPS = (
+    "id",
+    "title",
+    "member_count",
+    "ticket_count",
+    "tasks_to_do_count",
+    "tasks_high_prio_count",
+    "owner_id",
+)
+
+
+def board_list_values(queryset):
+    """Narrow a board queryset to the columns of the board list payload."""
+    return queryset.values(*BOARD_LIST_LOOKUPS)
+
+
+def board_list_data(rows):
+    """Return `BoardListSerializer(many=True).data` for `.values()` rows."""
+    return [{name: row[name] for name in BOARD_LIST_LOOKUPS} for row in rows]
+
+
+TASK_LIST_LOOKUPS = (
+    "id",
+    "board_id",
+    "title",
+    "description",
+    "status",
+    "priority",
+    "due_date",
+    "comments_count",
+    *account_lookups("assignee"),
+    *account_lookups("reviewer"),
+)
+
+
+def task_list_values(queryset):
+    """Narrow a task queryset to the columns of the task list payload."""
+    return queryset.values(*TASK_LIST_LOOKUPS)
+
+
+def task_list_data(rows):
+    """Return `TaskSerializer(many=True).data` for `.values()` rows."""
+    return [
+        {
+            "id": row["id"],
+            "board": row["board_id"],
+            "title": row["title"],
+            "description": row["description"],
+            "status": row["status"],
+            "priority": row["priority"],
+            "assignee": account_data(row, "assignee"),
+            "reviewer": account_data(row, "reviewer"),
+            "due_date": iso_date(row["due_date"]),
+            "comments_count": row["comments_count"],
+        }
+        for row in rows
+    ]
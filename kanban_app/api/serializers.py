@@ -6,44 +6,30 @@ from rest_framework import serializers
 # Local imports
 from auth_app.models import Account
 from kanban_app.models import Board, Comment, Task
+from kanban_app.positions import assign_positions
 
 
 class BoardListSerializer(serializers.ModelSerializer):
     """Serializer for listing boards with aggregate counts.
 
-    Exposes counts for members, tickets, tasks in "todo" status,
-    and high-priority tasks. Supports creation by assigning the
-    requesting user's account as the board owner and setting members.
+    Exposes counts for members, tickets, tasks in "to-do" status,
+    and high-priority tasks. The counts are read-only columns kept up
+    to date by `kanban_app.counters`, so listing boards costs a single
+    query. Supports creation by assigning the requesting user's
+    account as the board owner and setting members.
     """
 
-    member_count = serializers.SerializerMethodField()
-    ticket_count = serializers.SerializerMethodField()
-    tasks_to_do_count = serializers.SerializerMethodField()
-    tasks_high_prio_count = serializers.SerializerMethodField()
-
-    def get_member_count(self, obj):
-        """Return the number of members associated with the board."""
-        return obj.members.count()
-
-    def get_ticket_count(self, obj):
-        """Return the number of tasks associated with the board."""
-        return obj.tasks.count()
-
-    def get_tasks_to_do_count(self, obj):
-        """Return the count of tasks on the board with status "todo"."""
-        return obj.tasks.filter(status="todo").count()
-
-    def get_tasks_high_prio_count(self, obj):
-        """Return the count of tasks on the board with priority "high"."""
-        return obj.tasks.filter(priority="high").count()
-
     def create(self, validated_data):
-        """Create a board owned by the requesting user and set members."""
+        """Create a board owned by the requesting user and set members.
+
+        Returns the board reloaded so the response carries the member
+        count stored by the membership signals.
+        """
         owner = self.context["request"].user.account
         members = validated_data.pop("members", [])
         board = Board.objects.create(owner=owner, **validated_data)
         board.members.set(members)
-        return board
+        return Board.objects.get(pk=board.pk)
 
     class Meta:
         model = Board
@@ -74,12 +60,6 @@ class AccountSerializer(serializers.ModelSerializer):
 class BoardTaskSerializer(serializers.ModelSerializer):
     """Serializer for tasks within a board context, with comment count."""
 
-    comments_count = serializers.SerializerMethodField()
-
-    def get_comments_count(self, obj):
-        """Return the number of comments attached to the task."""
-        return obj.comments.count()
-
     class Meta:
         model = Task
         fields = [
@@ -92,19 +72,24 @@ class BoardTaskSerializer(serializers.ModelSerializer):
             "assignee",
             "reviewer",
             "due_date",
+            "position",
             "comments_count",
         ]
 
 
 class BoardDetailSerializer(serializers.ModelSerializer):
-    """Detailed board serializer with member and task nested data."""
+    """Detailed board serializer with member and task nested data.
+
+    `revision` is where a client starts following the board's change
+    feed (`GET /api/boards/<id>/changes/?since=<revision>`).
+    """
 
     members = AccountSerializer(many=True, read_only=True)
     tasks = BoardTaskSerializer(many=True, read_only=True)
 
     class Meta:
         model = Board
-        fields = ["id", "title", "owner_id", "members", "tasks"]
+        fields = ["id", "title", "owner_id", "revision", "members", "tasks"]
 
 
 class BoardUpdateSerializer(serializers.ModelSerializer):
@@ -126,14 +111,14 @@ class BoardUpdateSerializer(serializers.ModelSerializer):
 class TaskSerializer(serializers.ModelSerializer):
     """Serializer for creating and updating tasks with validations.
 
-    - Adds `comments_count` as a computed field.
+    - Exposes the stored `comments_count` as a read-only field.
     - Accepts `assignee_id` and `reviewer_id` for write operations while
       exposing nested `assignee` and `reviewer` as read-only.
     - Validates that assignee and reviewer belong to the task's board.
     - Prevents changing the board of an existing task on update.
+    - Moves a task whose status changes to the end of its new column.
     """
 
-    comments_count = serializers.SerializerMethodField()
     assignee_id = serializers.IntegerField(
         write_only=True, required=False, allow_null=True
     )
@@ -143,10 +128,6 @@ class TaskSerializer(serializers.ModelSerializer):
     assignee = AccountSerializer(read_only=True)
     reviewer = AccountSerializer(read_only=True)
 
-    def get_comments_count(self, obj):
-        """Return the number of comments attached to the task."""
-        return obj.comments.count()
-
     def validate(self, data):
         """Apply business rules for task updates and assignments.
 
@@ -190,6 +171,14 @@ class TaskSerializer(serializers.ModelSerializer):
             **validated_data, assignee=assignee, reviewer=reviewer, created_by=account
         )
 
+    def update(self, instance, validated_data):
+        """Update a task, moving it to the end of a column it changes to."""
+        status = validated_data.get("status", instance.status)
+        if status != instance.status:
+            instance.status = status
+            assign_positions([instance])
+        return super().update(instance, validated_data)
+
     class Meta:
         model = Task
         fields = [
@@ -212,6 +201,90 @@ class TaskSerializer(serializers.ModelSerializer):
         }
 
 
+class TaskBulkItemSerializer(serializers.ModelSerializer):
+    """One task of a bulk create or bulk update request.
+
+    Used with `many=True` so validation errors come back as a list
+    aligned with the submitted items. All lookups are read from data
+    the view preloads into the serializer context, so a batch of any
+    size is validated without per-item queries:
+
+    - `accessible_board_ids`: boards the requester owns or belongs to.
+    - `existing_board_ids`: referenced boards that exist.
+    - `board_members`: board id -> set of member account ids.
+    - `tasks`: task id -> `Task`; only present for bulk updates.
+    """
+
+    id = serializers.IntegerField(required=False)
+    board = serializers.IntegerField(source="board_id")
+    assignee_id = serializers.IntegerField(required=False, allow_null=True)
+    reviewer_id = serializers.IntegerField(required=False, allow_null=True)
+
+    def validate(self, data):
+        """Apply the same business rules as `TaskSerializer.validate`."""
+        tasks = self.context.get("tasks")
+        if tasks is not None:
+            task = tasks.get(data.get("id"))
+            if task is None:
+                raise serializers.ValidationError({"id": "Task does not exist"})
+            if "board_id" in data and data["board_id"] != task.board_id:
+                raise serializers.ValidationError(
+                    {"board": "Changing the board id is not allowed"}
+                )
+            board_id = task.board_id
+        else:
+            board_id = data["board_id"]
+
+        if board_id not in self.context["accessible_board_ids"]:
+            if board_id not in self.context["existing_board_ids"]:
+                raise serializers.ValidationError({"board": "Board does not exist"})
+            raise serializers.ValidationError(
+                {"board": "You are not a member of this board"}
+            )
+
+        members = self.context["board_members"].get(board_id, set())
+        assignee_id = data.get("assignee_id")
+        reviewer_id = data.get("reviewer_id")
+        if assignee_id and assignee_id not in members:
+            raise serializers.ValidationError("Assignee is not member of this board")
+        if reviewer_id and reviewer_id not in members:
+            raise serializers.ValidationError("Reviewer is not member of this board")
+
+        return data
+
+    class Meta:
+        model = Task
+        fields = [
+            "id",
+            "board",
+            "title",
+            "description",
+            "status",
+            "priority",
+            "assignee_id",
+            "reviewer_id",
+            "due_date",
+        ]
+
+
+class TaskMoveSerializer(serializers.Serializer):
+    """Target of a task move: a status column and a neighbouring task.
+
+    `after` is the task the moved one should follow, `before` the one
+    it should precede; with neither it goes to the end of the column.
+    `status` defaults to the task's current status.
+    """
+
+    status = serializers.ChoiceField(choices=Task.Status.choices, required=False)
+    after = serializers.IntegerField(required=False, allow_null=True)
+    before = serializers.IntegerField(required=False, allow_null=True)
+
+    def validate(self, data):
+        if data.get("after") is not None and data.get("before") is not None:
+            raise serializers.ValidationError("Give either after or before, not both.")
+        return data
+
+
 class CommentSerializer(serializers.ModelSerializer):
     """Serializer for comments. `author` is read-only and set server-side."""
 
@@ -228,3 +301,10 @@ class CommentSerializer(serializers.ModelSerializer):
             "created_at": {"read_only": True},
             "author": {"read_only": True},
         }
+
+
+class BoardChangeCommentSerializer(CommentSerializer):
+    """Comment payload of the board change feed, naming task and author id."""
+
+    class Meta(CommentSerializer.Meta):
+        fields = [*CommentSerializer.Meta.fields, "task", "author_id"]
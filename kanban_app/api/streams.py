@@ -0,0 +1,76 @@
+"""Server-Sent Events endpoint streaming realtime board changes.
+
+`GET /api/boards/<board_id>/events/` keeps the connection open and
+writes one SSE message per task, comment or membership change on the
+board. It requires an ASGI server; under WSGI the stream would block a
+worker thread for its whole lifetime.
+
+Clients authenticate with the usual `Authorization: Token <key>`
+header and must be the board owner or a member, the same rule as
+`IsBoardOwnerOrMember`. Access is re-checked whenever the board's
+membership changes, and the stream ends once the requester loses
+access.
+"""
+
+# Standard library imports
+import json
+
+# Django imports
+from django.conf import settings
+from django.http import StreamingHttpResponse
+from django.views.decorators.http import require_GET
+
+# Local imports
+from kanban_app.api.async_views import authenticate_request, authorize_board
+from kanban_app.membership import aload_accessible_board_ids
+from kanban_app.realtime import board_channel, get_broker
+
+HEARTBEAT_SECONDS = getattr(settings, "KANMIND_REALTIME_HEARTBEAT", 15)
+
+
+def format_event(message):
+    """Encode a broker message as an SSE frame."""
+    data = json.dumps(message, separators=(",", ":"))
+    return f"event: {message['type']}\ndata: {data}\n\n"
+
+
+@require_GET
+async def board_events(request, board_id):
+    """Stream realtime events for one board as `text/event-stream`."""
+    error = await authenticate_request(request)
+    if error is None:
+        error = await authorize_board(request, board_id)
+    if error is not None:
+        return error
+
+    account_id = request.user.account.id
+
+    async def stream():
+        subscription = get_broker().subscribe(board_channel(board_id))
+        try:
+            yield "retry: 3000\n\n"
+            yield format_event({"type": "ready", "board": board_id, "data": {}})
+            while True:
+                message = await subscription.get(timeout=HEARTBEAT_SECONDS)
+                if message is None:
+                    yield ": keep-alive\n\n"
+                    continue
+
+                if message["type"] == "board.deleted":
+                    yield format_event(message)
+                    return
+                if message["type"].startswith("members."):
+                    board_ids = await aload_accessible_board_ids(account_id)
+                    if board_id not in board_ids:
+                        yield format_event(
+                            {"type": "access.revoked", "board": board_id, "data": {}}
+                        )
+                        return
+                yield format_event(message)
+        finally:
+            subscription.close()
+
+    response = StreamingHttpResponse(stream(), content_type="text/event-stream")
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"
+    return response
@@ -13,7 +13,10 @@ from rest_framework.routers import DefaultRouter
 from django.urls import include, path
 
 # Local imports
+from kanban_app.api import async_views
+from kanban_app.api.streams import board_events
 from kanban_app.api.views import (
+    BoardCacheStatsView,
     BoardViewSet,
     EmailCheckView,
     TaskCommentListCreateView,
@@ -30,6 +33,33 @@ router.register(r"tasks", TasksCreateRetrieveUpdateDestroyViewSet, basename="tas
 
 urlpatterns = [
     path("email-check/", EmailCheckView.as_view(), name="email_check"),
+    path("boards/<int:board_id>/events/", board_events, name="board_events"),
+    path("async/boards/", async_views.board_list, name="async_board_list"),
+    path(
+        "async/boards/<int:board_id>/",
+        async_views.board_detail,
+        name="async_board_detail",
+    ),
+    path(
+        "async/tasks/assigned-to-me/",
+        async_views.tasks_assigned,
+        name="async_tasks_assigned",
+    ),
+    path(
+        "async/tasks/reviewing/",
+        async_views.tasks_reviewing,
+        name="async_tasks_reviewing",
+    ),
+    path(
+        "async/tasks/<int:task_id>/comments/",
+        async_views.task_comments,
+        name="async_task_comments",
+    ),
+    path(
+        "cache-stats/boards/",
+        BoardCacheStatsView.as_view(),
+        name="board_cache_stats",
+    ),
     path(
         "tasks/assigned-to-me/", TasksAssignedListView.as_view(), name="tasks_assigned"
     ),
@@ -1,15 +1,36 @@
 """Views for the Kanban application API endpoints."""
 
 # Third party imports
-from rest_framework import viewsets, mixins, generics
+from asgiref.sync import sync_to_async
+from rest_framework import viewsets, mixins, generics, status
+from rest_framework.decorators import action
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.exceptions import ValidationError
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.permissions import IsAdminUser, IsAuthenticated
 
 # Local imports
 from auth_app.models import Account
+from kanban_app.api.response_cache import board_payload_cache, payload_variant
+from kanban_app.api.rows import (
+    board_list_data,
+    board_list_values,
+    task_list_data,
+    task_list_values,
+)
 from kanban_app.api.serializers import AccountSerializer, CommentSerializer
+from kanban_app.api.conditional import (
+    board_validators,
+    not_modified,
+    set_validators,
+)
+from kanban_app.api.filters import CommentSince, TaskFilters
+from kanban_app.api.pagination import (
+    BoardPagination,
+    CommentPagination,
+    SearchPagination,
+    TaskPagination,
+)
 from kanban_app.api.permissions import (
     CanAccessTask,
     CanAccessTaskComments,
@@ -20,15 +41,35 @@ from kanban_app.api.permissions import (
     IsCommentOwner,
 )
 from kanban_app.api.serializers import (
+    BoardChangeCommentSerializer,
     BoardDetailSerializer,
     BoardListSerializer,
+    BoardTaskSerializer,
     BoardUpdateSerializer,
+    TaskBulkItemSerializer,
+    TaskMoveSerializer,
     TaskSerializer,
 )
-from kanban_app.models import Board, Comment, Task
+from kanban_app.changes import changed_objects, record_task_changes
+from kanban_app.counters import record_tasks_saved
+from kanban_app.deletion import delete_board
+from kanban_app.membership import get_accessible_board_ids
+from kanban_app.models import Board, BoardChange, Comment, Task
+from kanban_app.positions import assign_positions, move_position, schedule_rebalance
+from kanban_app.realtime import publish_board_event, task_event_data
+from kanban_app.search import BoardSearchResults, index_tasks, parse_terms
+from kanban_app.transfer import (
+    MAX_LINE_BYTES,
+    BoardImportError,
+    BoardImporter,
+    export_board,
+)
 
 # Django imports
-from django.db.models import Q
+from django.core.handlers.asgi import ASGIRequest
+from django.db import transaction
+from django.db.models import prefetch_related_objects
+from django.http import HttpResponse, StreamingHttpResponse
 from django.shortcuts import get_object_or_404
 
 
@@ -37,24 +78,92 @@ Obj permissions will only apply to retrieve,update or delete. For lists we use g
 """
 
 
-class BoardViewSet(viewsets.ModelViewSet):
+def streaming_response(request, chunks, content_type):
+    """Stream `chunks` without buffering them, under WSGI and ASGI alike.
+
+    Django reads a synchronous iterator to the end before serving it
+    over ASGI, so there the chunks are pulled one by one through
+    `sync_to_async` instead.
+    """
+    if isinstance(getattr(request, "_request", request), ASGIRequest):
+        chunks = iterate_in_thread(chunks)
+    return StreamingHttpResponse(chunks, content_type=content_type)
+
+
+async def iterate_in_thread(chunks):
+    chunks = iter(chunks)
+    done = object()
+    while (chunk := await sync_to_async(next)(chunks, done)) is not done:
+        yield chunk
+
+
+class ValuesListMixin:
+    """Serve `list` from `.values()` rows instead of model serializers.
+
+    `list_values` narrows the view's queryset and `list_data` builds
+    the payload from one page of rows (see `kanban_app.api.rows`).
+    The response is identical to the serializer-based one.
+    """
+
+    list_values = None
+    list_data = None
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.list_values(self.filter_queryset(self.get_queryset()))
+        page = self.paginate_queryset(queryset)
+        if page is None:
+            return Response(self.list_data(queryset))
+        return self.get_paginated_response(self.list_data(page))
+
+
+class TaskFilterMixin:
+    """Apply the `TaskFilters` query parameters to a task list view."""
+
+    _task_filters = None
+
+    def get_task_filters(self):
+        if self._task_filters is None:
+            self._task_filters = TaskFilters(self.request.query_params)
+        return self._task_filters
+
+    def filter_queryset(self, queryset):
+        return self.get_task_filters().filter(super().filter_queryset(queryset))
+
+    def get_keyset_ordering(self):
+        """Let `TaskPagination` follow the `ordering` parameter."""
+        return self.get_task_filters().ordering
+
+
+class BoardViewSet(ValuesListMixin, viewsets.ModelViewSet):
     """Manage boards the user owns or is a member of.
 
     - `list`: Returns boards where the requester is owner or member.
     - `create`: Allows authenticated users; ownership set in serializer.
     - `partial_update`: Update title/members via `BoardUpdateSerializer`.
     - `retrieve`: Returns full board details including members and tasks.
-    - `destroy`: Restricted to board owner.
+    - `destroy`: Restricted to board owner. The board is hidden at once
+      and purged in the background (see `kanban_app.deletion`).
+    - `deletions`: The requester's boards still being purged.
+    - `search`: Full-text search over the board's tasks and comments.
+    - `changes`: Delta of the board since a revision, for resyncing clients.
+    - `export`/`import_board`: Stream a board out as NDJSON and load
+      such an export as a new board (see `kanban_app.transfer`).
+
+    The list is keyset-paginated by id (see `BoardPagination`).
     """
 
+    pagination_class = BoardPagination
+    list_values = staticmethod(board_list_values)
+    list_data = staticmethod(board_list_data)
+
     def get_permissions(self):
         """Return permissions based on action.
 
-        - `create`: `IsAuthenticated`
+        - `create`, `import_board`: `IsAuthenticated`
         - `destroy`: `IsAuthenticated` and `IsBoardOwner`
         - others: `IsAuthenticated` and `IsBoardOwnerOrMember`
         """
-        if self.action == "create":
+        if self.action in ["create", "import_board"]:
             return [IsAuthenticated()]
         if self.action == "destroy":
             return [IsAuthenticated(), IsBoardOwner()]
@@ -64,12 +173,205 @@ class BoardViewSet(viewsets.ModelViewSet):
         if self.action == "list":
             """Scope boards to those owned by or shared with the requester."""
             account = self.request.user.account
-            return Board.objects.filter(
-                Q(owner=account) | Q(members=account)
-            ).distinct()
+            return Board.objects.accessible_to(account)
 
         return Board.objects.all()
 
+    def perform_destroy(self, instance):
+        delete_board(instance)
+
+    @action(detail=False, methods=["get"], url_path="deletions")
+    def deletions(self, request):
+        """List the requester's deleted boards whose purge is not done yet.
+
+        `tasks_remaining` counts down as the purge proceeds.
+        """
+        boards = Board.all_objects.filter(
+            owner=request.user.account, deleted_at__isnull=False
+        ).order_by("deleted_at", "pk")
+        return Response(
+            [
+                {
+                    "id": board["pk"],
+                    "title": board["title"],
+                    "deleted_at": board["deleted_at"],
+                    "tasks_remaining": board["ticket_count"],
+                }
+                for board in boards.values("pk", "title", "deleted_at", "ticket_count")
+            ]
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        """Return the board detail, or 304 if the client's copy is current.
+
+        The board row alone is enough for the permission and version
+        checks. JSON payloads are served from `board_payload_cache`
+        when this revision was rendered before; members and tasks are
+        only prefetched on a cache miss.
+
+        `TaskFilters` query parameters narrow and order the embedded
+        tasks; each distinct combination is cached separately.
+        """
+        board = self.get_object()
+        filters = TaskFilters(request.query_params)
+        prefetches = Board.objects.detail_prefetches(
+            tasks=filters.filter_and_sort(Task.objects.all())
+        )
+        etag, last_modified = board_validators(
+            request, "board", board.pk, board.revision, board.updated_at
+        )
+        response = not_modified(request, etag, last_modified)
+        if response is not None:
+            return response
+
+        renderer = request.accepted_renderer
+        if renderer.format != "json":
+            prefetch_related_objects([board], *prefetches)
+            serializer = self.get_serializer(board)
+            return set_validators(Response(serializer.data), etag, last_modified)
+
+        variant = payload_variant(filters)
+        body = board_payload_cache.get(board.pk, board.revision, variant)
+        cache_status = "HIT"
+        if body is None:
+            cache_status = "MISS"
+            prefetch_related_objects([board], *prefetches)
+            serializer = self.get_serializer(board)
+            body = renderer.render(
+                serializer.data,
+                request.accepted_media_type,
+                self.get_renderer_context(),
+            )
+            board_payload_cache.set(board.pk, board.revision, body, variant)
+
+        response = HttpResponse(body, content_type=request.accepted_media_type)
+        response["X-Cache"] = cache_status
+        return set_validators(response, etag, last_modified)
+
+    @action(detail=True, methods=["get"], url_path="search")
+    def search(self, request, pk=None):
+        """Return the board's tasks matching `q`, best matches first.
+
+        A task matches if its title and description, or one of its
+        comments, contain every word of `q`. Results use the task list
+        payload and are paginated by page number.
+        """
+        board = self.get_object()
+        terms = parse_terms(request.query_params.get("q", ""))
+        if not terms:
+            raise ValidationError({"q": ["Enter at least one word to search for."]})
+
+        paginator = SearchPagination()
+        task_ids = paginator.paginate_queryset(
+            BoardSearchResults(board.pk, terms), request, view=self
+        )
+        rows = task_list_values(Task.objects.filter(pk__in=task_ids))
+        rows_by_id = {row["id"]: row for row in rows}
+        data = task_list_data(rows_by_id[pk] for pk in task_ids if pk in rows_by_id)
+        return paginator.get_paginated_response(data)
+
+    @action(detail=True, methods=["get"], url_path="changes")
+    def changes(self, request, pk=None):
+        """Return what changed on the board after revision `since`.
+
+        Changed tasks, comments and members come with their current
+        payload, deleted ones as ids in the `deleted_*`/`removed_*`
+        lists (see `kanban_app.changes`). `authors` names the renamed
+        authors of comments on the board. When the change log no longer
+        covers `since`, the response only says `"resync": true` and the
+        client reloads the board.
+        """
+        board = self.get_object()
+        since = request.query_params.get("since", "")
+        if not since.isdigit():
+            raise ValidationError({"since": ["Enter a board revision number."]})
+
+        delta = changed_objects(board.pk, int(since))
+        if delta is None:
+            return Response({"revision": board.revision, "resync": True})
+        revision, objects = delta
+        data = self._changes_data(board, objects)
+        return Response({"revision": revision, "resync": False, **data})
+
+    @staticmethod
+    def _changes_data(board, objects):
+        """Split changed objects into current payloads and tombstones."""
+
+        def current(queryset, ids):
+            if not ids:
+                return [], []
+            found = list(queryset.filter(pk__in=ids))
+            return found, sorted(ids - {obj.pk for obj in found})
+
+        members, removed_members = current(
+            Account.objects.filter(boards_member_of=board)
+            .select_related("user")
+            .order_by("pk"),
+            objects[BoardChange.Kind.MEMBER],
+        )
+        tasks, deleted_tasks = current(
+            Task.objects.filter(board=board).order_by("pk"),
+            objects[BoardChange.Kind.TASK],
+        )
+        comments, deleted_comments = current(
+            Comment.objects.filter(task__board=board)
+            .select_related("author")
+            .order_by("created_at", "pk"),
+            objects[BoardChange.Kind.COMMENT],
+        )
+        authors, _ = current(
+            Account.objects.order_by("pk"), objects[BoardChange.Kind.AUTHOR]
+        )
+        changed_board = None
+        if objects[BoardChange.Kind.BOARD]:
+            changed_board = {
+                "id": board.pk,
+                "title": board.title,
+                "owner_id": board.owner_id,
+            }
+        return {
+            "board": changed_board,
+            "members": AccountSerializer(members, many=True).data,
+            "removed_members": removed_members,
+            "tasks": BoardTaskSerializer(tasks, many=True).data,
+            "deleted_tasks": deleted_tasks,
+            "comments": BoardChangeCommentSerializer(comments, many=True).data,
+            "deleted_comments": deleted_comments,
+            "authors": [
+                {"id": author.pk, "fullname": author.fullname} for author in authors
+            ],
+        }
+
+    @action(detail=True, methods=["get"], url_path="export")
+    def export(self, request, pk=None):
+        """Stream the board, members, tasks and comments as NDJSON."""
+        board = self.get_object()
+        response = streaming_response(
+            request, export_board(board), "application/x-ndjson"
+        )
+        response["Content-Disposition"] = (
+            f'attachment; filename="board-{board.pk}.ndjson"'
+        )
+        return response
+
+    @action(detail=False, methods=["post"], url_path="import")
+    def import_board(self, request):
+        """Create a board from an NDJSON export sent as the request body.
+
+        The body is read line by line and written in batches inside one
+        transaction; any invalid line rolls the whole import back.
+        """
+        stream = request.stream
+        lines = []
+        if stream is not None:
+            lines = iter(lambda: stream.readline(MAX_LINE_BYTES + 1), b"")
+        try:
+            with transaction.atomic():
+                summary = BoardImporter(request.user.account).run(lines)
+        except BoardImportError as exc:
+            raise ValidationError({"non_field_errors": [str(exc)]})
+        return Response(summary, status=status.HTTP_201_CREATED)
+
     def get_serializer_class(self):
         """Select serializer by action for tailored payloads."""
         if self.action in ["list", "create"]:
@@ -79,24 +381,40 @@ class BoardViewSet(viewsets.ModelViewSet):
         return BoardDetailSerializer
 
 
-class TasksAssignedListView(generics.ListAPIView):
-    """List tasks where the requester is the `assignee`."""
+class TasksAssignedListView(TaskFilterMixin, ValuesListMixin, generics.ListAPIView):
+    """List tasks where the requester is the `assignee`.
+
+    Keyset-paginated on `(due_date, id)` unless another `ordering` is
+    requested; see `TaskFilters` for the filter parameters.
+    """
+
+    pagination_class = TaskPagination
+    list_values = staticmethod(task_list_values)
+    list_data = staticmethod(task_list_data)
 
     def get_queryset(self):
         """Return tasks assigned to the current account."""
         account = self.request.user.account
-        return Task.objects.filter(assignee=account)
+        return Task.objects.assigned_to(account)
 
     serializer_class = TaskSerializer
 
 
-class TasksReviewingListView(generics.ListAPIView):
-    """List tasks where the requester is the `reviewer`."""
+class TasksReviewingListView(TaskFilterMixin, ValuesListMixin, generics.ListAPIView):
+    """List tasks where the requester is the `reviewer`.
+
+    Keyset-paginated on `(due_date, id)` unless another `ordering` is
+    requested; see `TaskFilters` for the filter parameters.
+    """
+
+    pagination_class = TaskPagination
+    list_values = staticmethod(task_list_values)
+    list_data = staticmethod(task_list_data)
 
     def get_queryset(self):
         """Return tasks being reviewed by the current account."""
         account = self.request.user.account
-        return Task.objects.filter(reviewer=account)
+        return Task.objects.reviewed_by(account)
 
     serializer_class = TaskSerializer
 
@@ -114,9 +432,23 @@ class TasksCreateRetrieveUpdateDestroyViewSet(
       access to the task's board (`CanAccessTask`).
     - `destroy`: Restricted to task creator or board owner
       (`IsTaskOrBoardOwner`).
+    - `bulk`: `POST`/`PATCH /api/tasks/bulk/` create or update a list of
+      tasks in one transaction; board access is checked per item.
+    - `move`: `POST /api/tasks/{id}/move/` changes status and column
+      position with a single-row update.
     """
 
-    queryset = Task.objects.all()
+    queryset = Task.objects.on_live_boards()
+    bulk_max_items = 500
+    bulk_update_fields = {
+        "title": "title",
+        "description": "description",
+        "status": "status",
+        "priority": "priority",
+        "due_date": "due_date",
+        "assignee_id": "assignee",
+        "reviewer_id": "reviewer",
+    }
 
     def get_permissions(self):
         """Return permissions depending on action."""
@@ -124,11 +456,204 @@ class TasksCreateRetrieveUpdateDestroyViewSet(
             return [IsAuthenticated(), CanCreateTask()]
         if self.action == "destroy":
             return [IsAuthenticated(), IsTaskOrBoardOwner()]
+        if self.action == "bulk":
+            # Board access is validated per item by `TaskBulkItemSerializer`.
+            return [IsAuthenticated()]
 
         return [IsAuthenticated(), CanAccessTask()]
 
     serializer_class = TaskSerializer
 
+    def retrieve(self, request, *args, **kwargs):
+        """Return a task, or 304 if its board has not changed since."""
+        task = self.get_object()
+        etag, last_modified = board_validators(
+            request, "task", task.pk, task.board.revision, task.board.updated_at
+        )
+        response = not_modified(request, etag, last_modified)
+        if response is not None:
+            return response
+
+        serializer = self.get_serializer(task)
+        return set_validators(Response(serializer.data), etag, last_modified)
+
+    def get_queryset(self):
+        """Load the owning board with the task for version checks."""
+        if self.action == "retrieve":
+            return self.queryset.select_related("board")
+        return super().get_queryset()
+
+    @action(detail=False, methods=["post", "patch"], url_path="bulk")
+    def bulk(self, request):
+        """Create (`POST`) or update (`PATCH`) a batch of tasks.
+
+        The body is a JSON list of task objects; updates must include
+        each task's `id`. The whole batch is validated against
+        membership data loaded up front and written with a single
+        `bulk_create`/`bulk_update` inside one transaction. If any item
+        is invalid nothing is written and the response lists the
+        errors per item, in request order.
+        """
+        items = request.data
+        if not isinstance(items, list):
+            raise ValidationError({"non_field_errors": ["Expected a list of tasks."]})
+        if len(items) > self.bulk_max_items:
+            raise ValidationError(
+                {
+                    "non_field_errors": [
+                        f"A batch may contain at most {self.bulk_max_items} tasks."
+                    ]
+                }
+            )
+
+        if request.method == "POST":
+            return self.bulk_create(request, items)
+        return self.bulk_update(request, items)
+
+    def bulk_create(self, request, items):
+        """Validate and insert new tasks created by the requester."""
+        board_ids = {self._item_int(item, "board") for item in items}
+        serializer = TaskBulkItemSerializer(
+            data=items, many=True, context=self._bulk_context(request, board_ids)
+        )
+        serializer.is_valid(raise_exception=True)
+
+        account = request.user.account
+        tasks = []
+        for data in serializer.validated_data:
+            data.pop("id", None)
+            tasks.append(Task(**data, created_by=account))
+
+        with transaction.atomic():
+            assign_positions(tasks)
+            Task.objects.bulk_create(tasks)
+            # bulk_create sends no post_save signals.
+            record_tasks_saved(tasks, created=True)
+            index_tasks(tasks, created=True)
+            record_task_changes(tasks)
+            for task in tasks:
+                publish_board_event(task.board_id, "task.saved", task_event_data(task))
+
+        return self._bulk_response([task.pk for task in tasks], status.HTTP_201_CREATED)
+
+    def bulk_update(self, request, items):
+        """Validate and apply partial updates, e.g. status moves.
+
+        Tasks whose status changes are appended to their new column.
+        """
+        task_ids = {self._item_int(item, "id") for item in items}
+        tasks = Task.objects.in_bulk([pk for pk in task_ids if pk is not None])
+        board_ids = {task.board_id for task in tasks.values()}
+
+        context = self._bulk_context(request, board_ids)
+        context["tasks"] = tasks
+        serializer = TaskBulkItemSerializer(
+            data=items, many=True, partial=True, context=context
+        )
+        serializer.is_valid(raise_exception=True)
+
+        changed_fields = set()
+        updated = {}
+        moved = {}
+        for data in serializer.validated_data:
+            task = tasks[data["id"]]
+            if data.get("status", task.status) != task.status:
+                moved[task.pk] = task
+            for key, field in self.bulk_update_fields.items():
+                if key in data:
+                    setattr(task, key, data[key])
+                    changed_fields.add(field)
+            updated[task.pk] = task
+
+        if changed_fields:
+            with transaction.atomic():
+                if moved:
+                    # Tasks changing status go to the end of their new column.
+                    assign_positions(list(moved.values()))
+                    changed_fields.add("position")
+                Task.objects.bulk_update(updated.values(), sorted(changed_fields))
+                # bulk_update sends no post_save signals.
+                record_tasks_saved(updated.values())
+                if changed_fields & {"title", "description"}:
+                    index_tasks(list(updated.values()))
+                record_task_changes(updated.values())
+                for task in updated.values():
+                    publish_board_event(
+                        task.board_id, "task.saved", task_event_data(task)
+                    )
+
+        return self._bulk_response(list(updated), status.HTTP_200_OK)
+
+    @action(detail=True, methods=["post"], url_path="move")
+    def move(self, request, pk=None):
+        """Move a task within or between status columns.
+
+        The new position is generated between the neighbours given by
+        `after`/`before` (see `kanban_app.positions`), so only the moved
+        task's row is updated. Returns the task in its board payload
+        form, including the new `position`.
+        """
+        task = self.get_object()
+        serializer = TaskMoveSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+        status_value = data.get("status", task.status)
+
+        with transaction.atomic():
+            try:
+                position = move_position(
+                    task, status_value, data.get("after"), data.get("before")
+                )
+            except Task.DoesNotExist:
+                field = "after" if data.get("after") is not None else "before"
+                raise ValidationError({field: ["Task is not in the target column."]})
+            Task.objects.filter(pk=task.pk).update(
+                status=status_value, position=position
+            )
+            task.status = status_value
+            task.position = position
+            # A queryset update sends no post_save signals.
+            record_tasks_saved([task])
+            record_task_changes([task])
+            publish_board_event(task.board_id, "task.saved", task_event_data(task))
+            schedule_rebalance(task.board_id, status_value, position)
+
+        return Response(BoardTaskSerializer(task).data)
+
+    def _bulk_context(self, request, board_ids):
+        """Preload everything `TaskBulkItemSerializer` validates against."""
+        board_ids = {board_id for board_id in board_ids if board_id is not None}
+        board_members = {}
+        for board_id, account_id in Board.members.through.objects.filter(
+            board_id__in=board_ids
+        ).values_list("board_id", "account_id"):
+            board_members.setdefault(board_id, set()).add(account_id)
+
+        return {
+            **self.get_serializer_context(),
+            "accessible_board_ids": get_accessible_board_ids(request),
+            "existing_board_ids": set(
+                Board.objects.filter(id__in=board_ids).values_list("id", flat=True)
+            ),
+            "board_members": board_members,
+        }
+
+    def _bulk_response(self, task_ids, status_code):
+        """Serialize the written tasks in request order with constant queries."""
+        tasks = Task.objects.select_related("assignee__user", "reviewer__user").in_bulk(
+            task_ids
+        )
+        ordered = [tasks[pk] for pk in task_ids]
+        return Response(TaskSerializer(ordered, many=True).data, status=status_code)
+
+    @staticmethod
+    def _item_int(item, key):
+        """Best-effort integer lookup used only to decide what to preload."""
+        try:
+            return int(item[key])
+        except (KeyError, TypeError, ValueError):
+            return None
+
 
 class EmailCheckView(APIView):
     """Resolve an account by email and return basic account data.
@@ -152,16 +677,40 @@ class TaskCommentListCreateView(generics.ListCreateAPIView):
     """List and create comments for a given task.
 
     Requires `task_id` in the URL. Creation sets `author` to the
-    requesting user's account.
+    requesting user's account. The list is keyset-paginated on
+    `(created_at, id)`, joins the authors in, and accepts `since` to
+    return only newer comments (see `CommentSince`).
     """
 
     serializer_class = CommentSerializer
+    pagination_class = CommentPagination
 
     permission_classes = [IsAuthenticated & CanAccessTaskComments]
 
     def get_queryset(self):
-        """Return comments associated with the task specified by `task_id`."""
-        return Comment.objects.filter(task_id=self.kwargs["task_id"])
+        """Return the task's comments, after `since` when it is given."""
+        queryset = Comment.objects.filter(
+            task_id=self.kwargs["task_id"]
+        ).select_related("author")
+        return CommentSince(self.request.query_params).filter(queryset)
+
+    def list(self, request, *args, **kwargs):
+        """List comments, or answer 304 if the task's board is unchanged."""
+        task_id = self.kwargs["task_id"]
+        version = (
+            Board.objects.filter(tasks=task_id)
+            .values_list("revision", "updated_at")
+            .first()
+        )
+        if version is None:
+            return super().list(request, *args, **kwargs)
+
+        etag, last_modified = board_validators(request, "comments", task_id, *version)
+        response = not_modified(request, etag, last_modified)
+        if response is not None:
+            return response
+        response = super().list(request, *args, **kwargs)
+        return set_validators(response, etag, last_modified)
 
     def perform_create(self, serializer):
         """Persist a new comment, binding it to the task and author."""
@@ -176,7 +725,19 @@ class TaskCommentDestroyView(generics.DestroyAPIView):
     permission_classes = [IsAuthenticated & IsCommentOwner]
 
     def get_queryset(self):
-        """Return comments for the task specified by `task_id`."""
-        return Comment.objects.filter(task_id=self.kwargs["task_id"])
+        """Return comments for the task `task_id` on a board not deleted."""
+        return Comment.objects.filter(
+            task_id=self.kwargs["task_id"], task__board__deleted_at__isnull=True
+        )
 
     serializer_class = CommentSerializer
+
+
+class BoardCacheStatsView(APIView):
+    """Expose this worker's board payload cache counters to staff users."""
+
+    permission_classes = [IsAdminUser]
+    pagination_class = None
+
+    def get(self, request):
+        return Response(board_payload_cache.stats())
@@ -0,0 +1,145 @@
+"""Per-board change log behind the delta sync endpoint.
+
+Every change to something shown in a board payload (the board itself,
+its members, tasks and comments) bumps `Board.revision` and stores the
+new revision on the object's `BoardChange` row, in one transaction.
+The UPDATE of the board row serializes writers per board, so changes
+become visible in revision order: a reader that sees revision N has
+seen every change up to N.
+
+`changed_objects()` lists what changed on a board after a revision;
+the API turns that into the current payload of every changed object
+that still exists and a tombstone for every one that does not.
+A comment change also logs its task, whose payload carries the comment
+count. Comments of a deleted task are not logged one by one; the
+task's tombstone covers them.
+
+`compact_changes()` (run by `manage.py compact_board_changes`) deletes
+rows older than `KANMIND_CHANGE_RETENTION_DAYS` and raises the board's
+`changes_floor` to the highest revision it dropped. A client whose
+revision is below the floor has missed changes and must reload the
+board.
+"""
+
+# Standard library imports
+import datetime
+from collections import defaultdict
+
+# Django imports
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Max, OuterRef, Subquery
+from django.db.models.functions import Coalesce, Greatest
+from django.utils import timezone
+
+# Local imports
+from kanban_app.models import Board, BoardChange
+
+RETENTION_DAYS = getattr(settings, "KANMIND_CHANGE_RETENTION_DAYS", 30)
+# Beyond this many changed objects a full reload is cheaper than a delta.
+MAX_DELTA_OBJECTS = 5000
+
+
+def record_changes(board_id, changes):
+    """Bump the board's revision and log `(kind, object_id)` pairs at it.
+
+    Returns the new revision, or None if the board does not exist.
+    """
+    with transaction.atomic():
+        boards = Board.objects.filter(pk=board_id)
+        if not boards.touch():
+            return None
+        revision = boards.values_list("revision", flat=True).get()
+        changed_at = timezone.now()
+        BoardChange.objects.bulk_create(
+            [
+                BoardChange(
+                    board_id=board_id,
+                    kind=kind,
+                    object_id=object_id,
+                    revision=revision,
+                    changed_at=changed_at,
+                )
+                for kind, object_id in changes
+            ],
+            update_conflicts=True,
+            unique_fields=["board", "kind", "object_id"],
+            update_fields=["revision", "changed_at"],
+        )
+    return revision
+
+
+def record_task_changes(tasks):
+    """Log saved or deleted `tasks`, one revision per board."""
+    changes = defaultdict(set)
+    for task in tasks:
+        changes[task.board_id].add((BoardChange.Kind.TASK, task.pk))
+    for board_id, board_changes in changes.items():
+        record_changes(board_id, board_changes)
+
+
+def changed_objects(board_id, since):
+    """Return `(revision, {kind: object ids})` changed after `since`.
+
+    `revision` is the latest change included (`since` if there is
+    none). Returns None when the changes since then are no longer
+    complete in the log, or too many to be worth a delta.
+    """
+    rows = list(
+        BoardChange.objects.filter(board_id=board_id, revision__gt=since)
+        .order_by("revision")
+        .values_list("revision", "kind", "object_id")[: MAX_DELTA_OBJECTS + 1]
+    )
+    # Read the floor after the rows: compaction raises it in the same
+    # transaction that deletes rows, so rows missing here show up there.
+    floor = (
+        Board.objects.filter(pk=board_id)
+        .values_list("changes_floor", flat=True)
+        .first()
+    )
+    if floor is None or since < floor or len(rows) > MAX_DELTA_OBJECTS:
+        return None
+
+    objects = defaultdict(set)
+    for _, kind, object_id in rows:
+        objects[kind].add(object_id)
+    revision = rows[-1][0] if rows else since
+    return revision, objects
+
+
+def compact_changes(retention_days=None, batch_size=1000):
+    """Drop change rows past the retention window; return how many.
+
+    Boards are processed in batches, each in its own transaction, so
+    this can run against a live database.
+    """
+    if retention_days is None:
+        retention_days = RETENTION_DAYS
+    cutoff = timezone.now() - datetime.timedelta(days=retention_days)
+    expired = BoardChange.objects.filter(changed_at__lt=cutoff)
+    dropped = 0
+    last_board_id = 0
+    while True:
+        board_ids = list(
+            expired.filter(board_id__gt=last_board_id)
+            .order_by("board_id")
+            .values_list("board_id", flat=True)
+            .distinct()[:batch_size]
+        )
+        if not board_ids:
+            return dropped
+        with transaction.atomic():
+            latest = (
+                expired.filter(board=OuterRef("pk"))
+                .order_by()
+                .values("board")
+                .annotate(latest=Max("revision"))
+                .values("latest")
+            )
+            Board.objects.filter(pk__in=board_ids).update(
+                changes_floor=Greatest(
+                    F("changes_floor"), Coalesce(Subquery(latest), F("changes_floor"))
+                )
+            )
+            dropped += expired.filter(board_id__in=board_ids).delete()[0]
+        last_board_id = board_ids[-1]
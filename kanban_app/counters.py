@@ -0,0 +1,66 @@
+"""Bookkeeping for the denormalized counters on boards and tasks.
+
+Board cards show member, ticket, to-do and high-priority counts and
+task cards show their number of comments. Instead of counting rows on
+every read, these counts live in columns on `Board` and `Task` and are
+adjusted with `F()` updates inside the transaction that changes the
+underlying rows. Signal handlers in `kanban_app.signals` cover single
+saves and deletes; the bulk task endpoints call `record_tasks_saved()`
+themselves because `bulk_create`/`bulk_update` send no signals.
+
+Task status and priority changes are derived from the state recorded
+by `Task.from_db()`. Tasks saved without a known previous state get
+their board recounted instead.
+"""
+
+# Standard library imports
+from collections import Counter, defaultdict
+
+# Local imports
+from kanban_app.models import Board, Task
+
+
+def record_tasks_saved(tasks, created=False):
+    """Apply the board counter changes caused by saving `tasks`."""
+    deltas = defaultdict(Counter)
+    unknown = set()
+    for task in tasks:
+        board_id, counts = task.counted_state()
+        previous = None if created else getattr(task, "_counted", None)
+        if not created and previous is None:
+            unknown.add(board_id)
+        else:
+            deltas[board_id].update(counts)
+            if previous is not None:
+                deltas[previous[0]].subtract(previous[1])
+        task._counted = board_id, counts
+
+    apply_board_deltas(deltas)
+    if unknown:
+        Board.objects.filter(pk__in=unknown).recount()
+
+
+def record_tasks_deleted(tasks):
+    """Apply the board counter changes caused by deleting `tasks`."""
+    deltas = defaultdict(Counter)
+    for task in tasks:
+        board_id, counts = getattr(task, "_counted", None) or task.counted_state()
+        deltas[board_id].subtract(counts)
+    apply_board_deltas(deltas)
+
+
+def apply_board_deltas(deltas):
+    """Apply `{board_id: {counter: delta}}` with one UPDATE per board."""
+    for board_id, counts in deltas.items():
+        Board.objects.filter(pk=board_id).adjust_counters(**counts)
+
+
+def adjust_comments_count(task_id, delta):
+    """Add `delta` to the stored comment count of a task."""
+    Task.objects.filter(pk=task_id).adjust_counters(comments_count=delta)
+
+
+def recount_members(board_ids):
+    """Recompute `member_count` of the given boards."""
+    if board_ids:
+        Board.objects.filter(pk__in=board_ids).recount_members()
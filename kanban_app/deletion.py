@@ -0,0 +1,215 @@
+"""Deferred deletion of boards and accounts.
+
+Deleting a row with `on_delete=CASCADE` children makes Django's
+`Collector` load every task and comment into memory and delete them in
+one transaction, which for a large board outlasts the request and
+locks the tasks table meanwhile. Instead:
+
+- `delete_board()` sets `Board.deleted_at` in a single UPDATE. The
+  board disappears from `Board.objects` at once, members lose access,
+  and subscribers get a `board.deleted` event. `purge_board()` then
+  runs as a background job (see `jobs_app.jobs`).
+- `purge_board()` removes search documents, comments, tasks, change
+  log rows and memberships in batches of `KANMIND_PURGE_BATCH_SIZE`
+  rows, each batch in its own short transaction, and finally the board
+  row. These rows are deleted without signals: nothing shows them any
+  more, so there is no counter, change log or event to keep in step.
+  The board's `ticket_count` follows the purge, which is what
+  `GET /api/boards/deletions/` reports as progress.
+- `delete_account()` deactivates the user, sets `Account.deleted_at`,
+  removes the account from boards it is a member of and deletes the
+  boards it owns as above. `purge_account()` purges those boards, then
+  deletes the account's comments and tasks on other boards in batches,
+  with signals as for any other delete, and finally the user.
+
+Purges are safe to repeat, so a failed one is simply retried. With the
+`thread` job backend queued purges are lost when the process exits;
+`manage.py purge_deleted` finishes every board and account still
+marked deleted.
+Purged rows are counted in `kanmind_purged_rows_total`.
+"""
+
+# Standard library imports
+import logging
+
+# Django imports
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.utils import timezone
+
+# Local imports
+from auth_app.models import Account
+from core.metrics import define, inc
+from jobs_app.jobs import enqueue, job
+from kanban_app.api.response_cache import board_payload_cache
+from kanban_app.membership import invalidate_accounts
+from kanban_app.models import Board, BoardChange, Comment, SearchDocument, Task
+from kanban_app.realtime import publish_board_event
+
+PURGE_BATCH_SIZE = getattr(settings, "KANMIND_PURGE_BATCH_SIZE", 1000)
+
+logger = logging.getLogger("kanmind.jobs")
+
+define(
+    "kanmind_purged_rows_total",
+    "counter",
+    "Rows removed by deferred board and account deletion, by model.",
+)
+
+
+def delete_board(board):
+    """Hide `board` right away and purge its content in the background."""
+    with transaction.atomic():
+        mark_boards_deleted(Board.objects.filter(pk=board.pk))
+        enqueue(purge_board, board.pk)
+
+
+def mark_boards_deleted(boards):
+    """Set `deleted_at` on `boards` and revoke everyone's access to them."""
+    board_ids = list(boards.values_list("pk", flat=True))
+    if not board_ids:
+        return []
+    boards = Board.all_objects.filter(pk__in=board_ids)
+    boards.update(deleted_at=timezone.now())
+    memberships = Board.members.through.objects.filter(board_id__in=board_ids)
+    invalidate_accounts(
+        [
+            *boards.values_list("owner_id", flat=True),
+            *memberships.values_list("account_id", flat=True),
+        ]
+    )
+    for board_id in board_ids:
+        board_payload_cache.evict(board_id)
+        publish_board_event(board_id, "board.deleted", {"id": board_id})
+    return board_ids
+
+
+@job
+def purge_board(board_id, batch_size=None):
+    """Delete a board marked deleted and everything on it, in batches.
+
+    Returns the number of tasks and comments removed. Does nothing if
+    the board is not marked deleted, so running it twice is harmless.
+    """
+    batch_size = batch_size or PURGE_BATCH_SIZE
+    if not Board.all_objects.filter(pk=board_id, deleted_at__isnull=False).exists():
+        return 0
+    tasks = Task.objects.filter(board_id=board_id)
+    purged = 0
+    while task_ids := list(tasks.values_list("pk", flat=True)[:batch_size]):
+        purged += purge_batches(
+            Comment.objects.filter(task_id__in=task_ids),
+            batch_size,
+            before=lambda ids: purge_rows(SearchDocument, comment_id__in=ids),
+        )
+        with transaction.atomic():
+            purge_rows(SearchDocument, task_id__in=task_ids)
+            purged += purge_rows(Task, pk__in=task_ids)
+            Board.all_objects.filter(pk=board_id).adjust_counters(
+                ticket_count=-len(task_ids)
+            )
+    purge_batches(BoardChange.objects.filter(board_id=board_id), batch_size)
+    purge_batches(Board.members.through.objects.filter(board_id=board_id), batch_size)
+    with transaction.atomic():
+        purge_rows(Board, pk=board_id)
+    logger.info("Purged board %s: %s tasks and comments", board_id, purged)
+    return purged
+
+
+def purge_batches(queryset, batch_size, before=None):
+    """Delete the rows of `queryset` in batches, one transaction each.
+
+    `before` is called with each batch's ids inside its transaction,
+    to remove rows referencing the batch first.
+    """
+    purged = 0
+    while True:
+        with transaction.atomic():
+            ids = list(queryset.values_list("pk", flat=True)[:batch_size])
+            if not ids:
+                return purged
+            if before is not None:
+                before(ids)
+            purged += purge_rows(queryset.model, pk__in=ids)
+
+
+def purge_rows(model, **lookups):
+    """Delete matching rows with one DELETE, without signals or cascades.
+
+    Callers delete referencing rows first; `_raw_delete()` is what the
+    `Collector` itself uses for rows it may fast-delete.
+    """
+    queryset = model._base_manager.filter(**lookups)
+    deleted = queryset._raw_delete(queryset.db)
+    if deleted:
+        inc(
+            "kanmind_purged_rows_total",
+            (("model", queryset.model._meta.label_lower),),
+            deleted,
+        )
+    return deleted
+
+
+def delete_account(account):
+    """Deactivate `account` right away and purge its data in the background."""
+    with transaction.atomic():
+        user = account.user
+        user.is_active = False
+        user.save(update_fields=["is_active"])
+        Account.all_objects.filter(pk=account.pk).update(deleted_at=timezone.now())
+        account.boards_member_of.clear()
+        mark_boards_deleted(Board.objects.filter(owner=account))
+        enqueue(purge_account, account.pk)
+
+
+@job
+def purge_account(account_id, batch_size=None):
+    """Delete an account marked deleted and its data, in batches.
+
+    Its boards are purged like deleted boards. Comments and tasks it
+    created on other boards go through ordinary deletes, batch by
+    batch, so counters, change log and events stay in step.
+    """
+    batch_size = batch_size or PURGE_BATCH_SIZE
+    account = (
+        Account.all_objects.filter(pk=account_id, deleted_at__isnull=False)
+        .only("user_id")
+        .first()
+    )
+    if account is None:
+        return
+    owned = Board.all_objects.filter(owner_id=account_id)
+    for board_id in owned.values_list("pk", flat=True):
+        purge_board(board_id, batch_size)
+    for queryset in (
+        Comment.objects.filter(author_id=account_id),
+        Task.objects.filter(created_by_id=account_id),
+    ):
+        while ids := list(queryset.values_list("pk", flat=True)[:batch_size]):
+            with transaction.atomic():
+                queryset.filter(pk__in=ids).delete()
+    with transaction.atomic():
+        User.objects.filter(pk=account.user_id).delete()
+    logger.info("Purged account %s", account_id)
+
+
+def purge_deleted(batch_size=None):
+    """Finish every pending board and account purge.
+
+    Returns `(boards, accounts)` purged. Meant for `manage.py
+    purge_deleted` after a restart lost the queued purges.
+    """
+    account_ids = list(
+        Account.all_objects.filter(deleted_at__isnull=False).values_list(
+            "pk", flat=True
+        )
+    )
+    board_ids = list(
+        Board.all_objects.filter(deleted_at__isnull=False).values_list("pk", flat=True)
+    )
+    for board_id in board_ids:
+        purge_board(board_id, batch_size)
+    for account_id in account_ids:
+        purge_account(account_id, batch_size)
+    return len(board_ids), len(account_ids)
@@ -0,0 +1,128 @@
+"""Load-test the sync and async read endpoints of a running server."""
+
+# Standard library imports
+import http.client
+import threading
+import time
+from urllib.parse import urlsplit
+
+# Django imports
+from django.core.management.base import BaseCommand, CommandError
+
+
+class Command(BaseCommand):
+    help = (
+        "Send concurrent GET requests to each read endpoint and its /api/async/ "
+        "counterpart on a running server, and print requests per second, p50 "
+        "and p99 latency and failed requests for each. Start the server "
+        "separately, e.g. `uvicorn core.asgi:application`; this command only "
+        "runs the client and does not touch the database."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--url", default="http://127.0.0.1:8000", help="Base URL of the server."
+        )
+        parser.add_argument(
+            "--token", required=True, help="API token of a member of the board."
+        )
+        parser.add_argument("--board", type=int, default=1, help="Board id.")
+        parser.add_argument("--task", type=int, default=1, help="Task id.")
+        parser.add_argument(
+            "--concurrency", type=int, default=100, help="Concurrent connections."
+        )
+        parser.add_argument(
+            "--requests", type=int, default=2000, help="Requests per endpoint."
+        )
+
+    def handle(self, *args, **options):
+        url = urlsplit(options["url"])
+        if url.scheme not in ("http", "https") or not url.hostname:
+            raise CommandError(f"Unsupported URL: {options['url']}")
+        if options["concurrency"] < 1 or options["requests"] < 1:
+            raise CommandError("--concurrency and --requests must be positive.")
+
+        paths = [
+            "/api/boards/",
+            f"/api/boards/{options['board']}/",
+            "/api/tasks/reviewing/",
+            f"/api/tasks/{options['task']}/comments/",
+        ]
+        self.stdout.write(
+            f"{'endpoint':<36} {'req/s':>9} {'p50 ms':>8} {'p99 ms':>8} "
+            f"{'failed':>7}"
+        )
+        for path in paths:
+            for endpoint in (path, path.replace("/api/", "/api/async/", 1)):
+                rate, p50, p99, failed = self.run(url, endpoint, options)
+                self.stdout.write(
+                    f"{endpoint:<36} {rate:>9.1f} {p50 * 1000:>8.1f} "
+                    f"{p99 * 1000:>8.1f} {failed:>7}"
+                )
+
+    def run(self, url, path, options):
+        """Send `--requests` GETs over `--concurrency` connections.
+
+        Return requests per second, p50 and p99 latency in seconds and
+        the number of failed requests.
+        """
+        concurrency = options["concurrency"]
+        quotas = [
+            options["requests"] // concurrency
+            + (index < options["requests"] % concurrency)
+            for index in range(concurrency)
+        ]
+        headers = {"Authorization": f"Token {options['token']}"}
+        results = []
+        threads = [
+            threading.Thread(
+                target=self.work, args=(url, path, headers, quota, results)
+            )
+            for quota in quotas
+            if quota
+        ]
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+
+        latencies = sorted(latency for latency, ok in results if ok)
+        failed = len(results) - len(latencies)
+        if not latencies:
+            return 0.0, 0.0, 0.0, failed
+        return (
+            len(latencies) / elapsed,
+            latencies[(len(latencies) - 1) // 2],
+            latencies[max(0, round(len(latencies) * 0.99) - 1)],
+            failed,
+        )
+
+    @staticmethod
+    def work(url, path, headers, quota, results):
+        """Send `quota` GETs over one keep-alive connection, timing each."""
+        connection_class = (
+            http.client.HTTPSConnection
+            if url.scheme == "https"
+            else http.client.HTTPConnection
+        )
+        connection = connection_class(url.hostname, url.port, timeout=30)
+        samples = []
+        try:
+            for _ in range(quota):
+                start = time.perf_counter()
+                try:
+                    connection.request(
+                        "GET", url.path.rstrip("/") + path, headers=headers
+                    )
+                    response = connection.getresponse()
+                    response.read()
+                    ok = response.status == 200
+                except (OSError, http.client.HTTPException):
+                    connection.close()
+                    ok = False
+                samples.append((time.perf_counter() - start, ok))
+        finally:
+            connection.close()
+        results.extend(samples)
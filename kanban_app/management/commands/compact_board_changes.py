@@ -0,0 +1,40 @@
+"""Drop board change log entries past the retention window."""
+
+# Django imports
+from django.core.management.base import BaseCommand
+
+# Local imports
+from kanban_app.changes import RETENTION_DAYS, compact_changes
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete delta sync change log entries older than "
+        "KANMIND_CHANGE_RETENTION_DAYS and raise each board's change floor, "
+        "so clients that last synced before it reload the board. Boards are "
+        "processed in batches, each in its own transaction, so the command can "
+        "run against a live database; schedule it daily."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=RETENTION_DAYS,
+            help="Keep entries changed within this many days.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Number of boards compacted per transaction.",
+        )
+
+    def handle(self, *args, **options):
+        if options["days"] < 0:
+            raise SystemExit("--days must not be negative")
+        if options["batch_size"] <= 0:
+            raise SystemExit("--batch-size must be positive")
+
+        dropped = compact_changes(options["days"], options["batch_size"])
+        self.stdout.write(f"board changes: dropped {dropped} entry(s)")
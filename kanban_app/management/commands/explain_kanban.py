@@ -0,0 +1,156 @@
+"""Print EXPLAIN plans for the querysets behind the hot API endpoints."""
+
+# Standard library imports
+import datetime
+
+# Django imports
+from django.core.management.base import BaseCommand
+from django.db import connections
+from django.http import QueryDict
+from django.utils import timezone
+
+# Local imports
+from auth_app.models import Account
+from jobs_app.models import Job
+from kanban_app.api.filters import CommentSince, TaskFilters
+from kanban_app.api.pagination import (
+    BoardPagination,
+    CommentPagination,
+    TaskPagination,
+)
+from kanban_app.models import Board, Comment, Task
+
+
+class Command(BaseCommand):
+    help = (
+        "Run EXPLAIN on the querysets used by the board, task and comment "
+        "endpoints and report any full table scans. Planners may prefer scans "
+        "on nearly empty tables, so run it against a realistically sized "
+        "database."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--account", type=int, default=1, help="Account id.")
+        parser.add_argument("--board", type=int, default=1, help="Board id.")
+        parser.add_argument("--task", type=int, default=1, help="Task id.")
+        parser.add_argument(
+            "--database", default="default", help="Database alias to explain on."
+        )
+        parser.add_argument(
+            "--strict",
+            action="store_true",
+            help="Exit with an error if any endpoint needs a full table scan.",
+        )
+
+    def handle(self, *args, **options):
+        account = Account(pk=options["account"])
+        board = Board(pk=options["board"])
+        task = Task(pk=options["task"])
+        using = options["database"]
+        vendor = connections[using].vendor
+
+        scans = []
+        for name, queryset in self.get_querysets(account, board, task):
+            plan = queryset.using(using).explain()
+            scanned = self.find_full_scans(plan, vendor)
+            status = (
+                self.style.ERROR("FULL SCAN") if scanned else self.style.SUCCESS("OK")
+            )
+            self.stdout.write(f"== {name}: {status}")
+            self.stdout.write(plan)
+            self.stdout.write("")
+            if scanned:
+                scans.append(name)
+
+        if scans and options["strict"]:
+            raise SystemExit(f"Full table scans in: {', '.join(scans)}")
+
+    def get_querysets(self, account, board, task):
+        """Return `(label, queryset)` pairs mirroring the API views."""
+        members = Board.members.through.objects
+        return [
+            (
+                "GET /api/boards/",
+                BoardPagination().order_queryset(Board.objects.accessible_to(account)),
+            ),
+            (
+                "GET /api/boards/<id>/ members",
+                Account.objects.select_related("user").filter(boards_member_of=board),
+            ),
+            (
+                "GET /api/boards/<id>/ tasks",
+                Task.objects.filter(board=board).order_by(*TaskFilters.column_ordering),
+            ),
+            (
+                "POST /api/tasks/<id>/move/ neighbours",
+                Task.objects.filter(
+                    board=board, status=Task.Status.TODO, position__gt="i"
+                ).order_by("position"),
+            ),
+            (
+                "GET /api/tasks/assigned-to-me/",
+                TaskPagination().order_queryset(Task.objects.assigned_to(account)),
+            ),
+            (
+                "GET /api/tasks/reviewing/",
+                TaskPagination().order_queryset(Task.objects.reviewed_by(account)),
+            ),
+            (
+                "GET /api/tasks/assigned-to-me/?status=&due_after=",
+                TaskPagination().order_queryset(
+                    Task.objects.assigned_to(account).filter(
+                        status__in=[Task.Status.TODO, Task.Status.REVIEW],
+                        due_date__gte=datetime.date.today(),
+                    )
+                ),
+            ),
+            (
+                "GET /api/boards/<id>/?priority=",
+                Task.objects.filter(board=board, priority=Task.Priority.HIGH),
+            ),
+            (
+                "GET /api/tasks/<id>/comments/",
+                CommentPagination().order_queryset(Comment.objects.filter(task=task)),
+            ),
+            (
+                "GET /api/tasks/<id>/comments/?since=",
+                CommentPagination().order_queryset(
+                    CommentSince(QueryDict("since=2000-01-01T00:00:00Z")).filter(
+                        Comment.objects.filter(task=task)
+                    )
+                ),
+            ),
+            (
+                "board purge task batch",
+                Task.objects.filter(board=board).values_list("pk")[:1000],
+            ),
+            (
+                "manage.py purge_deleted boards",
+                Board.all_objects.filter(deleted_at__isnull=False),
+            ),
+            (
+                "manage.py run_kanban_worker claim",
+                Job.objects.filter(
+                    status=Job.Status.QUEUED, run_at__lte=timezone.now()
+                ).order_by("run_at", "pk"),
+            ),
+            (
+                "board membership check",
+                members.filter(board=board, account=account),
+            ),
+        ]
+
+    def find_full_scans(self, plan, vendor):
+        """Return plan lines that read a whole table without an index."""
+        lines = plan.splitlines()
+        if vendor == "postgresql":
+            return [line for line in lines if "Seq Scan" in line]
+        if vendor == "sqlite":
+            return [
+                line
+                for line in lines
+                if "SCAN " in line
+                and "INDEX" not in line
+                and "CONSTANT ROW" not in line
+            ]
+        return []
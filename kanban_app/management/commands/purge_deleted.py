@@ -0,0 +1,33 @@
+"""Finish purging boards and accounts that were deleted."""
+
+# Django imports
+from django.core.management.base import BaseCommand
+
+# Local imports
+from kanban_app.deletion import PURGE_BATCH_SIZE, purge_deleted
+
+
+class Command(BaseCommand):
+    help = (
+        "Purge the tasks, comments and other rows of every board and account "
+        "marked deleted. With the thread job backend, deletes queue their "
+        "purge in the web process, which loses it on restart; run this after "
+        "a deploy or schedule it daily. "
+        "Rows are removed in batches, each in its own transaction, so the "
+        "command can run against a live database."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=PURGE_BATCH_SIZE,
+            help="Number of rows deleted per transaction.",
+        )
+
+    def handle(self, *args, **options):
+        if options["batch_size"] <= 0:
+            raise SystemExit("--batch-size must be positive")
+
+        boards, accounts = purge_deleted(options["batch_size"])
+        self.stdout.write(f"purged {boards} board(s) and {accounts} account(s)")
@@ -0,0 +1,78 @@
+"""Rebuild the full-text search documents and index."""
+
+# Django imports
+from django.core.management.base import BaseCommand
+from django.db import connections, router, transaction
+
+# Local imports
+from kanban_app.models import Comment, SearchDocument, Task
+from kanban_app.search import (
+    comment_document,
+    install_index,
+    refresh_index,
+    task_document,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Regenerate the search documents of every task and comment and rebuild "
+        "the full-text index. Tasks are processed in primary key batches, each "
+        "in its own transaction, and comments are streamed, so memory use stays "
+        "flat and search keeps working while the command runs."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Number of tasks re-indexed per transaction.",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        if batch_size <= 0:
+            raise SystemExit("--batch-size must be positive")
+
+        connection = connections[router.db_for_write(SearchDocument)]
+        install_index(connection)
+
+        tasks = documents = 0
+        last_pk = 0
+        while True:
+            batch = list(
+                Task.objects.filter(pk__gt=last_pk)
+                .order_by("pk")
+                .only("id", "board_id", "title", "description")[:batch_size]
+            )
+            if not batch:
+                break
+            with transaction.atomic(using=connection.alias):
+                documents += self.reindex(batch, batch_size)
+            tasks += len(batch)
+            last_pk = batch[-1].pk
+
+        refresh_index(connection)
+        self.stdout.write(f"Indexed {tasks} task(s) in {documents} document(s).")
+
+    def reindex(self, tasks, chunk_size):
+        """Replace the documents of `tasks` and their comments."""
+        board_ids = {task.pk: task.board_id for task in tasks}
+        SearchDocument.objects.filter(task__in=board_ids).delete()
+        written = len(
+            SearchDocument.objects.bulk_create(task_document(task) for task in tasks)
+        )
+
+        comments = (
+            Comment.objects.filter(task__in=board_ids)
+            .only("id", "task_id", "content")
+            .iterator(chunk_size=chunk_size)
+        )
+        chunk = []
+        for comment in comments:
+            chunk.append(comment_document(comment, board_ids[comment.task_id]))
+            if len(chunk) == chunk_size:
+                written += len(SearchDocument.objects.bulk_create(chunk))
+                chunk = []
+        return written + len(SearchDocument.objects.bulk_create(chunk))
@@ -0,0 +1,51 @@
+"""Repair drift in the denormalized board and task counters."""
+
+# Django imports
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+# Local imports
+from kanban_app.models import Board, Task
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute the stored member, ticket, to-do, high-priority and comment "
+        "counts and fix rows that drifted from the real counts. Rows are "
+        "processed in primary key batches, each in its own transaction, so the "
+        "command can run against a live database."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Number of rows recounted per transaction.",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        if batch_size <= 0:
+            raise SystemExit("--batch-size must be positive")
+
+        for model in (Board, Task):
+            fixed = self.recount(model, batch_size)
+            label = model._meta.verbose_name_plural
+            self.stdout.write(f"{label}: fixed {fixed} row(s)")
+
+    def recount(self, model, batch_size):
+        """Recount `model` rows batch by batch; return how many were fixed."""
+        fixed = 0
+        last_pk = 0
+        while True:
+            pks = list(
+                model.objects.filter(pk__gt=last_pk)
+                .order_by("pk")
+                .values_list("pk", flat=True)[:batch_size]
+            )
+            if not pks:
+                return fixed
+            with transaction.atomic():
+                fixed += model.objects.filter(pk__gte=pks[0], pk__lte=pks[-1]).recount()
+            last_pk = pks[-1]
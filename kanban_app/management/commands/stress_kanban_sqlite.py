@@ -0,0 +1,165 @@
+"""Compare SQLite throughput and lock errors with and without the tuned options."""
+
+# Standard library imports
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+# Django imports
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS, OperationalError, connections, transaction
+from django.db.models import F
+
+# Local imports
+from auth_app.models import Account
+from kanban_app.models import Board, Comment, Task
+
+
+class Command(BaseCommand):
+    help = (
+        "Run parallel task/comment writers and board readers for a fixed time "
+        "against two scratch SQLite databases, one with Django's default "
+        "options and one with KANMIND_SQLITE_OPTIONS, and print operations per "
+        "second and 'database is locked' errors for each. The real database is "
+        "not touched."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--seconds", type=float, default=10, help="Duration of each run."
+        )
+        parser.add_argument(
+            "--writers", type=int, default=8, help="Concurrent writer threads."
+        )
+        parser.add_argument(
+            "--readers", type=int, default=8, help="Concurrent reader threads."
+        )
+
+    def handle(self, *args, **options):
+        modes = [
+            ("default", {}),
+            ("tuned", getattr(settings, "KANMIND_SQLITE_OPTIONS", {})),
+        ]
+        self.stdout.write(
+            f"{'mode':<8} {'writes/s':>10} {'reads/s':>10} {'lock errors':>12}"
+        )
+        with tempfile.TemporaryDirectory() as directory:
+            for mode, sqlite_options in modes:
+                alias = f"stress_{mode}"
+                path = Path(directory) / f"{mode}.sqlite3"
+                self.add_database(alias, path, sqlite_options)
+                try:
+                    writes, reads, errors = self.run(alias, options)
+                finally:
+                    connections[alias].close()
+                    del connections.settings[alias]
+                seconds = options["seconds"]
+                self.stdout.write(
+                    f"{mode:<8} {writes / seconds:>10.1f} {reads / seconds:>10.1f} "
+                    f"{errors:>12}"
+                )
+
+    def add_database(self, alias, path, sqlite_options):
+        connections.settings[alias] = {
+            **connections.settings[DEFAULT_DB_ALIAS],
+            "ENGINE": "django.db.backends.sqlite3",
+            "NAME": str(path),
+            "OPTIONS": dict(sqlite_options),
+        }
+        call_command("migrate", database=alias, verbosity=0, interactive=False)
+
+    def run(self, alias, options):
+        """Seed one board, then run the workers; return their totals.
+
+        Like the workers, seeding uses bulk inserts so that no signal
+        handler runs against the real database.
+        """
+        (user,) = User.objects.using(alias).bulk_create([User(username="stress")])
+        (account,) = Account.objects.using(alias).bulk_create(
+            [Account(user_id=user.pk, fullname="Stress")]
+        )
+        (board,) = Board.objects.using(alias).bulk_create(
+            [Board(title="Stress", owner_id=account.pk)]
+        )
+
+        stop = threading.Event()
+        results = []
+        threads = [
+            threading.Thread(
+                target=self.work,
+                args=(self.write, alias, board.pk, account.pk, stop, results),
+            )
+            for _ in range(options["writers"])
+        ] + [
+            threading.Thread(
+                target=self.work,
+                args=(self.read, alias, board.pk, account.pk, stop, results),
+            )
+            for _ in range(options["readers"])
+        ]
+        for thread in threads:
+            thread.start()
+        time.sleep(options["seconds"])
+        stop.set()
+        for thread in threads:
+            thread.join()
+
+        writes = sum(count for kind, count, _ in results if kind == "write")
+        reads = sum(count for kind, count, _ in results if kind == "read")
+        errors = sum(errors for _, _, errors in results)
+        return writes, reads, errors
+
+    @staticmethod
+    def work(operation, alias, board_id, account_id, stop, results):
+        """Repeat `operation` until `stop` is set, counting lock errors."""
+        done = errors = 0
+        try:
+            while not stop.is_set():
+                try:
+                    operation(alias, board_id, account_id)
+                    done += 1
+                except OperationalError as exc:
+                    if "locked" not in str(exc):
+                        raise
+                    errors += 1
+        finally:
+            connections[alias].close()
+        results.append((operation.__name__, done, errors))
+
+    @staticmethod
+    def write(alias, board_id, account_id):
+        """Mimic a task create: validate, insert task and comment, bump counters."""
+        with transaction.atomic(using=alias):
+            Board.objects.using(alias).filter(pk=board_id).exists()
+            (task,) = Task.objects.using(alias).bulk_create(
+                [
+                    Task(
+                        board_id=board_id,
+                        title="Stress task",
+                        status=Task.Status.TODO,
+                        priority=Task.Priority.LOW,
+                        created_by_id=account_id,
+                    )
+                ]
+            )
+            Comment.objects.using(alias).bulk_create(
+                [
+                    Comment(
+                        task_id=task.pk, author_id=account_id, content="Stress comment"
+                    )
+                ]
+            )
+            Board.objects.using(alias).filter(pk=board_id).update(
+                ticket_count=F("ticket_count") + 1
+            )
+
+    @staticmethod
+    def read(alias, board_id, account_id):
+        """Mimic a board detail read: recent tasks and their comment count."""
+        tasks = Task.objects.using(alias).filter(board_id=board_id)
+        list(tasks.order_by("-id").values("id", "title", "status")[:50])
+        Comment.objects.using(alias).filter(task__board_id=board_id).count()
@@ -0,0 +1,134 @@
+"""Per-request resolution of the boards an account may access.
+
+Permission checks ask the same question many times per request: can
+this account see board X? Instead of one membership query per check,
+the ids of every board the requester owns or is a member of are loaded
+once, kept in Django's cache for `KANMIND_MEMBERSHIP_CACHE_TTL`
+seconds, and memoized on the request. Signal handlers in
+`kanban_app.signals` drop the cached entry whenever membership changes.
+The ids are read from the primary database, so a lagging read replica
+cannot put a stale entry in the cache right after an eviction.
+"""
+
+# Django imports
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, transaction
+
+# Local imports
+from kanban_app.models import Board, Task
+
+MEMBERSHIP_CACHE_TTL = getattr(settings, "KANMIND_MEMBERSHIP_CACHE_TTL", 60)
+
+
+def _cache_key(account_id):
+    return f"kanmind:board-ids:{account_id}"
+
+
+def _request_store(request):
+    """Return the underlying `HttpRequest` so DRF and Django views share memos."""
+    return getattr(request, "_request", request)
+
+
+def load_accessible_board_ids(account_id):
+    """Query the ids of boards owned by or shared with `account_id`."""
+    queryset = Board.objects.using(DEFAULT_DB_ALIAS).accessible_to(account_id)
+    return frozenset(queryset.values_list("id", flat=True))
+
+
+def get_accessible_board_ids(request):
+    """Return the requester's accessible board ids, loading them at most once."""
+    store = _request_store(request)
+    board_ids = getattr(store, "_kanban_board_ids", None)
+    if board_ids is None:
+        account_id = request.user.account.id
+        key = _cache_key(account_id)
+        board_ids = cache.get(key)
+        if board_ids is None:
+            board_ids = load_accessible_board_ids(account_id)
+            cache.set(key, board_ids, MEMBERSHIP_CACHE_TTL)
+        store._kanban_board_ids = board_ids
+    return board_ids
+
+
+async def aload_accessible_board_ids(account_id):
+    """Async counterpart of `load_accessible_board_ids()`."""
+    queryset = Board.objects.using(DEFAULT_DB_ALIAS).accessible_to(account_id)
+    return frozenset(
+        [board_id async for board_id in queryset.values_list("id", flat=True)]
+    )
+
+
+async def aget_accessible_board_ids(request):
+    """Async counterpart of `get_accessible_board_ids()`."""
+    store = _request_store(request)
+    board_ids = getattr(store, "_kanban_board_ids", None)
+    if board_ids is None:
+        account_id = request.user.account.id
+        key = _cache_key(account_id)
+        board_ids = await cache.aget(key)
+        if board_ids is None:
+            board_ids = await aload_accessible_board_ids(account_id)
+            await cache.aset(key, board_ids, MEMBERSHIP_CACHE_TTL)
+        store._kanban_board_ids = board_ids
+    return board_ids
+
+
+async def acan_access_board(request, board_id):
+    """Async counterpart of `can_access_board()`."""
+    try:
+        board_id = int(board_id)
+    except (TypeError, ValueError):
+        return False
+    return board_id in await aget_accessible_board_ids(request)
+
+
+def can_access_board(request, board_id):
+    """Return True if the requester owns or is a member of `board_id`."""
+    try:
+        board_id = int(board_id)
+    except (TypeError, ValueError):
+        return False
+    return board_id in get_accessible_board_ids(request)
+
+
+def get_task_board_id(request, task_id):
+    """Return the board id of `task_id` (None if missing), memoized per request.
+
+    Tasks of boards awaiting deletion count as missing.
+    """
+    store = _request_store(request)
+    memo = getattr(store, "_kanban_task_boards", None)
+    if memo is None:
+        memo = store._kanban_task_boards = {}
+    if task_id not in memo:
+        memo[task_id] = (
+            Task.objects.on_live_boards()
+            .filter(pk=task_id)
+            .values_list("board_id", flat=True)
+            .first()
+        )
+    return memo[task_id]
+
+
+async def aget_task_board_id(request, task_id):
+    """Async counterpart of `get_task_board_id()`."""
+    store = _request_store(request)
+    memo = getattr(store, "_kanban_task_boards", None)
+    if memo is None:
+        memo = store._kanban_task_boards = {}
+    if task_id not in memo:
+        memo[task_id] = (
+            await Task.objects.on_live_boards()
+            .filter(pk=task_id)
+            .values_list("board_id", flat=True)
+            .afirst()
+        )
+    return memo[task_id]
+
+
+def invalidate_accounts(account_ids):
+    """Drop cached board ids for `account_ids` once the transaction commits."""
+    keys = [_cache_key(account_id) for account_id in set(account_ids)]
+    if keys:
+        transaction.on_commit(lambda: cache.delete_many(keys))
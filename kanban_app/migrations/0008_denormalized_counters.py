@@ -0,0 +1,68 @@
+# Generated by Django 5.2.8 on 2026-10-17 06:16
+
+from django.db import migrations, models
+from django.db.models import Count, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def count_of(queryset, outer_field):
+    counted = (
+        queryset.filter(**{outer_field: OuterRef('pk')})
+        .order_by()
+        .values(outer_field)
+        .annotate(total=Count('pk'))
+        .values('total')
+    )
+    return Coalesce(Subquery(counted, output_field=IntegerField()), 0)
+
+
+def populate_counters(apps, schema_editor):
+    Board = apps.get_model('kanban_app', 'Board')
+    Task = apps.get_model('kanban_app', 'Task')
+    Comment = apps.get_model('kanban_app', 'Comment')
+    using = schema_editor.connection.alias
+    tasks = Task.objects.using(using)
+
+    Board.objects.using(using).update(
+        member_count=count_of(Board.members.through.objects.using(using), 'board'),
+        ticket_count=count_of(tasks, 'board'),
+        tasks_to_do_count=count_of(tasks.filter(status='to-do'), 'board'),
+        tasks_high_prio_count=count_of(tasks.filter(priority='high'), 'board'),
+    )
+    tasks.update(comments_count=count_of(Comment.objects.using(using), 'task'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('kanban_app', '0007_board_revision'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='board',
+            name='member_count',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='board',
+            name='tasks_high_prio_count',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='board',
+            name='tasks_to_do_count',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='board',
+            name='ticket_count',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='task',
+            name='comments_count',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(populate_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,75 @@
+# Generated by Django 5.2.8 on 2026-10-17 06:23
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+from kanban_app.search import install_index, uninstall_index
+
+
+def insert_in_batches(manager, documents, batch_size=1000):
+    batch = []
+    for document in documents:
+        batch.append(document)
+        if len(batch) == batch_size:
+            manager.bulk_create(batch)
+            batch = []
+    manager.bulk_create(batch)
+
+
+def create_search_index(apps, schema_editor):
+    install_index(schema_editor.connection)
+
+    SearchDocument = apps.get_model('kanban_app', 'SearchDocument')
+    Task = apps.get_model('kanban_app', 'Task')
+    Comment = apps.get_model('kanban_app', 'Comment')
+    using = schema_editor.connection.alias
+    documents = SearchDocument.objects.using(using)
+
+    tasks = Task.objects.using(using).values_list(
+        'id', 'board_id', 'title', 'description'
+    )
+    insert_in_batches(documents, (
+        SearchDocument(
+            task_id=task_id,
+            board_id=board_id,
+            content='\n'.join(filter(None, [title, description])),
+        )
+        for task_id, board_id, title, description in tasks.iterator(chunk_size=1000)
+    ))
+    comments = Comment.objects.using(using).values_list(
+        'id', 'task_id', 'task__board_id', 'content'
+    )
+    insert_in_batches(documents, (
+        SearchDocument(
+            comment_id=comment_id, task_id=task_id, board_id=board_id, content=content
+        )
+        for comment_id, task_id, board_id, content in comments.iterator(chunk_size=1000)
+    ))
+
+
+def drop_search_index(apps, schema_editor):
+    uninstall_index(schema_editor.connection)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('kanban_app', '0008_denormalized_counters'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchDocument',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('content', models.TextField()),
+                ('board', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='kanban_app.board')),
+                ('comment', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='kanban_app.comment')),
+                ('task', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='kanban_app.task')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(condition=models.Q(('comment__isnull', True)), fields=('task',), name='searchdocument_one_per_task')],
+            },
+        ),
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,46 @@
+# Generated by Django 5.2.8 on 2026-10-17 06:47
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+from django.db.models import F
+
+
+def start_change_log(apps, schema_editor):
+    # Changes made before the log existed were never recorded, so clients
+    # syncing from an earlier revision must reload the board.
+    Board = apps.get_model('kanban_app', 'Board')
+    Board.objects.using(schema_editor.connection.alias).update(
+        changes_floor=F('revision')
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('kanban_app', '0010_comment_created_at_default'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='board',
+            name='changes_floor',
+            field=models.PositiveBigIntegerField(default=0, editable=False),
+        ),
+        migrations.CreateModel(
+            name='BoardChange',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('board', 'Board'), ('member', 'Member'), ('task', 'Task'), ('comment', 'Comment')], max_length=10)),
+                ('object_id', models.BigIntegerField()),
+                ('revision', models.PositiveBigIntegerField()),
+                ('changed_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('board', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='kanban_app.board')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['board', 'revision'], name='boardchange_revision_idx'), models.Index(fields=['changed_at'], name='boardchange_changed_at_idx')],
+                'constraints': [models.UniqueConstraint(fields=('board', 'kind', 'object_id'), name='boardchange_one_per_object')],
+            },
+        ),
+        migrations.RunPython(start_change_log, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,58 @@
+# Generated by Django 5.2.8 on 2026-10-17 06:52
+
+from django.db import migrations, models
+
+DIGITS = '0123456789abcdefghijklmnopqrstuvwxyz'
+
+
+def spread_keys(count):
+    # Same keys as kanban_app.positions.spread_keys at the time of writing.
+    width = 1
+    while len(DIGITS) ** width < (count + 1) * len(DIGITS):
+        width += 1
+    step = len(DIGITS) ** width // (count + 1)
+    keys = []
+    for index in range(count):
+        value, digits = step * (index + 1), []
+        for _ in range(width):
+            value, digit = divmod(value, len(DIGITS))
+            digits.append(DIGITS[digit])
+        keys.append(''.join(reversed(digits)).rstrip('0'))
+    return keys
+
+
+def populate_positions(apps, schema_editor):
+    # Existing columns keep their creation order.
+    Task = apps.get_model('kanban_app', 'Task')
+    tasks = Task.objects.using(schema_editor.connection.alias)
+    columns = tasks.order_by().values_list('board_id', 'status').distinct()
+    for board_id, status in columns.iterator():
+        column = list(tasks.filter(board_id=board_id, status=status).order_by('id'))
+        for task, key in zip(column, spread_keys(len(column))):
+            task.position = key
+        tasks.bulk_update(column, ['position'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth_app', '0001_initial'),
+        ('kanban_app', '0011_board_change_log'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='task',
+            name='task_board_status_idx',
+        ),
+        migrations.AddField(
+            model_name='task',
+            name='position',
+            field=models.CharField(default='', editable=False, max_length=128),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['board', 'status', 'position'], name='task_board_status_pos_idx'),
+        ),
+        migrations.RunPython(populate_positions, migrations.RunPython.noop),
+    ]
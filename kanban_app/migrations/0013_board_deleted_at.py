@@ -0,0 +1,23 @@
+# Generated by Django 5.2.8 on 2026-10-17 06:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth_app', '0002_account_deleted_at'),
+        ('kanban_app', '0012_task_position'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='board',
+            name='deleted_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='board',
+            index=models.Index(condition=models.Q(('deleted_at__isnull', False)), fields=['deleted_at'], name='board_deleted_idx'),
+        ),
+    ]
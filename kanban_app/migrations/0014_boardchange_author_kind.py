@@ -0,0 +1,18 @@
+# Generated by Django 5.2.8 on 2026-10-17 07:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('kanban_app', '0013_board_deleted_at'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='boardchange',
+            name='kind',
+            field=models.CharField(choices=[('board', 'Board'), ('member', 'Member'), ('task', 'Task'), ('comment', 'Comment'), ('author', 'Comment author')], max_length=10),
+        ),
+    ]
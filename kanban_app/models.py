@@ -1,26 +1,253 @@
 """Models for the Kanban application, including boards, tasks, and comments."""
 
+# Standard library imports
+import operator
+from functools import reduce
+
 # Django imports
 from django.db import models
+from django.db.models import Count, F, IntegerField, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
 from auth_app.models import Account
 
 
-class Board(models.Model):
-    """A kanban board owned by an account and shared with members."""
+def count_subquery(queryset, outer_field):
+    """Return a correlated COUNT(*) subquery over `queryset`.
+
+    `outer_field` is the column on `queryset` that references the outer
+    row's primary key. Missing rows count as zero.
+    """
+    counted = (
+        queryset.filter(**{outer_field: OuterRef("pk")})
+        .order_by()
+        .values(outer_field)
+        .annotate(total=Count("pk"))
+        .values("total")
+    )
+    return Coalesce(Subquery(counted, output_field=IntegerField()), 0)
+
+
+class CounterQuerySet(models.QuerySet):
+    """Maintenance of denormalized counter columns.
+
+    Counters are only ever changed with `F()` expressions, so
+    concurrent writers cannot overwrite each other's increments.
+    Subclasses describe how to compute each counter from scratch in
+    `counter_expressions()`, which `recount()` uses to repair drift.
+    """
+
+    def counter_expressions(self):
+        """Return `{counter_field: expression}` computing the true counts."""
+        raise NotImplementedError
+
+    def adjust_counters(self, **deltas):
+        """Add `deltas` to the counters of the matched rows in one UPDATE."""
+        changes = {name: F(name) + delta for name, delta in deltas.items() if delta}
+        if not changes:
+            return 0
+        return self.update(**changes)
+
+    def recount(self):
+        """Recompute drifted counters of the matched rows.
+
+        Returns the number of rows that were out of step and fixed.
+        """
+        expressions = self.counter_expressions()
+        drifted = reduce(
+            operator.or_,
+            [~Q(**{name: F(f"actual_{name}")}) for name in expressions],
+        )
+        pks = list(
+            self.alias(
+                **{f"actual_{name}": value for name, value in expressions.items()}
+            )
+            .filter(drifted)
+            .values_list("pk", flat=True)
+        )
+        if not pks:
+            return 0
+        return self.model.objects.filter(pk__in=pks).update(**expressions)
+
+
+class BoardQuerySet(CounterQuerySet):
+    """Query helpers shared by the board endpoints."""
+
+    def accessible_to(self, account):
+        """Boards owned by `account` or shared with it, without duplicates.
+
+        Membership is resolved in a subquery instead of joining
+        `members`, so no `.distinct()` is needed and later annotations
+        are not multiplied by the membership join.
+        """
+        member_of = Board.members.through.objects.filter(account=account).values(
+            "board_id"
+        )
+        return self.filter(Q(owner=account) | Q(pk__in=member_of))
+
+    def with_detail(self):
+        """Prefetch members and tasks for the board detail payload.
+
+        Members come with their user row and tasks carry their stored
+        `comments_count`, so serializing a board costs a fixed number
+        of queries regardless of its size.
+        """
+        return self.prefetch_related(*self.detail_prefetches())
+
+    @staticmethod
+    def detail_prefetches(tasks=None):
+        """Return the lookups used by `with_detail()`.
+
+        Also usable with `prefetch_related_objects()` on an already
+        loaded board. `tasks` optionally narrows or orders the
+        prefetched tasks.
+        """
+        return [
+            models.Prefetch("members", queryset=Account.objects.select_related("user")),
+            models.Prefetch("tasks", queryset=tasks),
+        ]
+
+    def touch(self):
+        """Bump revision and `updated_at` of the matched boards in one UPDATE.
+
+        Called whenever something shown in a board payload changes, so
+        `(id, revision)` identifies a version of the board's content.
+        """
+        return self.update(revision=F("revision") + 1, updated_at=timezone.now())
+
+    def counter_expressions(self):
+        """COUNT subqueries for the counts shown on board cards."""
+        return {
+            "member_count": count_subquery(Board.members.through.objects, "board"),
+            "ticket_count": count_subquery(Task.objects, "board"),
+            "tasks_to_do_count": count_subquery(
+                Task.objects.filter(status=Task.Status.TODO), "board"
+            ),
+            "tasks_high_prio_count": count_subquery(
+                Task.objects.filter(priority=Task.Priority.HIGH), "board"
+            ),
+        }
+
+    def recount_members(self):
+        """Recompute `member_count` of the matched boards in one UPDATE."""
+        return self.update(
+            member_count=count_subquery(Board.members.through.objects, "board")
+        )
+
+
+class BoardManager(models.Manager.from_queryset(BoardQuerySet)):
+    """Default board manager, leaving out boards awaiting their purge.
+
+    `Board.all_objects` still sees them; see `kanban_app.deletion`.
+    """
+
+    def get_queryset(self):
+        return super().get_queryset().filter(deleted_at__isnull=True)
+
+
+class TaskQuerySet(CounterQuerySet):
+    """Query helpers shared by the task endpoints."""
+
+    def on_live_boards(self):
+        """Tasks whose board is not awaiting deletion."""
+        return self.filter(board__deleted_at__isnull=True)
+
+    def assigned_to(self, account):
+        """Tasks on live boards where `account` is the assignee."""
+        return self.on_live_boards().filter(assignee=account)
+
+    def reviewed_by(self, account):
+        """Tasks on live boards where `account` is the reviewer."""
+        return self.on_live_boards().filter(reviewer=account)
+
+    def counter_expressions(self):
+        """COUNT subquery for the comment count shown on task cards."""
+        return {"comments_count": count_subquery(Comment.objects, "task")}
+
+
+class CounterFieldsMixin:
+    """Keep denormalized counters out of ordinary saves.
+
+    Saving an instance loaded earlier would otherwise write back
+    counts that other requests have changed in the meantime.
+    """
+
+    counter_fields = ()
+
+    def save(self, *args, **kwargs):
+        if not self._state.adding and kwargs.get("update_fields") is None:
+            deferred = self.get_deferred_fields()
+            kwargs["update_fields"] = [
+                field.name
+                for field in self._meta.concrete_fields
+                if not field.primary_key
+                and field.name not in self.counter_fields
+                and field.attname not in deferred
+            ]
+        super().save(*args, **kwargs)
+
+
+class Board(CounterFieldsMixin, models.Model):
+    """A kanban board owned by an account and shared with members.
+
+    The `*_count` columns are denormalized and maintained by
+    `kanban_app.counters`; `manage.py recount_kanban` repairs drift.
+    `revision` and `changes_floor` belong to the change log (see
+    `kanban_app.changes`) and, like the counters, are only written
+    by queryset updates. So is `deleted_at`: deleting a board only sets
+    it, which hides the board from `Board.objects`, and its tasks and
+    comments are purged later in batches (see `kanban_app.deletion`).
+    """
 
     title = models.CharField(max_length=30)
     owner = models.ForeignKey(
         Account, on_delete=models.CASCADE, related_name="boards_owned"
     )
     members = models.ManyToManyField(Account, related_name="boards_member_of")
+    revision = models.PositiveBigIntegerField(default=0)
+    changes_floor = models.PositiveBigIntegerField(default=0, editable=False)
+    updated_at = models.DateTimeField(auto_now=True)
+    member_count = models.IntegerField(default=0, editable=False)
+    ticket_count = models.IntegerField(default=0, editable=False)
+    tasks_to_do_count = models.IntegerField(default=0, editable=False)
+    tasks_high_prio_count = models.IntegerField(default=0, editable=False)
+    deleted_at = models.DateTimeField(null=True, blank=True, editable=False)
+
+    objects = BoardManager()
+    all_objects = BoardQuerySet.as_manager()
+
+    counter_fields = (
+        "member_count",
+        "ticket_count",
+        "tasks_to_do_count",
+        "tasks_high_prio_count",
+        "revision",
+        "changes_floor",
+        "deleted_at",
+    )
+
+    class Meta:
+        indexes = [
+            # The purge finds the few boards awaiting deletion.
+            models.Index(
+                fields=["deleted_at"],
+                condition=Q(deleted_at__isnull=False),
+                name="board_deleted_idx",
+            ),
+        ]
 
     def __str__(self):
         """Return the board title for readable representation."""
         return self.title
 
 
-class Task(models.Model):
-    """A task item belonging to a board with workflow attributes."""
+class Task(CounterFieldsMixin, models.Model):
+    """A task item belonging to a board with workflow attributes.
+
+    `comments_count` is denormalized like the board counters.
+    `position` orders the task within its status column.
+    """
 
     class Status(models.TextChoices):
         TODO = "to-do", "To-do"
@@ -56,6 +283,45 @@ class Task(models.Model):
         related_name="tasks_reviewer_of",
     )
     due_date = models.DateField(null=True, blank=True)
+    position = models.CharField(max_length=128, default="", editable=False)
+    comments_count = models.IntegerField(default=0, editable=False)
+
+    objects = TaskQuerySet.as_manager()
+
+    counter_fields = ("comments_count",)
+
+    class Meta:
+        indexes = [
+            # Board card counts filter tasks by board and status/priority;
+            # columns are ordered by position (see `kanban_app.positions`).
+            models.Index(
+                fields=["board", "status", "position"], name="task_board_status_pos_idx"
+            ),
+            models.Index(fields=["board", "priority"], name="task_board_priority_idx"),
+            # Assigned/reviewing lists are keyset-paginated on (due_date, id).
+            models.Index(
+                fields=["assignee", "due_date", "id"], name="task_assignee_due_idx"
+            ),
+            models.Index(
+                fields=["reviewer", "due_date", "id"], name="task_reviewer_due_idx"
+            ),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """Remember what the loaded task contributes to its board's counters."""
+        instance = super().from_db(db, field_names, values)
+        if {"board_id", "status", "priority"}.issubset(field_names):
+            instance._counted = instance.counted_state()
+        return instance
+
+    def counted_state(self):
+        """Return `(board_id, counts)` this task adds to its board's counters."""
+        return self.board_id, {
+            "ticket_count": 1,
+            "tasks_to_do_count": int(self.status == self.Status.TODO),
+            "tasks_high_prio_count": int(self.priority == self.Priority.HIGH),
+        }
 
     def __str__(self):
         """Return the task title for readable representation."""
@@ -69,9 +335,87 @@ class Comment(models.Model):
         Account, on_delete=models.CASCADE, related_name="comments"
     )
     content = models.CharField(max_length=255)
-    created_at = models.DateTimeField(auto_now_add=True)
+    created_at = models.DateTimeField(default=timezone.now, editable=False)
     task = models.ForeignKey(Task, on_delete=models.CASCADE, related_name="comments")
 
+    class Meta:
+        indexes = [
+            # Comment lists are keyset-paginated on (created_at, id) per task.
+            models.Index(
+                fields=["task", "created_at", "id"], name="comment_task_created_idx"
+            ),
+        ]
+
     def __str__(self):
         """Return the comment content for readable representation."""
         return self.content
+
+
+class SearchDocument(models.Model):
+    """Searchable text of a task (title and description) or of a comment.
+
+    Rows are kept in sync by signal handlers and indexed by a
+    vendor-specific full-text index; see `kanban_app.search`.
+    """
+
+    board = models.ForeignKey(Board, on_delete=models.CASCADE, related_name="+")
+    task = models.ForeignKey(Task, on_delete=models.CASCADE, related_name="+")
+    comment = models.ForeignKey(
+        Comment, on_delete=models.CASCADE, null=True, blank=True, related_name="+"
+    )
+    content = models.TextField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["task"],
+                condition=Q(comment__isnull=True),
+                name="searchdocument_one_per_task",
+            ),
+        ]
+
+    def __str__(self):
+        """Return the indexed text for readable representation."""
+        return self.content
+
+
+class BoardChange(models.Model):
+    """The latest change to one object shown in a board's payload.
+
+    There is one row per board and object: recording another change of
+    the same object moves its row to the new revision, so the log never
+    holds more rows than objects changed within the retention window.
+    Whether the object was saved or deleted is read from the current
+    data when the changes are fetched. An `author` row stands for a
+    renamed account's comments on the board, keyed by the account.
+    """
+
+    class Kind(models.TextChoices):
+        BOARD = "board", "Board"
+        MEMBER = "member", "Member"
+        TASK = "task", "Task"
+        COMMENT = "comment", "Comment"
+        AUTHOR = "author", "Comment author"
+
+    board = models.ForeignKey(Board, on_delete=models.CASCADE, related_name="+")
+    kind = models.CharField(max_length=10, choices=Kind.choices)
+    object_id = models.BigIntegerField()
+    revision = models.PositiveBigIntegerField()
+    changed_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["board", "kind", "object_id"], name="boardchange_one_per_object"
+            ),
+        ]
+        indexes = [
+            # Delta sync reads a board's changes after a revision.
+            models.Index(fields=["board", "revision"], name="boardchange_revision_idx"),
+            # Compaction drops rows by age.
+            models.Index(fields=["changed_at"], name="boardchange_changed_at_idx"),
+        ]
+
+    def __str__(self):
+        """Return the changed object and revision for readable representation."""
+        return f"{self.kind} {self.object_id} @ r{self.revision}"
@@ -0,0 +1,231 @@
+"""Fractional-index ordering of tasks within their status column.
+
+`Task.position` is a string key; a column is ordered by `(position,
+id)`. A key can always be generated between any two others, so moving
+a task rewrites only that task's row instead of renumbering the column.
+
+Keys are base-36 strings over `0-9a-z` with no trailing `0`. Their
+byte order is the same under every common database collation. A key
+between two neighbours gets longer the more often one spot is
+reused. Keys longer than `REBALANCE_LENGTH` therefore schedule a
+background rebalance of their column (a job, see `jobs_app.jobs`),
+which rewrites it with short, evenly spaced keys.
+"""
+
+# Standard library imports
+from collections import defaultdict
+
+# Django imports
+from django.db import transaction
+
+# Local imports
+from jobs_app.jobs import enqueue, job
+from kanban_app.changes import record_task_changes
+from kanban_app.models import Task
+
+DIGITS = "0123456789abcdefghijklmnopqrstuvwxyz"
+BASE = len(DIGITS)
+REBALANCE_LENGTH = 16
+MAX_LENGTH = Task._meta.get_field("position").max_length
+
+
+def key_between(lower, upper):
+    """Return a key sorting strictly between `lower` and `upper`.
+
+    Either bound may be None for the start or end of the column.
+    """
+    if lower is not None and upper is not None and lower >= upper:
+        raise ValueError(f"{lower!r} is not below {upper!r}")
+    if upper is None:
+        return key_after(lower or "")
+    if lower is None:
+        return key_before(upper)
+    return midpoint(lower, upper)
+
+
+def key_after(key):
+    """Return a short key above `key`: bump its first digit below `z`."""
+    for index, digit in enumerate(key):
+        if digit != DIGITS[-1]:
+            return key[:index] + DIGITS[DIGITS.index(digit) + 1]
+    return key + DIGITS[1]
+
+
+def key_before(key):
+    """Return a short key below `key`, which must not be empty."""
+    digit = DIGITS.index(key[0])
+    if digit > 1:
+        return DIGITS[digit - 1]
+    if digit == 1:
+        return DIGITS[0] + DIGITS[-1]
+    return DIGITS[0] + key_before(key[1:])
+
+
+def midpoint(lower, upper):
+    """Return a key between `lower` and `upper` (None for no upper bound).
+
+    `lower` may be empty, standing for the smallest possible key.
+    """
+    if upper is not None:
+        # Keep the common prefix; a shorter `lower` is padded with zeros.
+        common = 0
+        while common < len(upper) and (
+            (lower[common] if common < len(lower) else DIGITS[0]) == upper[common]
+        ):
+            common += 1
+        if common:
+            return upper[:common] + midpoint(lower[common:], upper[common:])
+
+    low = DIGITS.index(lower[0]) if lower else 0
+    high = DIGITS.index(upper[0]) if upper is not None else BASE
+    if high - low > 1:
+        return DIGITS[(low + high) // 2]
+    if upper is not None and len(upper) > 1:
+        return upper[:1]
+    return DIGITS[low] + midpoint(lower[1:], None)
+
+
+def spread_keys(count):
+    """Return `count` ascending keys spaced evenly over the key space."""
+    width = 1
+    while BASE**width < (count + 1) * BASE:
+        width += 1
+    step = BASE**width // (count + 1)
+    return [encode(step * (index + 1), width) for index in range(count)]
+
+
+def keys_after(key, count):
+    """Return `count` ascending keys above `key`, evenly spaced.
+
+    Chaining `key_after()` adds a digit about every 35 keys. These keys
+    instead share one width and take only the first `BASE`-th of the
+    space above `key`, so the next batch appended after them is not
+    left with a sliver of it.
+    """
+    width = max(len(key), 1)
+    while True:
+        lower = decode(key, width)
+        room = (BASE**width - lower) // BASE
+        if room > count:
+            break
+        width += 1
+    step = room // (count + 1)
+    return [encode(lower + step * (index + 1), width) for index in range(count)]
+
+
+def decode(key, width):
+    value = 0
+    for digit in key.ljust(width, DIGITS[0]):
+        value = value * BASE + DIGITS.index(digit)
+    return value
+
+
+def encode(value, width):
+    digits = []
+    for _ in range(width):
+        value, digit = divmod(value, BASE)
+        digits.append(DIGITS[digit])
+    return "".join(reversed(digits)).rstrip(DIGITS[0])
+
+
+def column(board_id, status):
+    return Task.objects.filter(board_id=board_id, status=status)
+
+
+def neighbours(task, status, after=None, before=None):
+    """Return the keys `task` has to go between to land in `status`.
+
+    `after`/`before` name the task it should follow or precede; with
+    neither it goes to the end of the column. Raises `Task.DoesNotExist`
+    if the named task is not in that column.
+    """
+    tasks = column(task.board_id, status).exclude(pk=task.pk)
+    keys = tasks.values_list("position", flat=True)
+    if after is not None:
+        lower = keys.get(pk=after)
+        upper = keys.filter(position__gt=lower).order_by("position").first()
+    elif before is not None:
+        upper = keys.get(pk=before)
+        lower = keys.filter(position__lt=upper).order_by("-position").first()
+    else:
+        lower = keys.order_by("-position").first()
+        upper = None
+    return lower, upper
+
+
+def move_position(task, status, after=None, before=None):
+    """Return the new key of `task` in `status`, next to `after`/`before`.
+
+    If the key would not fit the column, the column is rebalanced
+    first, which is rare enough to do inline.
+    """
+    position = key_between(*neighbours(task, status, after, before))
+    if len(position) > MAX_LENGTH:
+        rebalance_column(task.board_id, status)
+        position = key_between(*neighbours(task, status, after, before))
+    return position
+
+
+def assign_positions(tasks):
+    """Give `tasks` keys at the end of their columns, in list order.
+
+    Used for new tasks and for tasks changing status. Single creates go
+    through this from a `pre_save` handler; bulk creates, which send no
+    signals, call it themselves. Several tasks for one column get evenly
+    spaced keys; if those would not fit, the column is rebalanced first.
+    """
+    by_column = defaultdict(list)
+    for task in tasks:
+        by_column[task.board_id, task.status].append(task)
+    for (board_id, status), column_tasks in by_column.items():
+        keys = end_keys(board_id, status, len(column_tasks))
+        if max(map(len, keys)) > MAX_LENGTH:
+            rebalance_column(board_id, status)
+            keys = end_keys(board_id, status, len(column_tasks))
+        for task, key in zip(column_tasks, keys):
+            task.position = key
+        schedule_rebalance(board_id, status, max(keys, key=len))
+
+
+def end_keys(board_id, status, count):
+    """Return `count` keys for appending to the end of a column."""
+    last = (
+        column(board_id, status)
+        .order_by("-position")
+        .values_list("position", flat=True)
+        .first()
+    )
+    if count == 1:
+        return [key_after(last or "")]
+    return keys_after(last or "", count)
+
+
+def schedule_rebalance(board_id, status, key):
+    """Rebalance the column in the background once `key` got too long."""
+    if len(key) > REBALANCE_LENGTH:
+        enqueue(rebalance_column, board_id, status)
+
+
+@job
+def rebalance_column(board_id, status):
+    """Rewrite the keys of one column evenly spaced, keeping its order.
+
+    Only rows whose key changes are written; the rewritten tasks are
+    recorded in the board's change log so delta clients get the new
+    keys. Returns the number of tasks rewritten.
+    """
+    with transaction.atomic():
+        rows = list(
+            column(board_id, status)
+            .select_for_update()
+            .order_by("position", "id")
+            .values_list("pk", "position")
+        )
+        changed = [
+            Task(pk=pk, board_id=board_id, position=key)
+            for (pk, position), key in zip(rows, spread_keys(len(rows)))
+            if position != key
+        ]
+        Task.objects.bulk_update(changed, ["position"], batch_size=500)
+        record_task_changes(changed)
+    return len(changed)
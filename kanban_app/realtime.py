@@ -0,0 +1,187 @@
+"""In-process publish/subscribe for realtime board events.
+
+Model signal handlers publish task, comment and membership changes on a
+per-board channel once the surrounding transaction commits. The
+Server-Sent Events endpoint in `kanban_app.api.streams` subscribes to
+a board's channel and forwards each event to the client.
+
+The broker is pluggable through the `KANMIND_REALTIME_BROKER` setting,
+which holds the dotted path of a `Broker` subclass. `LocalBroker`
+delivers events within the current process only, which is enough for
+a single ASGI worker and for tests. Deployments with several workers
+need a broker backed by a shared transport that implements the same
+interface.
+"""
+
+# Standard library imports
+import asyncio
+import json
+import threading
+from collections import defaultdict
+
+# Django imports
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.utils.module_loading import import_string
+
+
+class Broker:
+    """Interface for realtime brokers.
+
+    `publish()` may be called from any thread. `subscribe()` is called
+    from a running event loop and returns a `Subscription`.
+    """
+
+    def publish(self, channel, message):
+        raise NotImplementedError
+
+    def subscribe(self, channel):
+        raise NotImplementedError
+
+
+class Subscription:
+    """Async stream of messages for one subscriber of one channel."""
+
+    async def get(self, timeout=None):
+        """Return the next message, or None if `timeout` seconds pass first."""
+        raise NotImplementedError
+
+    def close(self):
+        """Stop receiving messages."""
+        raise NotImplementedError
+
+
+class LocalSubscription(Subscription):
+    """Queue bound to the subscriber's event loop.
+
+    Messages are handed over with `call_soon_threadsafe`, so publishers
+    on worker threads never touch the queue directly. If a slow client
+    lets the queue fill up, the backlog is replaced by a single
+    `resync` event telling the client to reload the board.
+    """
+
+    def __init__(self, broker, channel, max_pending):
+        self.broker = broker
+        self.channel = channel
+        self.loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue(maxsize=max_pending)
+
+    def deliver(self, message):
+        self.loop.call_soon_threadsafe(self._put, message)
+
+    def _put(self, message):
+        if self.queue.full():
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            message = {"type": "resync"}
+        self.queue.put_nowait(message)
+
+    async def get(self, timeout=None):
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    def close(self):
+        self.broker.unsubscribe(self)
+
+
+class LocalBroker(Broker):
+    """Broker delivering messages to subscribers in the same process."""
+
+    max_pending = 1000
+
+    def __init__(self):
+        self._subscribers = defaultdict(set)
+        self._lock = threading.Lock()
+
+    def publish(self, channel, message):
+        with self._lock:
+            subscribers = list(self._subscribers.get(channel, ()))
+        for subscription in subscribers:
+            try:
+                subscription.deliver(message)
+            except RuntimeError:
+                # The subscriber's event loop is already closed.
+                self.unsubscribe(subscription)
+
+    def subscribe(self, channel):
+        subscription = LocalSubscription(self, channel, self.max_pending)
+        with self._lock:
+            self._subscribers[channel].add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            subscribers = self._subscribers.get(subscription.channel)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._subscribers[subscription.channel]
+
+
+_broker = None
+_broker_lock = threading.Lock()
+
+
+def get_broker():
+    """Return the process-wide broker configured by `KANMIND_REALTIME_BROKER`."""
+    global _broker
+    if _broker is None:
+        with _broker_lock:
+            if _broker is None:
+                path = getattr(
+                    settings,
+                    "KANMIND_REALTIME_BROKER",
+                    "kanban_app.realtime.LocalBroker",
+                )
+                _broker = import_string(path)()
+    return _broker
+
+
+def board_channel(board_id):
+    return f"board:{board_id}"
+
+
+def publish_board_event(board_id, event_type, data):
+    """Publish an event for `board_id` after the current transaction commits.
+
+    `data` is encoded to JSON right away, so later changes to model
+    instances cannot leak into the event.
+    """
+    message = {
+        "type": event_type,
+        "board": board_id,
+        "data": json.loads(json.dumps(data, cls=DjangoJSONEncoder)),
+    }
+    transaction.on_commit(
+        lambda: get_broker().publish(board_channel(board_id), message)
+    )
+
+
+def task_event_data(task):
+    """Return the task fields shown on board cards, without extra queries."""
+    return {
+        "id": task.pk,
+        "title": task.title,
+        "description": task.description,
+        "status": task.status,
+        "priority": task.priority,
+        "created_by": task.created_by_id,
+        "assignee": task.assignee_id,
+        "reviewer": task.reviewer_id,
+        "due_date": task.due_date,
+        "position": task.position,
+    }
+
+
+def comment_event_data(comment):
+    """Return the comment fields needed to update an open task view."""
+    return {
+        "id": comment.pk,
+        "task": comment.task_id,
+        "author": comment.author_id,
+        "content": comment.content,
+        "created_at": comment.created_at,
+    }
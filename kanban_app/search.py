@@ -0,0 +1,225 @@
+"""Full-text search over task titles, descriptions and comments.
+
+Every task and every comment has one `SearchDocument` row holding its
+text and board id. Signal handlers in `kanban_app.signals` and the
+bulk task endpoints keep these rows in step with the data; cascading
+deletes remove them together with their task, comment or board.
+
+The documents are indexed according to the database vendor:
+
+- SQLite: an FTS5 external-content table kept in sync by triggers.
+  The board id is an indexed FTS column, so the board restriction is
+  part of the `MATCH` and ranking uses BM25 over the text only.
+- PostgreSQL: a GIN index on `to_tsvector('english', content)`,
+  ranked with `ts_rank`.
+- Other vendors: unindexed `icontains` matching in id order.
+
+`install_index()` creates the vendor index; it runs from the
+migration and from `manage.py rebuild_kanban_search`. On SQLite,
+Django rebuilds a table to alter it, which drops its triggers, so run
+the rebuild command after any migration that alters `SearchDocument`.
+
+A task matches when its title/description or one of its comments
+contains every search term; the last term also matches as a prefix.
+"""
+
+# Standard library imports
+import re
+
+# Django imports
+from django.db import connections, router
+
+# Local imports
+from kanban_app.models import SearchDocument
+
+TERM_RE = re.compile(r"\w+")
+MAX_TERMS = 10
+TS_CONFIG = "english"
+
+DOCUMENT_TABLE = SearchDocument._meta.db_table
+FTS_TABLE = f"{DOCUMENT_TABLE}_fts"
+
+SQLITE_INSTALL = [
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+    f"board_id, content, content='{DOCUMENT_TABLE}', content_rowid='id')",
+    # Rank by BM25 over `content` only; `board_id` is just a filter.
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rank) VALUES ('rank', 'bm25(0.0, 1.0)')",
+    f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON {DOCUMENT_TABLE} "
+    f"BEGIN INSERT INTO {FTS_TABLE}(rowid, board_id, content) "
+    f"VALUES (new.id, new.board_id, new.content); END",
+    f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON {DOCUMENT_TABLE} "
+    f"BEGIN INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, board_id, content) "
+    f"VALUES ('delete', old.id, old.board_id, old.content); END",
+    f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au AFTER UPDATE ON {DOCUMENT_TABLE} "
+    f"BEGIN INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, board_id, content) "
+    f"VALUES ('delete', old.id, old.board_id, old.content); "
+    f"INSERT INTO {FTS_TABLE}(rowid, board_id, content) "
+    f"VALUES (new.id, new.board_id, new.content); END",
+]
+SQLITE_UNINSTALL = [
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_ai",
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_ad",
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_au",
+    f"DROP TABLE IF EXISTS {FTS_TABLE}",
+]
+POSTGRES_INSTALL = [
+    f"CREATE INDEX IF NOT EXISTS {DOCUMENT_TABLE}_content_gin ON {DOCUMENT_TABLE} "
+    f"USING GIN (to_tsvector('{TS_CONFIG}', content))",
+]
+POSTGRES_UNINSTALL = [f"DROP INDEX IF EXISTS {DOCUMENT_TABLE}_content_gin"]
+
+
+def install_index(connection):
+    """Create the full-text index for `connection`'s vendor, if any."""
+    statements = {"sqlite": SQLITE_INSTALL, "postgresql": POSTGRES_INSTALL}
+    with connection.cursor() as cursor:
+        for statement in statements.get(connection.vendor, []):
+            cursor.execute(statement)
+
+
+def uninstall_index(connection):
+    """Drop the full-text index created by `install_index()`."""
+    statements = {"sqlite": SQLITE_UNINSTALL, "postgresql": POSTGRES_UNINSTALL}
+    with connection.cursor() as cursor:
+        for statement in statements.get(connection.vendor, []):
+            cursor.execute(statement)
+
+
+def refresh_index(connection):
+    """Rebuild the index from the document table where that is separate."""
+    if connection.vendor == "sqlite":
+        with connection.cursor() as cursor:
+            cursor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+
+
+def parse_terms(query):
+    """Split a user query into at most `MAX_TERMS` lowercase word terms."""
+    return TERM_RE.findall(query.lower())[:MAX_TERMS]
+
+
+def task_document(task):
+    return SearchDocument(
+        board_id=task.board_id,
+        task_id=task.pk,
+        content="\n".join(filter(None, [task.title, task.description])),
+    )
+
+
+def comment_document(comment, board_id):
+    return SearchDocument(
+        board_id=board_id,
+        task_id=comment.task_id,
+        comment_id=comment.pk,
+        content=comment.content,
+    )
+
+
+def index_tasks(tasks, created=False):
+    """Write the title/description documents of `tasks`."""
+    documents = [task_document(task) for task in tasks]
+    if not created:
+        SearchDocument.objects.filter(
+            task__in=[task.pk for task in tasks], comment=None
+        ).delete()
+    SearchDocument.objects.bulk_create(documents)
+
+
+def index_comment(comment, board_id, created=False):
+    """Write the document of one comment."""
+    if created:
+        comment_document(comment, board_id).save()
+    else:
+        SearchDocument.objects.filter(comment=comment).update(content=comment.content)
+
+
+class BoardSearchResults:
+    """Lazily evaluated, ranked ids of the tasks of a board matching `terms`.
+
+    Supports `count()` and slicing, so Django's `Paginator` (and the
+    DRF page-number paginators built on it) can page through results
+    without fetching them all.
+    """
+
+    def __init__(self, board_id, terms):
+        self.board_id = board_id
+        self.terms = terms
+        self.connection = connections[router.db_for_read(SearchDocument)]
+
+    def count(self):
+        if self.connection.vendor == "sqlite":
+            sql = (
+                f"SELECT COUNT(DISTINCT d.task_id) FROM {FTS_TABLE} "
+                f"JOIN {DOCUMENT_TABLE} d ON d.id = {FTS_TABLE}.rowid "
+                f"WHERE {FTS_TABLE} MATCH %s"
+            )
+            return self._fetch(sql, [self._fts_query()])[0][0]
+        if self.connection.vendor == "postgresql":
+            sql = (
+                f"SELECT COUNT(DISTINCT task_id) FROM {DOCUMENT_TABLE} "
+                f"WHERE board_id = %s AND to_tsvector('{TS_CONFIG}', content) "
+                f"@@ to_tsquery('{TS_CONFIG}', %s)"
+            )
+            return self._fetch(sql, [self.board_id, self._ts_query()])[0][0]
+        return self._fallback().count()
+
+    def __len__(self):
+        return self.count()
+
+    def __getitem__(self, index):
+        if not isinstance(index, slice):
+            return self[index : index + 1][0]
+        start = index.start or 0
+        limit = index.stop - start if index.stop is not None else -1
+        return self.page(start, limit)
+
+    def page(self, offset, limit):
+        """Return up to `limit` task ids, best match first, after `offset`."""
+        if self.connection.vendor == "sqlite":
+            sql = (
+                f"SELECT d.task_id, MIN({FTS_TABLE}.rank) AS score FROM {FTS_TABLE} "
+                f"JOIN {DOCUMENT_TABLE} d ON d.id = {FTS_TABLE}.rowid "
+                f"WHERE {FTS_TABLE} MATCH %s "
+                f"GROUP BY d.task_id ORDER BY score, d.task_id LIMIT %s OFFSET %s"
+            )
+            rows = self._fetch(sql, [self._fts_query(), limit, offset])
+        elif self.connection.vendor == "postgresql":
+            sql = (
+                f"SELECT task_id, MAX(ts_rank(to_tsvector('{TS_CONFIG}', content), "
+                f"query)) AS score FROM {DOCUMENT_TABLE}, "
+                f"to_tsquery('{TS_CONFIG}', %s) query WHERE board_id = %s "
+                f"AND to_tsvector('{TS_CONFIG}', content) @@ query "
+                f"GROUP BY task_id ORDER BY score DESC, task_id "
+                f"LIMIT %s OFFSET %s"
+            )
+            limit = None if limit < 0 else limit
+            rows = self._fetch(sql, [self._ts_query(), self.board_id, limit, offset])
+        else:
+            ids = self._fallback().order_by("task_id").values_list("task_id", flat=True)
+            stop = None if limit < 0 else offset + limit
+            return list(ids[offset:stop])
+        return [row[0] for row in rows]
+
+    def _fts_query(self):
+        """Build an FTS5 query restricted to the board; terms are quoted."""
+        phrases = [f'"{term}"' for term in self.terms]
+        phrases[-1] += "*"
+        return f'board_id:"{self.board_id}" AND content:({" ".join(phrases)})'
+
+    def _ts_query(self):
+        """Build a `to_tsquery` expression; terms only contain word characters."""
+        terms = list(self.terms)
+        terms[-1] += ":*"
+        return " & ".join(terms)
+
+    def _fallback(self):
+        documents = SearchDocument.objects.using(self.connection.alias).filter(
+            board_id=self.board_id
+        )
+        for term in self.terms:
+            documents = documents.filter(content__icontains=term)
+        return documents.values("task_id").distinct()
+
+    def _fetch(self, sql, params):
+        with self.connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            return cursor.fetchall()
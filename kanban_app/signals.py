@@ -0,0 +1,332 @@
+"""Signal handlers keeping Kanban caches, counters and search in sync."""
+
+# Standard library imports
+from collections import defaultdict
+
+# Django imports
+from django.contrib.auth.models import User
+from django.db.models import QuerySet
+from django.db.models.signals import (
+    m2m_changed,
+    post_delete,
+    post_save,
+    pre_delete,
+    pre_save,
+)
+from django.dispatch import receiver
+
+# Local imports
+from auth_app.models import Account
+from kanban_app.api.response_cache import board_payload_cache
+from kanban_app.changes import record_changes
+from kanban_app.counters import (
+    adjust_comments_count,
+    record_tasks_deleted,
+    record_tasks_saved,
+    recount_members,
+)
+from kanban_app.membership import invalidate_accounts
+from kanban_app.models import Board, BoardChange, Comment, Task
+from kanban_app.positions import assign_positions
+from kanban_app.realtime import (
+    comment_event_data,
+    publish_board_event,
+    task_event_data,
+)
+from kanban_app.search import index_comment, index_tasks
+
+
+def deleted_via(origin, *models):
+    """Return True if a delete cascaded from deleting one of `models`.
+
+    `origin` is the instance or queryset whose `delete()` started the
+    collection; handlers use it to leave the bookkeeping to the parent.
+    """
+    model = origin.model if isinstance(origin, QuerySet) else type(origin)
+    return model in models
+
+
+@receiver(m2m_changed, sender=Board.members.through)
+def board_members_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    """Invalidate cached board ids of accounts whose membership changed."""
+    if action == "pre_clear" and not reverse:
+        # `pk_set` is empty on clear, so remember who is about to be removed.
+        instance._cleared_member_ids = list(
+            instance.members.values_list("id", flat=True)
+        )
+        return
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+
+    if reverse:
+        invalidate_accounts([instance.pk])
+    elif action == "post_clear":
+        invalidate_accounts(getattr(instance, "_cleared_member_ids", []))
+    else:
+        invalidate_accounts(pk_set or [])
+
+
+@receiver(post_save, sender=Board)
+def board_saved(sender, instance, created, **kwargs):
+    """A new board becomes accessible to its owner."""
+    if created:
+        invalidate_accounts([instance.owner_id])
+
+
+@receiver(pre_delete, sender=Board)
+def board_deleting(sender, instance, **kwargs):
+    """Remember everyone with access before the membership rows cascade."""
+    instance._affected_account_ids = [
+        instance.owner_id,
+        *instance.members.values_list("id", flat=True),
+    ]
+
+
+@receiver(post_delete, sender=Board)
+def board_deleted(sender, instance, **kwargs):
+    """Deleted boards are no longer accessible to their owner or members."""
+    invalidate_accounts(getattr(instance, "_affected_account_ids", [instance.owner_id]))
+
+
+# Board revisions: log every change to board payload content in the change
+# log, which bumps `Board.revision` (see `kanban_app.changes`). Where the
+# board id is at hand, its cached payloads are evicted as well.
+
+
+@receiver(post_save, sender=Board)
+def board_revision_on_save(sender, instance, created, **kwargs):
+    if not created:
+        record_changes(instance.pk, [(BoardChange.Kind.BOARD, instance.pk)])
+        board_payload_cache.evict(instance.pk)
+
+
+@receiver(post_delete, sender=Board)
+def board_payload_on_delete(sender, instance, **kwargs):
+    board_payload_cache.evict(instance.pk)
+
+
+@receiver(m2m_changed, sender=Board.members.through)
+def board_revision_on_members(sender, instance, action, reverse, pk_set, **kwargs):
+    if reverse and action == "pre_clear":
+        instance._cleared_board_ids = list(
+            instance.boards_member_of.values_list("id", flat=True)
+        )
+        return
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+
+    if not reverse:
+        if action == "post_clear":
+            pk_set = getattr(instance, "_cleared_member_ids", [])
+        record_changes(
+            instance.pk, [(BoardChange.Kind.MEMBER, pk) for pk in pk_set or []]
+        )
+        board_payload_cache.evict(instance.pk)
+        return
+
+    if action == "post_clear":
+        pk_set = getattr(instance, "_cleared_board_ids", [])
+    for board_id in pk_set or []:
+        record_changes(board_id, [(BoardChange.Kind.MEMBER, instance.pk)])
+
+
+@receiver(post_save, sender=Task)
+@receiver(post_delete, sender=Task)
+def board_revision_on_task(sender, instance, origin=None, **kwargs):
+    if deleted_via(origin, Board):
+        return
+    record_changes(instance.board_id, [(BoardChange.Kind.TASK, instance.pk)])
+    board_payload_cache.evict(instance.board_id)
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def board_revision_on_comment(sender, instance, origin=None, **kwargs):
+    if deleted_via(origin, Board, Task):
+        return
+    board_id = comment_board_id(instance)
+    if board_id is not None:
+        record_changes(
+            board_id,
+            [
+                (BoardChange.Kind.COMMENT, instance.pk),
+                (BoardChange.Kind.TASK, instance.task_id),
+            ],
+        )
+
+
+@receiver(post_save, sender=Account)
+def board_revision_on_account(sender, instance, created, **kwargs):
+    """Member and comment author names are part of board payloads.
+
+    Boards the account owns get a board change, so their validators
+    change even where it is neither a member nor an author. Boards it
+    commented on get one author change, however many comments it wrote.
+    """
+    if created:
+        return
+    changes = defaultdict(list)
+    for board_id in instance.boards_member_of.values_list("id", flat=True):
+        changes[board_id].append((BoardChange.Kind.MEMBER, instance.pk))
+    for board_id in instance.boards_owned.values_list("id", flat=True):
+        changes[board_id].append((BoardChange.Kind.BOARD, board_id))
+    commented = instance.comments.values_list("task__board_id", flat=True)
+    for board_id in commented.order_by().distinct():
+        changes[board_id].append((BoardChange.Kind.AUTHOR, instance.pk))
+    for board_id, board_changes in changes.items():
+        record_changes(board_id, board_changes)
+
+
+@receiver(post_save, sender=User)
+def board_revision_on_user(sender, instance, created, **kwargs):
+    """Member emails are part of the board payload."""
+    if not created:
+        memberships = Board.members.through.objects.filter(account__user=instance)
+        for board_id, account_id in memberships.values_list("board_id", "account_id"):
+            record_changes(board_id, [(BoardChange.Kind.MEMBER, account_id)])
+
+
+# Counters: keep the denormalized board and task counts in step.
+
+
+@receiver(m2m_changed, sender=Board.members.through)
+def counters_on_members(sender, instance, action, reverse, pk_set, **kwargs):
+    """Recount, as `pk_set` on remove may include accounts that were not members."""
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+    if not reverse:
+        recount_members([instance.pk])
+    elif action == "post_clear":
+        recount_members(getattr(instance, "_cleared_board_ids", []))
+    else:
+        recount_members(pk_set)
+
+
+@receiver(pre_delete, sender=Account)
+def counters_account_deleting(sender, instance, **kwargs):
+    """Membership rows of a deleted account go without m2m signals."""
+    instance._member_board_ids = list(
+        instance.boards_member_of.values_list("id", flat=True)
+    )
+
+
+@receiver(post_delete, sender=Account)
+def counters_account_deleted(sender, instance, **kwargs):
+    recount_members(getattr(instance, "_member_board_ids", []))
+
+
+@receiver(post_save, sender=Task)
+def counters_on_task_saved(sender, instance, created, **kwargs):
+    record_tasks_saved([instance], created=created)
+
+
+@receiver(post_delete, sender=Task)
+def counters_on_task_deleted(sender, instance, origin=None, **kwargs):
+    if deleted_via(origin, Board):
+        return
+    record_tasks_deleted([instance])
+
+
+@receiver(post_save, sender=Comment)
+def counters_on_comment_saved(sender, instance, created, **kwargs):
+    if created:
+        adjust_comments_count(instance.task_id, 1)
+
+
+@receiver(post_delete, sender=Comment)
+def counters_on_comment_deleted(sender, instance, origin=None, **kwargs):
+    if deleted_via(origin, Board, Task):
+        return
+    adjust_comments_count(instance.task_id, -1)
+
+
+# Realtime events: publish changes to subscribers of the board's channel.
+
+
+@receiver(post_delete, sender=Board)
+def realtime_board_deleted(sender, instance, **kwargs):
+    publish_board_event(instance.pk, "board.deleted", {"id": instance.pk})
+
+
+@receiver(m2m_changed, sender=Board.members.through)
+def realtime_members_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+    event_type = "members.added" if action == "post_add" else "members.removed"
+
+    if not reverse:
+        if action == "post_clear":
+            pk_set = getattr(instance, "_cleared_member_ids", [])
+        publish_board_event(instance.pk, event_type, {"accounts": sorted(pk_set)})
+        return
+
+    if action == "post_clear":
+        pk_set = getattr(instance, "_cleared_board_ids", [])
+    for board_id in pk_set:
+        publish_board_event(board_id, event_type, {"accounts": [instance.pk]})
+
+
+@receiver(post_save, sender=Task)
+def realtime_task_saved(sender, instance, **kwargs):
+    publish_board_event(instance.board_id, "task.saved", task_event_data(instance))
+
+
+@receiver(post_delete, sender=Task)
+def realtime_task_deleted(sender, instance, origin=None, **kwargs):
+    if deleted_via(origin, Board):
+        return
+    publish_board_event(instance.board_id, "task.deleted", {"id": instance.pk})
+
+
+def comment_board_id(comment):
+    """Return the board id of a comment's task, looked up once per instance."""
+    if not hasattr(comment, "_board_id"):
+        comment._board_id = (
+            Task.objects.filter(pk=comment.task_id)
+            .values_list("board_id", flat=True)
+            .first()
+        )
+    return comment._board_id
+
+
+@receiver(post_save, sender=Comment)
+def realtime_comment_saved(sender, instance, **kwargs):
+    board_id = comment_board_id(instance)
+    if board_id is not None:
+        publish_board_event(board_id, "comment.saved", comment_event_data(instance))
+
+
+@receiver(post_delete, sender=Comment)
+def realtime_comment_deleted(sender, instance, origin=None, **kwargs):
+    if deleted_via(origin, Board, Task):
+        return
+    board_id = comment_board_id(instance)
+    if board_id is not None:
+        publish_board_event(
+            board_id, "comment.deleted", {"id": instance.pk, "task": instance.task_id}
+        )
+
+
+# Positions: new tasks go to the end of their status column.
+
+
+@receiver(pre_save, sender=Task)
+def position_on_task_created(sender, instance, **kwargs):
+    if instance._state.adding and not instance.position:
+        assign_positions([instance])
+
+
+# Search: keep the full-text documents of tasks and comments up to date.
+# Deleted tasks and comments take their documents with them via CASCADE.
+
+
+@receiver(post_save, sender=Task)
+def search_on_task_saved(sender, instance, created, **kwargs):
+    index_tasks([instance], created=created)
+
+
+@receiver(post_save, sender=Comment)
+def search_on_comment_saved(sender, instance, created, **kwargs):
+    board_id = comment_board_id(instance)
+    if board_id is not None:
+        index_comment(instance, board_id, created=created)
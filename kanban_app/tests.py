@@ -1,3 +1,1423 @@
-from django.test import TestCase
+"""Tests for the Kanban API's query counts, response contracts and routing.
 
-# Create your tests here.
+The benchmarks print their timings to stderr; their assertions only
+cover query counts and payloads, which do not depend on the machine.
+"""
+
+# Standard library imports
+import asyncio
+import datetime
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from unittest import mock
+
+# Third party imports
+from rest_framework.authtoken.models import Token
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory, APITransactionTestCase
+
+# Django imports
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, connection, connections, transaction
+from django.test import AsyncClient, SimpleTestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+# Local imports
+from auth_app.models import Account
+from core import replicas
+from kanban_app import deletion, positions
+from kanban_app.api import renderers
+from kanban_app.api.pagination import BoardPagination, TaskPagination
+from kanban_app.api.serializers import BoardListSerializer, TaskSerializer
+from kanban_app.changes import compact_changes
+from kanban_app.models import Board, BoardChange, Comment, SearchDocument, Task
+from kanban_app.search import FTS_TABLE
+from kanban_app.transfer import BoardImporter, export_board
+
+
+class KanbanTestCase(APITransactionTestCase):
+    """Base class creating accounts and authenticating the test client.
+
+    Transaction test cases let the `on_commit` cache invalidations run.
+    The cache is cleared first, as cached entries are keyed by ids the
+    flushed database hands out again.
+    """
+
+    def setUp(self):
+        cache.clear()
+
+    def create_account(self, name):
+        user = User.objects.create_user(
+            username=name, email=f"{name}@example.com", password="secret"
+        )
+        account = Account.objects.create(user=user, fullname=name.title())
+        account.token = Token.objects.create(user=user).key
+        return account
+
+    def authenticate(self, account):
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {account.token}")
+
+    def count_queries(self, path):
+        """GET `path` and return the response and the number of queries."""
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(path)
+        self.assertEqual(response.status_code, 200, response.content)
+        return response, len(queries)
+
+    def report(self, label, **results):
+        values = ", ".join(f"{key}={value}" for key, value in results.items())
+        sys.stderr.write(f"\n{self.id()}: {label}: {values}\n")
+
+
+class BoardListQueryTests(KanbanTestCase):
+    """`GET /api/boards/` costs the same queries however many boards it lists."""
+
+    def setUp(self):
+        super().setUp()
+        self.account = self.create_account("alice")
+        self.other = self.create_account("bob")
+        self.authenticate(self.account)
+
+    def create_boards(self, count):
+        for index in range(count):
+            owner = self.account if index % 2 else self.other
+            board = Board.objects.create(title=f"Board {index}", owner=owner)
+            board.members.set([self.account, self.other])
+            for status, priority in (("to-do", "high"), ("done", "low")):
+                Task.objects.create(
+                    board=board,
+                    title="Task",
+                    status=status,
+                    priority=priority,
+                    created_by=self.account,
+                )
+
+    def test_query_count_does_not_grow_with_boards(self):
+        self.create_boards(2)
+        self.client.get("/api/boards/")
+        response, two_boards = self.count_queries("/api/boards/")
+        self.assertEqual(len(response.json()["results"]), 2)
+
+        self.create_boards(10)
+        response, twelve_boards = self.count_queries("/api/boards/")
+        self.assertEqual(len(response.json()["results"]), 12)
+        self.assertEqual(two_boards, twelve_boards)
+
+    def test_counts(self):
+        self.create_boards(1)
+        response, _ = self.count_queries("/api/boards/")
+        board = response.json()["results"][0]
+        self.assertEqual(board["member_count"], 2)
+        self.assertEqual(board["ticket_count"], 2)
+        self.assertEqual(board["tasks_to_do_count"], 1)
+        self.assertEqual(board["tasks_high_prio_count"], 1)
+
+
+class BoardDetailQueryBenchmark(KanbanTestCase):
+    """`GET /api/boards/<id>/` loads a board of any size in fixed queries."""
+
+    task_count = 10_000
+    member_count = 30
+
+    def setUp(self):
+        super().setUp()
+        self.owner = self.create_account("owner")
+        self.members = [
+            self.create_account(f"member{index}") for index in range(self.member_count)
+        ]
+        self.authenticate(self.owner)
+
+    def create_board(self, title, task_count):
+        board = Board.objects.create(title=title, owner=self.owner)
+        board.members.set(self.members)
+        tasks = Task.objects.bulk_create(
+            Task(
+                board=board,
+                title=f"Task {index}",
+                status="to-do",
+                priority="medium",
+                created_by=self.owner,
+                assignee=self.members[index % self.member_count],
+                position=f"{index:05}1",
+            )
+            for index in range(task_count)
+        )
+        Comment.objects.create(task=tasks[0], author=self.owner, content="First")
+        return board
+
+    def test_query_count_does_not_grow_with_tasks(self):
+        warm_up = self.create_board("Warm-up", 1)
+        small = self.create_board("Small", 10)
+        large = self.create_board("Large", self.task_count)
+        # Cache the token and board access, which both requests then share;
+        # their payloads are rendered, not read from the payload cache.
+        self.client.get(f"/api/boards/{warm_up.pk}/")
+
+        _, small_queries = self.count_queries(f"/api/boards/{small.pk}/")
+        start = time.perf_counter()
+        response, large_queries = self.count_queries(f"/api/boards/{large.pk}/")
+        elapsed = time.perf_counter() - start
+
+        data = response.json()
+        self.assertEqual(len(data["tasks"]), self.task_count)
+        self.assertEqual(len(data["members"]), self.member_count)
+        self.assertEqual(data["tasks"][0]["comments_count"], 1)
+        self.assertEqual(large_queries, small_queries)
+        self.report(
+            f"{self.task_count} tasks",
+            queries=large_queries,
+            milliseconds=round(elapsed * 1000),
+        )
+
+
+class AsyncReadPathTests(KanbanTestCase):
+    """The `/api/async/` endpoints answer like their sync counterparts."""
+
+    def setUp(self):
+        super().setUp()
+        self.owner = self.create_account("owner")
+        self.member = self.create_account("member")
+        self.board = Board.objects.create(title="Board", owner=self.owner)
+        self.board.members.set([self.owner, self.member])
+        for index in range(20):
+            task = Task.objects.create(
+                board=self.board,
+                title=f"Task {index}",
+                status="to-do",
+                priority="high",
+                created_by=self.owner,
+                assignee=self.member,
+                reviewer=self.owner,
+                due_date=datetime.date(2025, 1, 1 + index % 3) if index % 2 else None,
+            )
+            Comment.objects.create(task=task, author=self.member, content=f"#{index}")
+        self.task = task
+        self.authenticate(self.owner)
+        self.async_client = AsyncClient()
+
+    def async_get(self, path, account=None):
+        token = (account or self.owner).token
+        return self.async_client.get(path, headers={"authorization": f"Token {token}"})
+
+    def paths(self):
+        return [
+            "/api/boards/",
+            f"/api/boards/{self.board.pk}/",
+            "/api/tasks/reviewing/?page_size=7",
+            f"/api/tasks/{self.task.pk}/comments/",
+        ]
+
+    async def test_responses_match_sync_views(self):
+        for path in self.paths():
+            sync_response = await self.async_get(path)
+            async_response = await self.async_get(async_path(path))
+            self.assertEqual(async_response.status_code, 200, async_response.content)
+            self.assertEqual(
+                async_response.content,
+                async_path(sync_response.content.decode()).encode(),
+                path,
+            )
+
+    async def test_permissions(self):
+        outsider = await asyncio.to_thread(self.create_account, "outsider")
+        path = async_path(f"/api/boards/{self.board.pk}/")
+        response = await self.async_client.get(path)
+        self.assertEqual(response.status_code, 401)
+        response = await self.async_get(path, outsider)
+        self.assertEqual(response.status_code, 403)
+
+    async def test_board_deleted_behind_stale_access_cache(self):
+        for path in self.paths()[1:4:2]:
+            response = await self.async_get(async_path(path))
+            self.assertEqual(response.status_code, 200)
+
+        # A plain UPDATE leaves the cached board ids in place.
+        await Board.all_objects.filter(pk=self.board.pk).aupdate(
+            deleted_at=timezone.now()
+        )
+        response = await self.async_get(async_path(self.paths()[1]))
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(
+            response.json(), {"detail": "No Board matches the given query."}
+        )
+
+
+def async_path(path):
+    """Return the `/api/async/` counterpart of an `/api/` path or payload."""
+    return path.replace("/api/", "/api/async/")
+
+
+class ListContractTests(KanbanTestCase):
+    """The fast list path renders exactly the bytes of the DRF serializers.
+
+    Expected bodies are built the way the views used to build them: the
+    model serializer on a page of model instances, rendered by DRF's
+    `JSONRenderer`. Both the orjson and the stdlib encoder must match.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.owner = self.create_account("owner")
+        self.member = self.create_account("zoë")
+        board = Board.objects.create(title="Büro \u2028 board", owner=self.owner)
+        board.members.set([self.owner, self.member])
+        for index in range(30):
+            Task.objects.create(
+                board=board,
+                title=f"Task {index} ",
+                description=None if index % 3 else "Ünïcode €",
+                status="to-do",
+                priority="high",
+                created_by=self.owner,
+                assignee=self.member if index % 2 else None,
+                reviewer=self.owner,
+                due_date=datetime.date(2025, 1, 1 + index % 3) if index % 4 else None,
+            )
+
+    def expected(self, path, queryset, serializer_class, pagination_class):
+        request = Request(APIRequestFactory().get(path))
+        paginator = pagination_class()
+        page = paginator.paginate_queryset(queryset, request)
+        data = serializer_class(page, many=True).data
+        return JSONRenderer().render(paginator.get_paginated_response(data).data)
+
+    def assert_contract(self, account, path, queryset, serializer_class, pagination):
+        self.authenticate(account)
+        expected = self.expected(path, queryset, serializer_class, pagination)
+        self.assertEqual(self.client.get(path).content, expected, path)
+        with mock.patch.object(renderers, "orjson", None):
+            self.assertEqual(self.client.get(path).content, expected, path)
+
+    def test_task_lists(self):
+        reviewing = Task.objects.reviewed_by(self.owner)
+        self.authenticate(self.owner)
+        first_page = self.client.get("/api/tasks/reviewing/?page_size=7").json()
+        next_page = first_page["next"].removeprefix("http://testserver")
+        for path in (
+            "/api/tasks/reviewing/?page_size=7",
+            "/api/tasks/reviewing/?page=2&page_size=7",
+            next_page,
+        ):
+            self.assert_contract(
+                self.owner, path, reviewing, TaskSerializer, TaskPagination
+            )
+        self.assert_contract(
+            self.member,
+            "/api/tasks/assigned-to-me/",
+            Task.objects.assigned_to(self.member),
+            TaskSerializer,
+            TaskPagination,
+        )
+
+    def test_board_list(self):
+        self.assert_contract(
+            self.owner,
+            "/api/boards/",
+            Board.objects.accessible_to(self.owner),
+            BoardListSerializer,
+            BoardPagination,
+        )
+
+
+class ReplicaRoutingTests(KanbanTestCase):
+    """Safe requests read from a replica; writers read their own writes.
+
+    The replica is a second SQLite database, added for this test case
+    only. `replicate()` copies the primary into it and stands in for
+    replication, so in between the replica serves stale data.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        # Added after the test runner set up its databases, so that it
+        # is not created as a test database; the test copies into it.
+        cls.databases = {*cls.databases, "replica"}
+        cls.replica_directory = tempfile.TemporaryDirectory()
+        connections.settings["replica"] = {
+            **connections[DEFAULT_DB_ALIAS].settings_dict,
+            "NAME": os.path.join(cls.replica_directory.name, "replica.sqlite3"),
+        }
+        cls.replicas_patch = mock.patch.object(replicas, "REPLICAS", ["replica"])
+        cls.replicas_patch.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.replicas_patch.stop()
+        connections["replica"].close()
+        del connections["replica"]
+        del connections.settings["replica"]
+        cls.replica_directory.cleanup()
+        cls.databases = cls.databases - {"replica"}
+        super().tearDownClass()
+
+    def setUp(self):
+        super().setUp()
+        self.owner = self.create_account("owner")
+        self.member = self.create_account("member")
+        self.board = Board.objects.create(title="Board", owner=self.owner)
+        self.board.members.set([self.owner, self.member])
+        self.replicate()
+
+    def replicate(self):
+        primary = connections[DEFAULT_DB_ALIAS]
+        replica = connections["replica"]
+        primary.ensure_connection()
+        replica.ensure_connection()
+        primary.connection.backup(replica.connection)
+
+    def get(self, account, path):
+        """GET `path` as `account`; return the data and queries per database."""
+        self.authenticate(account)
+        with (
+            CaptureQueriesContext(connections[DEFAULT_DB_ALIAS]) as primary,
+            CaptureQueriesContext(connections["replica"]) as replica,
+        ):
+            response = self.client.get(path)
+        self.assertEqual(response.status_code, 200, response.content)
+        return response.json(), len(primary), len(replica)
+
+    def create_task(self):
+        self.authenticate(self.owner)
+        response = self.client.post(
+            "/api/tasks/",
+            {
+                "board": self.board.pk,
+                "title": "New",
+                "status": "to-do",
+                "priority": "low",
+            },
+            format="json",
+        )
+        self.assertEqual(response.status_code, 201, response.content)
+
+    def ticket_count(self, account):
+        data, _, _ = self.get(account, "/api/boards/")
+        return data["results"][0]["ticket_count"]
+
+    def test_reads_go_to_the_replica(self):
+        # Only the uncached token lookup goes to the primary.
+        _, primary_queries, replica_queries = self.get(self.member, "/api/boards/")
+        self.assertEqual(primary_queries, 1)
+        self.assertGreater(replica_queries, 0)
+
+        _, primary_queries, replica_queries = self.get(self.member, "/api/boards/")
+        self.assertEqual(primary_queries, 0)
+        self.assertGreater(replica_queries, 0)
+
+    def test_writer_reads_its_own_writes(self):
+        self.create_task()
+
+        data, _, replica_queries = self.get(self.owner, f"/api/boards/{self.board.pk}/")
+        self.assertEqual(len(data["tasks"]), 1)
+        self.assertEqual(replica_queries, 0)
+        self.assertEqual(self.ticket_count(self.owner), 1)
+
+        # Other clients keep reading the replica until it catches up.
+        self.assertEqual(self.ticket_count(self.member), 0)
+        self.replicate()
+        self.assertEqual(self.ticket_count(self.member), 1)
+
+    def test_pin_expires(self):
+        with mock.patch.object(replicas, "PIN_SECONDS", 0):
+            self.create_task()
+        self.assertEqual(self.ticket_count(self.owner), 0)
+
+    def test_transactions_and_tokens_use_the_primary(self):
+        token = replicas.current_request.set(replicas.RequestRouting("replica"))
+        try:
+            self.assertEqual(Board.objects.all().db, "replica")
+            self.assertEqual(Token.objects.all().db, DEFAULT_DB_ALIAS)
+            with transaction.atomic():
+                self.assertEqual(Board.objects.all().db, DEFAULT_DB_ALIAS)
+        finally:
+            replicas.current_request.reset(token)
+        self.assertEqual(Board.objects.all().db, DEFAULT_DB_ALIAS)
+
+
+class BoardTransferTests(KanbanTestCase):
+    """Boards survive an export and import round trip."""
+
+    def setUp(self):
+        super().setUp()
+        self.owner = self.create_account("owner")
+        self.member = self.create_account("member")
+        self.reviewer = self.create_account("reviewer")
+        self.board = Board.objects.create(title="Source", owner=self.owner)
+        self.board.members.set([self.member, self.reviewer])
+        last_month = timezone.now() - datetime.timedelta(days=30)
+        for index, description in enumerate(["Details", "", None, "More"]):
+            task = Task.objects.create(
+                board=self.board,
+                title=f"Task {index}",
+                description=description,
+                status=("to-do", "review")[index % 2],
+                priority=("high", "low")[index // 2],
+                created_by=self.owner,
+                assignee=self.member if index % 2 else None,
+                reviewer=self.reviewer,
+                due_date=datetime.date(2026, 1, index + 1) if index else None,
+            )
+            for number in range(index):
+                Comment.objects.create(
+                    task=task,
+                    author=(self.member, self.reviewer)[number % 2],
+                    content=f"Comment {number}",
+                    created_at=last_month,
+                )
+
+    def export(self, board):
+        self.authenticate(self.owner)
+        response = self.client.get(f"/api/boards/{board.pk}/export/")
+        self.assertEqual(response.status_code, 200)
+        return b"".join(response.streaming_content)
+
+    def import_(self, account, body):
+        self.authenticate(account)
+        return self.client.generic(
+            "POST", "/api/boards/import/", body, content_type="application/x-ndjson"
+        )
+
+    def snapshot(self, board):
+        """Return everything a round trip must preserve, without ids."""
+        board = Board.objects.get(pk=board.pk)
+        tasks = [
+            (
+                task.title,
+                task.description,
+                task.status,
+                task.priority,
+                task.due_date,
+                task.created_by_id,
+                task.assignee_id,
+                task.reviewer_id,
+                task.comments_count,
+            )
+            for task in board.tasks.order_by("status", "position")
+        ]
+        comments = sorted(
+            Comment.objects.filter(task__board=board).values_list(
+                "task__title", "author_id", "content", "created_at"
+            )
+        )
+        counters = (
+            board.member_count,
+            board.ticket_count,
+            board.tasks_to_do_count,
+            board.tasks_high_prio_count,
+        )
+        return tasks, comments, counters
+
+    def test_round_trip(self):
+        body = self.export(self.board)
+        response = self.import_(self.owner, body)
+        self.assertEqual(response.status_code, 201, response.content)
+        self.assertEqual(response.json()["members"], 2)
+
+        copy = Board.objects.get(pk=response.json()["board"])
+        self.assertEqual(copy.owner, self.owner)
+        self.assertEqual(set(copy.members.all()), {self.member, self.reviewer})
+        self.assertEqual(self.snapshot(copy), self.snapshot(self.board))
+
+    def test_import_by_a_member(self):
+        response = self.import_(self.member, self.export(self.board))
+        self.assertEqual(response.status_code, 201, response.content)
+
+        copy = Board.objects.get(pk=response.json()["board"])
+        self.assertEqual(copy.owner, self.member)
+        # The exported owner joins; the importer stays a member.
+        self.assertEqual(
+            set(copy.members.all()), {self.owner, self.member, self.reviewer}
+        )
+        self.assertEqual(copy.member_count, 3)
+
+    def test_accounts_outside_the_board_are_not_referenced(self):
+        outsider = self.create_account("outsider")
+        reviewer_line = f'{{"type":"member","account":{self.reviewer.pk}}}\n'
+        body = (
+            self.export(self.board)
+            .replace(reviewer_line.encode(), b"")
+            .replace(b"reviewer@example.com", b"outsider@example.com")
+        )
+        response = self.import_(self.member, body)
+        self.assertEqual(response.status_code, 201, response.content)
+
+        copy = Board.objects.get(pk=response.json()["board"])
+        self.assertNotIn(outsider, copy.members.all())
+        tasks = Task.objects.filter(board=copy)
+        self.assertFalse(tasks.filter(reviewer=outsider).exists())
+        comments = Comment.objects.filter(task__board=copy)
+        self.assertFalse(comments.filter(author=outsider).exists())
+        self.assertTrue(comments.filter(author=self.member).exists())
+
+    def test_invalid_imports_write_nothing(self):
+        body = self.export(self.board)
+        lines = body.splitlines(keepends=True)
+        boards, tasks = Board.objects.count(), Task.objects.count()
+        for invalid in (
+            b"".join(lines[:-1]),
+            body.replace(b'"Task 0"', b'""'),
+            body.replace(b'"high"', b'"urgent"'),
+            body + b'{"type":"end"}\n',
+        ):
+            response = self.import_(self.owner, invalid)
+            self.assertEqual(response.status_code, 400, invalid)
+        self.assertEqual((Board.objects.count(), Task.objects.count()), (boards, tasks))
+
+    def test_memory_does_not_grow_with_comments(self):
+        peaks = []
+        for comment_count in (5_000, 20_000):
+            board = Board.objects.create(title="Large", owner=self.owner)
+            tasks = Task.objects.bulk_create(
+                Task(
+                    board=board,
+                    title=f"Task {index}",
+                    status="to-do",
+                    priority="low",
+                    created_by=self.owner,
+                    position=f"{index:03}1",
+                )
+                for index in range(50)
+            )
+            Comment.objects.bulk_create(
+                Comment(task=tasks[index % 50], author=self.owner, content="x" * 50)
+                for index in range(comment_count)
+            )
+            lines = b"".join(export_board(board)).splitlines(keepends=True)
+
+            tracemalloc.start()
+            for _ in export_board(board):
+                pass
+            export_peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.reset_peak()
+            with transaction.atomic():
+                BoardImporter(self.owner, batch_size=500).run(iter(lines))
+            import_peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            peaks.append((export_peak, import_peak))
+
+        (small_export, small_import), (large_export, large_import) = peaks
+        self.assertLess(large_export, small_export * 1.5)
+        self.assertLess(large_import, small_import * 1.5)
+
+
+class AccountRenameTests(KanbanTestCase):
+    """Renaming an account invalidates the boards that show its name."""
+
+    def setUp(self):
+        super().setUp()
+        self.owner = self.create_account("owner")
+        self.member = self.create_account("member")
+        self.board = Board.objects.create(title="Board", owner=self.owner)
+        self.board.members.set([self.member])
+        self.task = Task.objects.create(
+            board=self.board,
+            title="Task",
+            status="to-do",
+            priority="low",
+            created_by=self.owner,
+        )
+        Comment.objects.bulk_create(
+            Comment(task=self.task, author=self.owner, content=f"Comment {index}")
+            for index in range(50)
+        )
+        self.authenticate(self.member)
+
+    def rename(self, account, fullname):
+        account.fullname = fullname
+        account.save()
+
+    def test_owner_rename_changes_comment_list_etag(self):
+        path = f"/api/tasks/{self.task.pk}/comments/"
+        etag = self.client.get(path)["ETag"]
+        self.assertEqual(
+            self.client.get(path, HTTP_IF_NONE_MATCH=etag).status_code, 304
+        )
+
+        self.rename(self.owner, "Renamed")
+        response = self.client.get(path, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["results"][0]["author"], "Renamed")
+
+    def test_author_rename_logs_one_change_per_board(self):
+        since = Board.objects.get(pk=self.board.pk).revision
+        self.rename(self.owner, "Renamed")
+
+        changes = BoardChange.objects.filter(board=self.board, revision__gt=since)
+        self.assertEqual(
+            sorted(changes.values_list("kind", "object_id")),
+            [
+                (BoardChange.Kind.AUTHOR, self.owner.pk),
+                (BoardChange.Kind.BOARD, self.board.pk),
+            ],
+        )
+        data = self.client.get(
+            f"/api/boards/{self.board.pk}/changes/?since={since}"
+        ).json()
+        self.assertFalse(data["resync"])
+        self.assertEqual(
+            data["authors"], [{"id": self.owner.pk, "fullname": "Renamed"}]
+        )
+        self.assertEqual(data["removed_members"], [])
+
+
+class PositionKeyTests(SimpleTestCase):
+    """Generated position keys keep their order and stay short."""
+
+    def assert_key(self, key, lower, upper):
+        self.assertTrue(key, (lower, upper))
+        self.assertFalse(key.endswith(positions.DIGITS[0]), key)
+        self.assertLessEqual(len(key), positions.MAX_LENGTH)
+        self.assertTrue(set(key) <= set(positions.DIGITS), key)
+        if lower:
+            self.assertLess(lower, key)
+        if upper is not None:
+            self.assertLess(key, upper)
+
+    def random_key(self, rng):
+        key = "".join(rng.choices(positions.DIGITS, k=rng.randint(1, 8)))
+        return key.rstrip(positions.DIGITS[0]) or positions.DIGITS[1]
+
+    def test_key_between_fuzz(self):
+        rng = random.Random(23)
+        keys = []
+        spot = 0
+        for _ in range(3000):
+            # Mostly random gaps, with runs of inserts into one spot.
+            if rng.random() < 0.3:
+                spot = rng.randint(0, len(keys))
+            lower = keys[spot - 1] if spot else None
+            upper = keys[spot] if spot < len(keys) else None
+            key = positions.key_between(lower, upper)
+            self.assert_key(key, lower, upper)
+            keys.insert(spot, key)
+        self.assertEqual(keys, sorted(set(keys)))
+
+    def test_midpoint_fuzz(self):
+        rng = random.Random(23)
+        for _ in range(3000):
+            lower, upper = sorted([self.random_key(rng), self.random_key(rng)])
+            if lower == upper:
+                continue
+            self.assert_key(positions.midpoint(lower, upper), lower, upper)
+            self.assert_key(positions.midpoint("", lower), "", lower)
+            self.assert_key(positions.midpoint(upper, None), upper, None)
+
+    def test_keys_after_fuzz(self):
+        rng = random.Random(23)
+        for _ in range(300):
+            key = rng.choice(["", self.random_key(rng)])
+            keys = positions.keys_after(key, rng.randint(1, 1000))
+            self.assertEqual(keys, sorted(set(keys)))
+            for generated in keys:
+                self.assert_key(generated, key, None)
+
+    def test_appended_batches_stay_short(self):
+        key = ""
+        for _ in range(20):
+            keys = positions.keys_after(key, 500)
+            self.assertLess(key, keys[0])
+            key = keys[-1]
+        self.assertLessEqual(len(key), 6)
+
+    def test_key_between_rejects_unordered_bounds(self):
+        with self.assertRaises(ValueError):
+            positions.key_between("b", "a")
+        with self.assertRaises(ValueError):
+            positions.key_between("b", "b")
+
+
+class TaskMoveTests(KanbanTestCase):
+    """`POST /api/tasks/{id}/move/` reorders columns one row at a time."""
+
+    def setUp(self):
+        super().setUp()
+        self.owner = self.create_account("owner")
+        self.board = Board.objects.create(title="Board", owner=self.owner)
+        self.board.members.set([self.owner])
+        self.authenticate(self.owner)
+        self.ids = [self.create_task(f"Task {index}") for index in range(5)]
+
+    def create_task(self, title, status="to-do"):
+        response = self.client.post(
+            "/api/tasks/",
+            {
+                "board": self.board.pk,
+                "title": title,
+                "status": status,
+                "priority": "low",
+            },
+            format="json",
+        )
+        self.assertEqual(response.status_code, 201, response.content)
+        return response.json()["id"]
+
+    def move(self, task_id, **target):
+        return self.client.post(f"/api/tasks/{task_id}/move/", target, format="json")
+
+    def column(self, status="to-do"):
+        tasks = self.client.get(f"/api/boards/{self.board.pk}/").json()["tasks"]
+        return [task["id"] for task in tasks if task["status"] == status]
+
+    def test_move_updates_one_row(self):
+        ids = self.ids
+        with CaptureQueriesContext(connection) as queries:
+            response = self.move(ids[4], after=ids[0])
+        self.assertEqual(response.status_code, 200, response.content)
+        updates = [
+            query
+            for query in queries.captured_queries
+            if query["sql"].startswith('UPDATE "kanban_app_task"')
+        ]
+        self.assertEqual(len(updates), 1)
+        self.assertEqual(self.column(), [ids[0], ids[4], ids[1], ids[2], ids[3]])
+
+        self.move(ids[3], before=ids[0])
+        self.assertEqual(self.column(), [ids[3], ids[0], ids[4], ids[1], ids[2]])
+        self.move(ids[3])
+        self.assertEqual(self.column(), [ids[0], ids[4], ids[1], ids[2], ids[3]])
+
+    def test_move_between_columns(self):
+        ids = self.ids
+        response = self.move(ids[0], status="review")
+        self.assertEqual(response.json()["status"], "review")
+        self.move(ids[1], status="review", before=ids[0])
+        self.assertEqual(self.column("review"), [ids[1], ids[0]])
+        self.assertEqual(self.column(), ids[2:])
+        board = Board.objects.get(pk=self.board.pk)
+        self.assertEqual(board.tasks_to_do_count, 3)
+
+    def test_invalid_moves(self):
+        ids = self.ids
+        self.move(ids[0], status="review")
+        for target in (
+            {"after": ids[0]},
+            {"after": ids[3], "before": ids[4]},
+            {"after": ids[2]},
+            {"status": "nope"},
+        ):
+            self.assertEqual(self.move(ids[2], **target).status_code, 400, target)
+
+        outsider = self.create_account("outsider")
+        self.authenticate(outsider)
+        self.assertEqual(self.move(ids[2]).status_code, 403)
+
+    def test_status_change_appends_to_new_column(self):
+        review = [self.create_task(f"Review {index}", "review") for index in range(3)]
+        ids = self.ids
+        response = self.client.patch(
+            f"/api/tasks/{ids[0]}/", {"status": "review"}, format="json"
+        )
+        self.assertEqual(response.status_code, 200, response.content)
+        self.client.patch(f"/api/tasks/{ids[1]}/", {"title": "Kept"}, format="json")
+        self.assertEqual(self.column(), ids[1:])
+
+        response = self.client.patch(
+            "/api/tasks/bulk/",
+            [
+                {"id": ids[3], "status": "review"},
+                {"id": ids[2], "status": "review"},
+                {"id": review[0], "title": "Kept"},
+            ],
+            format="json",
+        )
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(self.column("review"), [*review, ids[0], ids[3], ids[2]])
+
+    def test_hot_spot_moves_schedule_rebalance(self):
+        ids = self.ids
+        with mock.patch.object(positions, "enqueue") as enqueue:
+            for index in range(120):
+                self.move(ids[2 if index % 2 else 4], after=ids[3])
+        enqueue.assert_called_with(positions.rebalance_column, self.board.pk, "to-do")
+        order = self.column()
+        keys = Task.objects.filter(board=self.board).values_list("position", flat=True)
+        self.assertGreater(max(map(len, keys)), positions.REBALANCE_LENGTH)
+
+        revision = Board.objects.get(pk=self.board.pk).revision
+        self.assertGreater(positions.rebalance_column(self.board.pk, "to-do"), 0)
+        self.assertEqual(self.column(), order)
+        keys = Task.objects.filter(board=self.board).values_list("position", flat=True)
+        self.assertLessEqual(max(map(len, keys)), 2)
+        changes = self.client.get(
+            f"/api/boards/{self.board.pk}/changes/?since={revision}"
+        ).json()
+        self.assertTrue(changes["tasks"])
+        self.assertEqual(positions.rebalance_column(self.board.pk, "to-do"), 0)
+
+
+class DeletionTests(KanbanTestCase):
+    """Deleted boards vanish at once and their purge leaves nothing behind."""
+
+    def setUp(self):
+        super().setUp()
+        self.owner = self.create_account("owner")
+        self.member = self.create_account("member")
+        self.authenticate(self.owner)
+        self.board_id, self.task_ids = self.create_board("doomed", self.member)
+        self.comment_ids = [
+            self.client.post(
+                f"/api/tasks/{task_id}/comments/",
+                {"content": f"doomed remark {index}"},
+                format="json",
+            ).json()["id"]
+            for index, task_id in enumerate(self.task_ids * 3)
+        ]
+        self.authenticate(self.member)
+        self.kept_id, self.kept_task_ids = self.create_board("kept", self.owner)
+        self.authenticate(self.owner)
+
+    def create_board(self, word, member):
+        board_id = self.client.post(
+            "/api/boards/", {"title": word, "members": [member.pk]}, format="json"
+        ).json()["id"]
+        response = self.client.post(
+            "/api/tasks/bulk/",
+            [
+                {
+                    "board": board_id,
+                    "title": f"{word} task {index}",
+                    "status": "to-do",
+                    "priority": "high",
+                    "assignee": self.member.pk,
+                    "reviewer": self.owner.pk,
+                }
+                for index in range(10)
+            ],
+            format="json",
+        )
+        self.assertEqual(response.status_code, 201, response.content)
+        return board_id, [task["id"] for task in response.json()]
+
+    def delete_board(self):
+        """Delete the board over the API; return its queued purge."""
+        with mock.patch.object(deletion, "enqueue") as enqueue:
+            response = self.client.delete(f"/api/boards/{self.board_id}/")
+        self.assertEqual(response.status_code, 204)
+        enqueue.assert_called_once_with(deletion.purge_board, self.board_id)
+        return lambda: deletion.purge_board(self.board_id, batch_size=7)
+
+    def fts_matches(self, word):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('integrity-check')"
+            )
+            cursor.execute(
+                f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s", [word]
+            )
+            return cursor.fetchall()
+
+    def test_deleted_board_is_hidden_from_every_endpoint(self):
+        self.delete_board()
+        board, task = self.board_id, self.task_ids[0]
+        comment = self.comment_ids[0]
+        for account in (self.owner, self.member):
+            self.authenticate(account)
+            for path in (
+                "/api/boards/",
+                "/api/async/boards/",
+                "/api/tasks/assigned-to-me/",
+                "/api/async/tasks/assigned-to-me/",
+                "/api/tasks/reviewing/",
+                "/api/async/tasks/reviewing/",
+            ):
+                response = self.client.get(path)
+                self.assertEqual(response.status_code, 200, path)
+                ids = [row["id"] for row in response.json()["results"]]
+                self.assertFalse(set(ids) & {board, *self.task_ids}, path)
+            for method, path in (
+                ("get", f"/api/boards/{board}/"),
+                ("get", f"/api/async/boards/{board}/"),
+                ("get", f"/api/boards/{board}/search/?q=doomed"),
+                ("get", f"/api/boards/{board}/changes/?since=0"),
+                ("get", f"/api/boards/{board}/export/"),
+                ("get", f"/api/boards/{board}/events/"),
+                ("patch", f"/api/boards/{board}/"),
+                ("delete", f"/api/boards/{board}/"),
+                ("get", f"/api/tasks/{task}/"),
+                ("patch", f"/api/tasks/{task}/"),
+                ("delete", f"/api/tasks/{task}/"),
+                ("post", f"/api/tasks/{task}/move/"),
+                ("get", f"/api/tasks/{task}/comments/"),
+                ("get", f"/api/async/tasks/{task}/comments/"),
+                ("post", f"/api/tasks/{task}/comments/"),
+                ("delete", f"/api/tasks/{task}/comments/{comment}/"),
+            ):
+                response = getattr(self.client, method)(path, {}, format="json")
+                self.assertEqual(response.status_code, 404, f"{method} {path}")
+
+            response = self.client.post(
+                "/api/tasks/",
+                {"board": board, "title": "Late", "status": "to-do", "priority": "low"},
+                format="json",
+            )
+            self.assertEqual(response.status_code, 404)
+
+        self.assertEqual(Task.objects.filter(board_id=board).count(), 10)
+        self.assertEqual(Comment.objects.filter(pk=comment).count(), 1)
+        self.authenticate(self.owner)
+        deletions = self.client.get("/api/boards/deletions/").json()
+        self.assertEqual([row["id"] for row in deletions], [board])
+
+    def test_purge_leaves_no_rows_behind(self):
+        purge = self.delete_board()
+        self.assertTrue(self.fts_matches("doomed"))
+
+        self.assertEqual(purge(), 10 + 30)
+        board = self.board_id
+        self.assertFalse(Board.all_objects.filter(pk=board).exists())
+        self.assertFalse(Task.objects.filter(board_id=board).exists())
+        self.assertFalse(Comment.objects.filter(pk__in=self.comment_ids).exists())
+        self.assertFalse(SearchDocument.objects.filter(board_id=board).exists())
+        self.assertFalse(BoardChange.objects.filter(board_id=board).exists())
+        self.assertFalse(Board.members.through.objects.filter(board_id=board).exists())
+        self.assertEqual(self.fts_matches("doomed"), [])
+        self.assertEqual(len(self.fts_matches("kept")), 10)
+        self.assertEqual(purge(), 0)
+
+    def test_counters_after_purge_account(self):
+        # The owner works on the member's board too.
+        owner_tasks = self.client.post(
+            "/api/tasks/bulk/",
+            [
+                {
+                    "board": self.kept_id,
+                    "title": f"Owner task {index}",
+                    "status": "to-do",
+                    "priority": "high" if index else "low",
+                }
+                for index in range(3)
+            ],
+            format="json",
+        ).json()
+        kept_task = self.kept_task_ids[0]
+        for index in range(4):
+            self.client.post(
+                f"/api/tasks/{kept_task}/comments/",
+                {"content": f"Owner remark {index}"},
+                format="json",
+            )
+
+        account = Account.objects.get(pk=self.owner.pk)
+        with mock.patch.object(deletion, "enqueue") as enqueue:
+            deletion.delete_account(account)
+        enqueue.assert_called_once_with(deletion.purge_account, self.owner.pk)
+        self.assertEqual(self.client.get("/api/boards/").status_code, 401)
+        deletion.purge_account(self.owner.pk, batch_size=2)
+
+        self.assertFalse(User.objects.filter(username="owner").exists())
+        self.assertFalse(Board.all_objects.filter(pk=self.board_id).exists())
+        self.assertFalse(
+            Task.objects.filter(pk__in=[task["id"] for task in owner_tasks])
+        )
+        board = Board.objects.get(pk=self.kept_id)
+        self.assertEqual(
+            (board.member_count, board.ticket_count, board.tasks_to_do_count),
+            (0, 10, 10),
+        )
+        self.assertEqual(board.tasks_high_prio_count, 10)
+        self.assertEqual(Task.objects.get(pk=kept_task).comments_count, 0)
+        # Nothing drifted from the real counts.
+        self.assertEqual(Board.objects.recount(), 0)
+        self.assertEqual(Task.objects.recount(), 0)
+
+
+class TaskBulkTests(KanbanTestCase):
+    """`/api/tasks/bulk/` validates per item and writes all or nothing."""
+
+    def setUp(self):
+        super().setUp()
+        self.owner = self.create_account("owner")
+        self.member = self.create_account("member")
+        self.outsider = self.create_account("outsider")
+        self.board = Board.objects.create(title="Board", owner=self.owner)
+        self.board.members.set([self.member])
+        self.other = Board.objects.create(title="Other", owner=self.outsider)
+        self.authenticate(self.owner)
+
+    def item(self, **fields):
+        return {
+            "board": self.board.pk,
+            "title": "Task",
+            "status": "to-do",
+            "priority": "low",
+            **fields,
+        }
+
+    def bulk(self, method, items):
+        return getattr(self.client, method)("/api/tasks/bulk/", items, format="json")
+
+    def snapshot(self):
+        board = Board.objects.get(pk=self.board.pk)
+        return (
+            list(Task.objects.values_list("pk", "title", "status", "assignee_id")),
+            (board.revision, board.ticket_count, board.tasks_to_do_count),
+            SearchDocument.objects.count(),
+            BoardChange.objects.count(),
+        )
+
+    def test_create_in_request_order(self):
+        items = [self.item(title=f"Task {index}") for index in range(50)]
+        # Warm the token and membership caches.
+        self.bulk("post", [self.item()])
+        response, queries = None, []
+        for count in (10, 50):
+            with CaptureQueriesContext(connection) as captured:
+                response = self.bulk("post", items[:count])
+            self.assertEqual(response.status_code, 201, response.content)
+            queries.append(len(captured))
+        self.assertEqual(queries[0], queries[1])
+        self.assertEqual(
+            [task["title"] for task in response.json()],
+            [item["title"] for item in items],
+        )
+        self.assertEqual(Board.objects.get(pk=self.board.pk).ticket_count, 61)
+
+    def test_create_errors_align_with_items(self):
+        before = self.snapshot()
+        response = self.bulk(
+            "post",
+            [
+                self.item(),
+                self.item(board=self.other.pk),
+                self.item(board=self.other.pk + 1000),
+                self.item(assignee_id=self.outsider.pk),
+                self.item(status="someday"),
+                self.item(assignee_id=self.member.pk),
+            ],
+        )
+        self.assertEqual(response.status_code, 400)
+        errors = response.json()
+        self.assertEqual(len(errors), 6)
+        self.assertEqual(errors[0], {})
+        self.assertEqual(errors[1], {"board": ["You are not a member of this board"]})
+        self.assertEqual(errors[2], {"board": ["Board does not exist"]})
+        self.assertEqual(
+            errors[3], {"non_field_errors": ["Assignee is not member of this board"]}
+        )
+        self.assertEqual(list(errors[4]), ["status"])
+        self.assertEqual(errors[5], {})
+        self.assertEqual(self.snapshot(), before)
+
+    def test_update_errors_align_with_items(self):
+        ids = [task["id"] for task in self.bulk("post", [self.item()] * 3).json()]
+        before = self.snapshot()
+        response = self.bulk(
+            "patch",
+            [
+                {"id": ids[0], "status": "done"},
+                {"id": max(ids) + 1000, "status": "done"},
+                {"id": ids[1], "board": self.other.pk},
+                {"id": ids[2], "assignee_id": self.outsider.pk},
+                {"status": "done"},
+            ],
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(
+            response.json(),
+            [
+                {},
+                {"id": ["Task does not exist"]},
+                {"board": ["Changing the board id is not allowed"]},
+                {"non_field_errors": ["Assignee is not member of this board"]},
+                {"id": ["Task does not exist"]},
+            ],
+        )
+        self.assertEqual(self.snapshot(), before)
+
+    def test_update_applies_every_item(self):
+        ids = [task["id"] for task in self.bulk("post", [self.item()] * 3).json()]
+        response = self.bulk(
+            "patch",
+            [
+                {"id": ids[2], "status": "done"},
+                {"id": ids[0], "title": "Renamed", "assignee_id": self.member.pk},
+            ],
+        )
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual([task["id"] for task in response.json()], [ids[2], ids[0]])
+        tasks = Task.objects.in_bulk(ids)
+        self.assertEqual(tasks[ids[2]].status, "done")
+        self.assertEqual(
+            (tasks[ids[0]].title, tasks[ids[0]].assignee_id),
+            ("Renamed", self.member.pk),
+        )
+        self.assertEqual(Board.objects.get(pk=self.board.pk).tasks_to_do_count, 2)
+
+    def test_failed_write_rolls_back_the_batch(self):
+        before = self.snapshot()
+        with mock.patch(
+            "kanban_app.api.views.index_tasks", side_effect=RuntimeError("disk full")
+        ):
+            with self.assertRaises(RuntimeError):
+                self.bulk("post", [self.item()] * 5)
+        self.assertEqual(self.snapshot(), before)
+
+    def test_rejects_malformed_batches(self):
+        response = self.bulk("post", self.item())
+        self.assertEqual(
+            response.json(), {"non_field_errors": ["Expected a list of tasks."]}
+        )
+        response = self.bulk("post", [self.item()] * 501)
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(Task.objects.exists())
+
+
+class BoardSearchTests(KanbanTestCase):
+    """Search results follow task and comment edits."""
+
+    def setUp(self):
+        super().setUp()
+        self.owner = self.create_account("owner")
+        self.authenticate(self.owner)
+        self.board_id = Board.objects.create(title="Board", owner=self.owner).pk
+        self.login_task = self.create_task("Fix login bug", "Crash on submit")
+        self.docs_task = self.create_task("Write docs")
+        self.comment_id = self.client.post(
+            f"/api/tasks/{self.docs_task}/comments/",
+            {"content": "The login page has a bug too"},
+            format="json",
+        ).json()["id"]
+
+    def create_task(self, title, description="", board_id=None):
+        response = self.client.post(
+            "/api/tasks/",
+            {
+                "board": board_id or self.board_id,
+                "title": title,
+                "description": description,
+                "status": "to-do",
+                "priority": "low",
+            },
+            format="json",
+        )
+        self.assertEqual(response.status_code, 201, response.content)
+        return response.json()["id"]
+
+    def search(self, query):
+        response = self.client.get(f"/api/boards/{self.board_id}/search/", {"q": query})
+        self.assertEqual(response.status_code, 200, response.content)
+        return {task["id"] for task in response.json()["results"]}
+
+    def assert_index_in_sync(self):
+        """One document per task and comment, and an intact FTS index."""
+        self.assertEqual(
+            SearchDocument.objects.count(),
+            Task.objects.count() + Comment.objects.count(),
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('integrity-check')"
+            )
+
+    def test_matches_tasks_and_comments(self):
+        self.assertEqual(self.search("login bug"), {self.docs_task, self.login_task})
+        self.assertEqual(self.search("crash"), {self.login_task})
+        self.assertEqual(self.search("subm"), {self.login_task})
+        self.assertEqual(self.search('"OR NEAR(*'), set())
+
+        other = Board.objects.create(title="Other", owner=self.owner).pk
+        self.create_task("Another login bug", board_id=other)
+        self.assertEqual(self.search("login"), {self.docs_task, self.login_task})
+        response = self.client.get(f"/api/boards/{self.board_id}/search/?q=")
+        self.assertEqual(response.status_code, 400)
+        self.assert_index_in_sync()
+
+    def test_task_edits(self):
+        self.client.patch(
+            f"/api/tasks/{self.login_task}/",
+            {"title": "Fix signup", "description": "Hangs forever"},
+            format="json",
+        )
+        self.assertEqual(self.search("signup hangs"), {self.login_task})
+        self.assertEqual(self.search("crash"), set())
+        self.assertEqual(self.search("login"), {self.docs_task})
+
+        self.client.patch(
+            "/api/tasks/bulk/",
+            [
+                {"id": self.login_task, "status": "done"},
+                {"id": self.docs_task, "title": "Write manual"},
+            ],
+            format="json",
+        )
+        self.assertEqual(self.search("signup"), {self.login_task})
+        self.assertEqual(self.search("manual"), {self.docs_task})
+        self.assertEqual(self.search("docs"), set())
+        self.assert_index_in_sync()
+
+        self.client.delete(f"/api/tasks/{self.docs_task}/")
+        self.assertEqual(self.search("manual"), set())
+        self.assertEqual(self.search("page"), set())
+        self.assert_index_in_sync()
+
+    def test_comment_edits(self):
+        comment = Comment.objects.get(pk=self.comment_id)
+        comment.content = "Moved to the wiki"
+        comment.save()
+        self.assertEqual(self.search("wiki"), {self.docs_task})
+        self.assertEqual(self.search("login"), {self.login_task})
+        self.assert_index_in_sync()
+
+        self.client.delete(f"/api/tasks/{self.docs_task}/comments/{self.comment_id}/")
+        self.assertEqual(self.search("wiki"), set())
+        self.assert_index_in_sync()
+
+
+class DeltaSyncTests(KanbanTestCase):
+    """`GET /api/boards/{id}/changes/` returns tombstones or asks for a resync."""
+
+    def setUp(self):
+        super().setUp()
+        self.owner = self.create_account("owner")
+        self.member = self.create_account("member")
+        self.newcomer = self.create_account("newcomer")
+        self.authenticate(self.owner)
+        self.board_id = Board.objects.create(title="Board", owner=self.owner).pk
+        self.client.patch(
+            f"/api/boards/{self.board_id}/",
+            {"members": [self.member.pk]},
+            format="json",
+        )
+        self.task_ids = [
+            self.client.post(
+                "/api/tasks/",
+                {
+                    "board": self.board_id,
+                    "title": f"Task {index}",
+                    "status": "to-do",
+                    "priority": "low",
+                },
+                format="json",
+            ).json()["id"]
+            for index in range(5)
+        ]
+        self.comment(self.task_ids[4], "Older than the client")
+        self.revision = self.client.get(f"/api/boards/{self.board_id}/").json()[
+            "revision"
+        ]
+
+    def changes(self, since):
+        response = self.client.get(
+            f"/api/boards/{self.board_id}/changes/", {"since": since}
+        )
+        self.assertEqual(response.status_code, 200, response.content)
+        return response.json()
+
+    def comment(self, task_id, content):
+        return self.client.post(
+            f"/api/tasks/{task_id}/comments/", {"content": content}, format="json"
+        ).json()["id"]
+
+    def test_no_changes(self):
+        self.assertEqual(
+            self.changes(self.revision),
+            {
+                "revision": self.revision,
+                "resync": False,
+                "board": None,
+                "members": [],
+                "removed_members": [],
+                "tasks": [],
+                "deleted_tasks": [],
+                "comments": [],
+                "deleted_comments": [],
+                "authors": [],
+            },
+        )
+
+    def test_changes_and_tombstones(self):
+        ids = self.task_ids
+        self.client.patch(f"/api/tasks/{ids[0]}/", {"status": "done"}, format="json")
+        self.client.patch(f"/api/tasks/{ids[0]}/", {"title": "Renamed"}, format="json")
+        self.client.delete(f"/api/tasks/{ids[1]}/")
+        kept = self.comment(ids[2], "Kept")
+        removed = self.comment(ids[3], "Removed")
+        self.client.delete(f"/api/tasks/{ids[3]}/comments/{removed}/")
+        # The tombstone of the task covers its comments.
+        self.client.delete(f"/api/tasks/{ids[4]}/")
+        self.client.patch(
+            f"/api/boards/{self.board_id}/",
+            {"title": "Renamed board", "members": [self.newcomer.pk]},
+            format="json",
+        )
+
+        data = self.changes(self.revision)
+        self.assertFalse(data["resync"])
+        self.assertEqual(data["revision"], Board.objects.get(pk=self.board_id).revision)
+        self.assertEqual(data["board"]["title"], "Renamed board")
+        self.assertEqual(
+            [member["id"] for member in data["members"]], [self.newcomer.pk]
+        )
+        self.assertEqual(data["removed_members"], [self.member.pk])
+        self.assertEqual(
+            [task["id"] for task in data["tasks"]], [ids[0], ids[2], ids[3]]
+        )
+        self.assertEqual(
+            (data["tasks"][0]["title"], data["tasks"][0]["status"]),
+            ("Renamed", "done"),
+        )
+        self.assertEqual(data["deleted_tasks"], [ids[1], ids[4]])
+        self.assertEqual(
+            [(comment["id"], comment["task"]) for comment in data["comments"]],
+            [(kept, ids[2])],
+        )
+        self.assertEqual(data["deleted_comments"], [removed])
+        # One log row per object, however often it changed.
+        self.assertEqual(
+            BoardChange.objects.filter(
+                board_id=self.board_id, kind=BoardChange.Kind.TASK, object_id=ids[0]
+            ).count(),
+            1,
+        )
+
+        later = self.changes(data["revision"])
+        self.assertEqual((later["revision"], later["tasks"]), (data["revision"], []))
+
+    def test_resync_below_the_compaction_floor(self):
+        self.client.patch(
+            f"/api/tasks/{self.task_ids[0]}/", {"title": "Early"}, format="json"
+        )
+        middle = Board.objects.get(pk=self.board_id).revision
+        self.client.patch(
+            f"/api/tasks/{self.task_ids[1]}/", {"title": "Late"}, format="json"
+        )
+        BoardChange.objects.filter(board_id=self.board_id, revision__lte=middle).update(
+            changed_at=timezone.now() - datetime.timedelta(days=40)
+        )
+
+        self.assertGreater(compact_changes(retention_days=30), 0)
+        board = Board.objects.get(pk=self.board_id)
+        self.assertEqual(board.changes_floor, middle)
+        for since in (0, self.revision, middle - 1):
+            self.assertEqual(
+                self.changes(since), {"revision": board.revision, "resync": True}
+            )
+        data = self.changes(middle)
+        self.assertFalse(data["resync"])
+        self.assertEqual([task["title"] for task in data["tasks"]], ["Late"])
+
+        # Compacting again never lowers the floor.
+        self.assertEqual(compact_changes(retention_days=30), 0)
+        self.assertEqual(Board.objects.get(pk=self.board_id).changes_floor, middle)
+
+    def test_resync_when_too_much_changed(self):
+        for task_id in self.task_ids:
+            self.client.patch(f"/api/tasks/{task_id}/", {"title": "x"}, format="json")
+        with mock.patch("kanban_app.changes.MAX_DELTA_OBJECTS", 3):
+            self.assertTrue(self.changes(self.revision)["resync"])
+        self.assertFalse(self.changes(self.revision)["resync"])
+
+    def test_rejects_invalid_revisions(self):
+        path = f"/api/boards/{self.board_id}/changes/"
+        for query in ("", "?since=", "?since=-1", "?since=abc"):
+            self.assertEqual(self.client.get(path + query).status_code, 400, query)
+        self.authenticate(self.newcomer)
+        self.assertEqual(self.client.get(path + "?since=0").status_code, 403)
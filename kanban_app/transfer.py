@@ -0,0 +1,399 @@
+"""Streaming NDJSON export and import of whole boards.
+
+An export is one JSON object per line, in this order:
+
+    {"type": "board", "version": 1, "id": 3, "title": "...", "owner": 7}
+    {"type": "account", "id": 7, "email": "...", "fullname": "..."}
+    {"type": "member", "account": 7}
+    {"type": "task", "id": 11, "title": "...", ..., "assignee": 7}
+    {"type": "comment", "id": 5, "task": 11, "author": 7, ...}
+    {"type": "end", "tasks": 1, "comments": 1}
+
+There is one account line per account the board refers to. Ids are
+those of the exporting database. On import, accounts are matched by
+email and the importing user owns the new board. Members that exist
+locally, the importing user included, stay members and the exported
+owner becomes one. Tasks and comments only refer to the new board's
+members and the importing user: other assignees and reviewers are
+cleared and other task creators and comment authors become the
+importing user. The closing `end` record lets the importer reject
+truncated uploads.
+
+Both directions run in constant memory: the export reads rows with
+`.iterator()` and yields buffered chunks of lines, and the import
+reads the upload line by line and writes with `bulk_create` in
+fixed-size batches. Only the mapping from exported to new task ids is
+kept for the whole import.
+"""
+
+# Standard library imports
+import datetime
+import json
+
+# Django imports
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+# Local imports
+from auth_app.models import Account
+from kanban_app.models import Board, Comment, SearchDocument, Task
+from kanban_app.positions import assign_positions
+from kanban_app.search import comment_document, task_document
+
+FORMAT_VERSION = 1
+EXPORT_CHUNK_SIZE = 2000
+EXPORT_BUFFER_BYTES = 64 * 1024
+IMPORT_BATCH_SIZE = 1000
+MAX_LINE_BYTES = 64 * 1024
+
+TASK_FIELDS = (
+    "id",
+    "title",
+    "description",
+    "status",
+    "priority",
+    "due_date",
+    "created_by",
+    "assignee",
+    "reviewer",
+)
+COMMENT_FIELDS = ("id", "task", "author", "content", "created_at")
+
+
+class BoardImportError(ValueError):
+    """An import file that cannot be applied, with the offending line."""
+
+    def __init__(self, line_number, message):
+        super().__init__(f"Line {line_number}: {message}")
+        self.line_number = line_number
+        self.message = message
+
+
+def export_board(board):
+    """Yield the NDJSON export of `board` as byte chunks of about 64 KiB."""
+    buffer = []
+    size = 0
+    for record in export_records(board):
+        line = json.dumps(record, cls=DjangoJSONEncoder, separators=(",", ":"))
+        buffer.append(line)
+        size += len(line) + 1
+        if size >= EXPORT_BUFFER_BYTES:
+            yield ("\n".join(buffer) + "\n").encode()
+            buffer = []
+            size = 0
+    if buffer:
+        yield ("\n".join(buffer) + "\n").encode()
+
+
+def export_records(board):
+    """Yield the export records of `board` without loading its tasks or comments."""
+    yield {
+        "type": "board",
+        "version": FORMAT_VERSION,
+        "id": board.pk,
+        "title": board.title,
+        "owner": board.owner_id,
+    }
+
+    tasks = Task.objects.filter(board=board)
+    comments = Comment.objects.filter(task__board=board)
+    members = Board.members.through.objects.filter(board=board)
+    accounts = Account.objects.filter(
+        Q(pk=board.owner_id)
+        | Q(pk__in=members.values("account"))
+        | Q(pk__in=tasks.values("created_by"))
+        | Q(pk__in=tasks.values("assignee"))
+        | Q(pk__in=tasks.values("reviewer"))
+        | Q(pk__in=comments.values("author"))
+    ).values_list("pk", "user__email", "fullname")
+    for account_id, email, fullname in accounts.iterator(EXPORT_CHUNK_SIZE):
+        yield {
+            "type": "account",
+            "id": account_id,
+            "email": email,
+            "fullname": fullname,
+        }
+
+    for account_id in members.values_list("account_id", flat=True).iterator(
+        EXPORT_CHUNK_SIZE
+    ):
+        yield {"type": "member", "account": account_id}
+
+    task_count = 0
+    # Column order, so that the importer's appended positions keep it.
+    task_rows = tasks.order_by("status", "position", "pk").values_list(
+        "pk",
+        "title",
+        "description",
+        "status",
+        "priority",
+        "due_date",
+        "created_by_id",
+        "assignee_id",
+        "reviewer_id",
+    )
+    for row in task_rows.iterator(EXPORT_CHUNK_SIZE):
+        task_count += 1
+        yield {"type": "task", **dict(zip(TASK_FIELDS, row))}
+
+    comment_count = 0
+    comment_rows = comments.order_by("pk").values_list(
+        "pk", "task_id", "author_id", "content", "created_at"
+    )
+    for row in comment_rows.iterator(EXPORT_CHUNK_SIZE):
+        comment_count += 1
+        record = {"type": "comment", **dict(zip(COMMENT_FIELDS, row))}
+        # DjangoJSONEncoder would cut the timestamp to milliseconds.
+        record["created_at"] = record["created_at"].isoformat()
+        yield record
+
+    yield {"type": "end", "tasks": task_count, "comments": comment_count}
+
+
+class BoardImporter:
+    """Apply an NDJSON board export, creating a new board owned by `owner`.
+
+    Call `run()` inside a transaction; it raises `BoardImportError` on
+    the first invalid line, leaving the caller to roll back.
+    """
+
+    def __init__(self, owner, batch_size=IMPORT_BATCH_SIZE):
+        self.owner = owner
+        self.batch_size = batch_size
+        self.board = None
+        self.source_owner = None
+        self.line_number = 0
+        self.accounts = {}
+        self.pending_accounts = {}
+        self.unmatched_emails = set()
+        self.member_ids = set()
+        self.task_ids = {}
+        self.tasks = {}
+        self.comments = []
+        self.comment_count = 0
+        self.finished = False
+
+    def run(self, lines):
+        """Consume an iterable of byte lines; return an import summary."""
+        for line in lines:
+            self.line_number += 1
+            if len(line) > MAX_LINE_BYTES:
+                self.fail(f"Line is longer than {MAX_LINE_BYTES} bytes.")
+            if not line.strip():
+                continue
+            if self.finished:
+                self.fail("Unexpected data after the end record.")
+            try:
+                record = json.loads(line)
+            except ValueError:
+                self.fail("Invalid JSON.")
+            if not isinstance(record, dict):
+                self.fail("Expected a JSON object.")
+            self.handle(record)
+
+        if not self.finished:
+            self.fail("Missing end record; the upload looks truncated.")
+        return {
+            "board": self.board.pk,
+            "members": len(self.member_ids),
+            "tasks": len(self.task_ids),
+            "comments": self.comment_count,
+            "unmatched_accounts": sorted(self.unmatched_emails),
+        }
+
+    def handle(self, record):
+        kind = record.get("type")
+        if self.board is None and kind != "board":
+            self.fail("The first record must be the board.")
+        handler = getattr(self, f"handle_{kind}", None)
+        if handler is None:
+            self.fail(f"Unknown record type {kind!r}.")
+        handler(record)
+
+    def handle_board(self, record):
+        if self.board is not None:
+            self.fail("Only one board record is allowed.")
+        if record.get("version") != FORMAT_VERSION:
+            self.fail(f"Unsupported export version {record.get('version')!r}.")
+        title = self.text(record, "title", Board._meta.get_field("title").max_length)
+        self.source_owner = self.integer(record, "owner")
+        self.board = Board.objects.create(title=title, owner=self.owner)
+
+    def handle_account(self, record):
+        if self.accounts or self.task_ids or self.tasks:
+            self.fail("Accounts must come before members, tasks and comments.")
+        email = record.get("email")
+        if not isinstance(email, str):
+            self.fail("Account email must be a string.")
+        self.pending_accounts[self.integer(record, "id")] = email
+
+    def handle_member(self, record):
+        self.resolve_accounts()
+        if self.task_ids or self.tasks or self.comments or self.comment_count:
+            self.fail("Members must come before tasks and comments.")
+        account_id = self.accounts.get(self.integer(record, "account"))
+        if account_id is not None:
+            self.member_ids.add(account_id)
+
+    def handle_task(self, record):
+        self.resolve_accounts()
+        if self.comments or self.comment_count:
+            self.fail("Tasks must come before comments.")
+        source_id = self.integer(record, "id")
+        if source_id in self.task_ids or source_id in self.tasks:
+            self.fail(f"Duplicate task id {source_id}.")
+
+        task = Task(
+            board=self.board,
+            title=self.text(record, "title", Task._meta.get_field("title").max_length),
+            description=self.text(
+                record,
+                "description",
+                Task._meta.get_field("description").max_length,
+                null=True,
+                blank=True,
+            ),
+            status=self.choice(record, "status", Task.Status.values),
+            priority=self.choice(record, "priority", Task.Priority.values),
+            due_date=self.date(record, "due_date"),
+            created_by_id=self.account(record, "created_by") or self.owner.pk,
+            assignee_id=self.account(record, "assignee"),
+            reviewer_id=self.account(record, "reviewer"),
+        )
+        self.tasks[source_id] = task
+        if len(self.tasks) >= self.batch_size:
+            self.flush_tasks()
+
+    def handle_comment(self, record):
+        self.resolve_accounts()
+        self.flush_tasks()
+        task_id = self.task_ids.get(self.integer(record, "task"))
+        if task_id is None:
+            self.fail("Comment refers to a task that is not part of the export.")
+        created_at = record.get("created_at")
+        parsed = parse_datetime(created_at) if isinstance(created_at, str) else None
+        if created_at is not None and parsed is None:
+            self.fail("Invalid created_at timestamp.")
+        if parsed is not None and timezone.is_naive(parsed):
+            parsed = timezone.make_aware(parsed)
+
+        self.comments.append(
+            Comment(
+                task_id=task_id,
+                author_id=self.account(record, "author") or self.owner.pk,
+                content=self.text(
+                    record, "content", Comment._meta.get_field("content").max_length
+                ),
+                created_at=parsed or timezone.now(),
+            )
+        )
+        if len(self.comments) >= self.batch_size:
+            self.flush_comments()
+
+    def handle_end(self, record):
+        self.resolve_accounts()
+        self.flush_tasks()
+        self.flush_comments()
+        expected = (self.integer(record, "tasks"), self.integer(record, "comments"))
+        if expected != (len(self.task_ids), self.comment_count):
+            self.fail("Record counts do not match the end record.")
+
+        if self.member_ids:
+            self.board.members.add(*self.member_ids)
+        # bulk_create sends no signals, so settle the counters in one pass.
+        Board.objects.filter(pk=self.board.pk).recount()
+        Task.objects.filter(board=self.board).recount()
+        self.finished = True
+
+    def resolve_accounts(self):
+        """Map exported account ids to local accounts by email, in one query."""
+        if not self.pending_accounts:
+            return
+        local = dict(
+            Account.objects.filter(
+                user__email__in=set(self.pending_accounts.values())
+            ).values_list("user__email", "pk")
+        )
+        for source_id, email in self.pending_accounts.items():
+            if email in local:
+                self.accounts[source_id] = local[email]
+            else:
+                self.unmatched_emails.add(email)
+        self.pending_accounts = {}
+        # Known before any task, so that its tasks keep their creator.
+        owner_id = self.accounts.get(self.source_owner)
+        if owner_id is not None and owner_id != self.owner.pk:
+            self.member_ids.add(owner_id)
+
+    def flush_tasks(self):
+        if not self.tasks:
+            return
+        assign_positions(list(self.tasks.values()))
+        Task.objects.bulk_create(self.tasks.values())
+        SearchDocument.objects.bulk_create(
+            task_document(task) for task in self.tasks.values()
+        )
+        for source_id, task in self.tasks.items():
+            self.task_ids[source_id] = task.pk
+        self.tasks = {}
+
+    def flush_comments(self):
+        if not self.comments:
+            return
+        Comment.objects.bulk_create(self.comments)
+        SearchDocument.objects.bulk_create(
+            comment_document(comment, self.board.pk) for comment in self.comments
+        )
+        self.comment_count += len(self.comments)
+        self.comments = []
+
+    def account(self, record, key):
+        """Return the local account for `key` if it is the importer or a member."""
+        value = record.get(key)
+        if value is None:
+            return None
+        account_id = self.accounts.get(self.integer(record, key))
+        if account_id == self.owner.pk or account_id in self.member_ids:
+            return account_id
+        return None
+
+    def integer(self, record, key):
+        value = record.get(key)
+        if not isinstance(value, int) or isinstance(value, bool):
+            self.fail(f"{key!r} must be an integer.")
+        return value
+
+    def text(self, record, key, max_length, null=False, blank=False):
+        value = record.get(key)
+        if value is None and null:
+            return None
+        if not isinstance(value, str):
+            self.fail(f"{key!r} must be a string.")
+        if not blank and not value.strip():
+            self.fail(f"{key!r} must be a non-empty string.")
+        if len(value) > max_length:
+            self.fail(f"{key!r} is longer than {max_length} characters.")
+        return value
+
+    def choice(self, record, key, choices):
+        value = record.get(key)
+        if value not in choices:
+            self.fail(f"{key!r} must be one of: {', '.join(choices)}.")
+        return value
+
+    def date(self, record, key):
+        value = record.get(key)
+        if value is None:
+            return None
+        try:
+            parsed = parse_date(value) if isinstance(value, str) else None
+        except ValueError:
+            parsed = None
+        if not isinstance(parsed, datetime.date):
+            self.fail(f"{key!r} must be a YYYY-MM-DD date.")
+        return parsed
+
+    def fail(self, message):
+        raise BoardImportError(self.line_number, message)